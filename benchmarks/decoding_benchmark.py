@@ -0,0 +1,59 @@
+"""Decoding time of large folder_content pages: json + dacite against loads + compiled decoders.
+
+Run from the repository root:
+
+    python -m benchmarks.decoding_benchmark [files per page] [pages]
+
+The dacite path is only measured if dacite is installed.
+"""
+import json
+import statistics
+import sys
+import time
+
+from classes.Folder import Folder
+from classes.Pager import Pager
+from rapidgatorAPI import decoding
+from rapidgatorAPI.decoding import decoder, loads
+
+def page(files: int) -> bytes:
+    folder = {"folder_id": "d1", "mode": 0, "mode_label": "Public", "parent_folder_id": None, "name": "folder", "url": "https://rapidgator.net/folder/d1", "nb_folders": 0, "nb_files": files, "created": 1700000000, "size_files": files << 20, "folders": [],
+              "files": [{"file_id": f"f{i}", "name": f"file{i}.bin", "size": i << 10, "hash": f"{i:032x}", "nb_downloads": i % 7, "mode": 0, "mode_label": "Public", "folder_id": "d1", "url": f"https://rapidgator.net/file/f{i}", "created": 1700000000 + i} for i in range(files)]}
+    return json.dumps({"response": {"folder": folder, "pager": {"current": 1, "total": 1}}, "status": 200, "details": None}).encode()
+
+def current(body: bytes):
+    from dacite import from_dict
+    # requests' Response.json() decodes the text first, then parses it
+    response = json.loads(body.decode("utf-8"))["response"]
+    return from_dict(Folder, response["folder"]), from_dict(Pager, response["pager"])
+
+def compiled(body: bytes):
+    response = loads(body)["response"]
+    return decoder(Folder)(response["folder"]), decoder(Pager)(response["pager"])
+
+def measure(decode, body: bytes, pages: int) -> list:
+    timings = []
+    for _ in range(pages):
+        start = time.perf_counter()
+        decode(body)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main() -> None:
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    body = page(files)
+    # The first call picks the parser
+    loads(body)
+    candidates = [(f"compiled ({decoding._loads.__module__})", compiled)]
+    try:
+        import dacite  # noqa: F401
+        candidates.insert(0, ("dacite", current))
+    except ImportError:
+        print("dacite is not installed, skipping the dacite path")
+    for name, decode in candidates:
+        timings = measure(decode, body, pages)
+        print(f"{name:>17}: {files} files per page, mean {statistics.mean(timings) * 1000:.3f} ms, p50 {statistics.median(timings) * 1000:.3f} ms, {files * pages / sum(timings):,.0f} files/s")
+
+if __name__ == "__main__":
+    main()
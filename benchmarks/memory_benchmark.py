@@ -0,0 +1,55 @@
+"""Memory held by a large file listing in different representations.
+
+Run from the repository root:
+
+    python -m benchmarks.memory_benchmark [files]
+
+Compares dataclasses with a __dict__ (the models before they were slotted), the slotted File
+model and the FileColumns container, measured with tracemalloc. Every representation is built
+from the JSON body, so the strings it keeps are counted too.
+"""
+import dataclasses
+import json
+import sys
+import tracemalloc
+
+from classes.File import File
+from classes.FileColumns import FileColumns
+from rapidgatorAPI.decoding import decoder, loads
+
+# The File model as it was before slots
+DictFile = dataclasses.make_dataclass("DictFile", [(field.name, field.type, dataclasses.field(default=None)) for field in dataclasses.fields(File)])
+
+def listing(files: int) -> bytes:
+    return json.dumps([{"file_id": f"{i:032x}", "name": f"file{i % 1000}.bin", "size": i << 10, "hash": f"{i * 2654435761 % (1 << 128):032x}", "nb_downloads": i % 7, "mode": 0, "mode_label": "Public",
+             "folder_id": f"d{i // 500}", "url": f"https://rapidgator.net/file/{i:032x}", "created": 1700000000 + i} for i in range(files)]).encode()
+
+def measure(build, body: bytes) -> int:
+    tracemalloc.start()
+    result = build(loads(body))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+def as_columns(files: list) -> FileColumns:
+    columns = FileColumns()
+    columns.extend(files)
+    return columns
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    body = listing(count)
+    candidates = [
+        ("dataclass", lambda files: list(map(decoder(DictFile), files))),
+        ("slotted File", lambda files: list(map(decoder(File), files))),
+        ("FileColumns", as_columns),
+    ]
+    baseline = None
+    for name, build in candidates:
+        size = measure(build, body)
+        baseline = baseline or size
+        print(f"{name:>12}: {count} files, {size / (1 << 20):8.1f} MiB, {size / count:6.0f} bytes per file, {size / baseline:5.0%} of dataclass")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Benchmarks for listing, tree walks, uploads and downloads against the local fake server.
+
+Run from the repository root:
+
+    python -m benchmarks.suite [--latency SECONDS] [--bandwidth MIB_PER_S] [--repeat N] [case ...]
+
+Every case runs its operation `repeat` times and prints throughput, p50 and p99 latency and the
+peak Python memory of one extra run measured with tracemalloc (server included, it shares the
+process). The fake server answers every request after `latency` seconds and limits upload and
+download bodies to `bandwidth` per connection, so pooling, prefetching, worker threads, pipes
+and segments show what they save on a real network. Cases run in pairs, e.g. simple vs pooled,
+so each optimization has a number next to its baseline.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.cache import ResponseCache
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.transport import PooledTransport, SimpleTransport
+
+# Case name -> function(server, workdir) returning (operation, units per operation, unit)
+Setup = Callable[[FakeRapidgatorServer, str], Tuple[Callable[[], object], int, str]]
+CASES: Dict[str, Setup] = {}
+# Folders shared by several cases, created on first use
+FIXTURES: Dict[str, str] = {}
+
+def case(name: str) -> Callable[[Setup], Setup]:
+    def register(setup: Setup) -> Setup:
+        CASES[name] = setup
+        return setup
+    return register
+
+def client(server: FakeRapidgatorServer, **kwargs) -> RapidgatorAPI:
+    rg = RapidgatorAPI("user", "password", base_url=server.base_url, **kwargs)
+    rg.login()
+    return rg
+
+def folder_with_files(server: FakeRapidgatorServer, files: int) -> str:
+    if "listing" not in FIXTURES:
+        FIXTURES["listing"] = folder_id = server.add_folder("listing")
+        for i in range(files):
+            server.add_file(f"file{i}.bin", f"{i}".encode(), folder_id)
+    return FIXTURES["listing"]
+
+def tree(server: FakeRapidgatorServer) -> str:
+    if "tree" not in FIXTURES:
+        # 1 + 4 + 16 + 64 = 85 folders with 20 files each
+        FIXTURES["tree"] = server.add_tree(depth=3, folders_per_folder=4, files_per_folder=20)
+    return FIXTURES["tree"]
+
+def local_file(workdir: str, size: int) -> str:
+    path = os.path.join(workdir, f"upload-{size}.bin")
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+    return path
+
+@case("info/simple")
+def info_simple(server, workdir):
+    rg = client(server, transport=SimpleTransport())
+    return rg.info, 1, "requests"
+
+@case("info/pooled")
+def info_pooled(server, workdir):
+    rg = client(server, transport=PooledTransport())
+    return rg.info, 1, "requests"
+
+@case("file_info/uncached")
+def file_info_uncached(server, workdir):
+    rg, file_id = client(server), server.add_file("cached.bin", b"cached")
+    return lambda: rg.file_info(file_id), 1, "requests"
+
+@case("file_info/cached")
+def file_info_cached(server, workdir):
+    rg, file_id = client(server, cache=ResponseCache()), server.add_file("cached.bin", b"cached")
+    return lambda: rg.file_info(file_id), 1, "requests"
+
+def fan_out(server, workdir, coalesce: bool):
+    rg, folder_id = client(server, coalesce=coalesce), tree(server)
+    executor = ThreadPoolExecutor(max_workers=16)
+    # 16 workers asking for the same folder at once, as in a dashboard refresh
+    return lambda: list(executor.map(lambda _: rg.folder_info(folder_id), range(16))), 16, "calls"
+
+@case("fan_out/separate")
+def fan_out_separate(server, workdir):
+    return fan_out(server, workdir, False)
+
+@case("fan_out/coalesced")
+def fan_out_coalesced(server, workdir):
+    return fan_out(server, workdir, True)
+
+@case("listing/sequential")
+def listing_sequential(server, workdir):
+    rg, folder_id = client(server), folder_with_files(server, 5000)
+    return lambda: sum(1 for _ in rg.iter_folder_files(folder_id, prefetch=False)), 5000, "files"
+
+@case("listing/prefetch")
+def listing_prefetch(server, workdir):
+    rg, folder_id = client(server), folder_with_files(server, 5000)
+    return lambda: sum(1 for _ in rg.iter_folder_files(folder_id, prefetch=True)), 5000, "files"
+
+@case("walk/1-worker")
+def walk_one_worker(server, workdir):
+    rg, folder_id = client(server), tree(server)
+    return lambda: sum(len(files) for _, _, files in rg.walk(folder_id, workers=1)), 85 * 20, "files"
+
+@case("walk/8-workers")
+def walk_eight_workers(server, workdir):
+    rg, folder_id = client(server), tree(server)
+    return lambda: sum(len(files) for _, _, files in rg.walk(folder_id, workers=8)), 85 * 20, "files"
+
+@case("walk/columnar")
+def walk_columnar(server, workdir):
+    rg, folder_id = client(server), tree(server)
+    return lambda: len(rg.file_columns(folder_id, recursive=True, workers=8)), 85 * 20, "files"
+
+@case("check_links/1-worker")
+def check_links_one_worker(server, workdir):
+    rg, folder_id = client(server), folder_with_files(server, 5000)
+    urls = [file["url"] for file in list(server.files.values()) if file["folder_id"] == folder_id][:1000]
+    return lambda: sum(1 for _ in rg.check_links(urls, batch_size=25, workers=1)), len(urls), "links"
+
+@case("check_links/4-workers")
+def check_links_four_workers(server, workdir):
+    rg, folder_id = client(server), folder_with_files(server, 5000)
+    urls = [file["url"] for file in list(server.files.values()) if file["folder_id"] == folder_id][:1000]
+    return lambda: sum(1 for _ in rg.check_links(urls, batch_size=25, workers=4)), len(urls), "links"
+
+def upload(server, workdir, pipes: int):
+    rg, path = client(server), local_file(workdir, 8 << 20)
+    def run():
+        # A new hash every run, otherwise the fake server finds the content and skips the upload
+        with open(path, "r+b") as f:
+            f.write(os.urandom(16))
+        return rg.upload_file(path, poll_interval=0.01, pipes=pipes, part_size=1 << 20)
+    return run, 8, "MiB"
+
+@case("upload/1-pipe")
+def upload_one_pipe(server, workdir):
+    return upload(server, workdir, 1)
+
+@case("upload/4-pipes")
+def upload_four_pipes(server, workdir):
+    return upload(server, workdir, 4)
+
+def download(server, workdir, segments: int):
+    rg, file_id = client(server), server.add_file("download.bin", os.urandom(8 << 20))
+    return lambda: rg.download_file(file_id, os.path.join(workdir, f"download-{segments}.bin"), segments=segments, min_segment_size=1 << 20), 8, "MiB"
+
+@case("download/1-segment")
+def download_one_segment(server, workdir):
+    return download(server, workdir, 1)
+
+@case("download/4-segments")
+def download_four_segments(server, workdir):
+    return download(server, workdir, 4)
+
+def percentile(values: List[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run_case(name: str, server: FakeRapidgatorServer, workdir: str, repeat: int) -> str:
+    operation, units, unit = CASES[name](server, workdir)
+    operation()  # warm up connections and server indexes
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - start)
+    tracemalloc.start()
+    operation()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    throughput = units * repeat / sum(latencies)
+    return f"{name:<22} {throughput:>12.1f} {unit + '/s':<11} p50 {statistics.median(latencies) * 1000:>9.2f} ms  p99 {percentile(latencies, 0.99) * 1000:>9.2f} ms  peak {peak / (1 << 20):>7.2f} MiB"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("cases", nargs="*", help=f"Cases or case prefixes to run, default all: {', '.join(CASES)}")
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds before the fake server answers a request. Default is 0.002.")
+    parser.add_argument("--bandwidth", type=float, default=32, help="MiB/s per connection for upload and download bodies, 0 for unlimited. Default is 32.")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per case. Default is 20.")
+    args = parser.parse_args()
+    names = [name for name in CASES if not args.cases or any(name == prefix or name.startswith(prefix + "/") for prefix in args.cases)]
+    with FakeRapidgatorServer() as server, tempfile.TemporaryDirectory() as workdir:
+        server.latency = args.latency
+        server.bandwidth = args.bandwidth * (1 << 20) or None
+        print(f"latency {args.latency * 1000:g} ms, bandwidth {args.bandwidth:g} MiB/s per connection, {args.repeat} runs per case")
+        for name in names:
+            print(run_case(name, server, workdir, args.repeat), flush=True)
+
+if __name__ == "__main__":
+    main()
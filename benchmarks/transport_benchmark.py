@@ -0,0 +1,33 @@
+"""Request latency against the local fake server, with and without connection pooling.
+
+Run from the repository root:
+
+    python -m benchmarks.transport_benchmark [calls]
+"""
+import statistics
+import sys
+import time
+
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.transport import PooledTransport, SimpleTransport
+
+def run(transport, base_url: str, calls: int) -> list:
+    latencies = []
+    with RapidgatorAPI("user", "password", transport=transport, base_url=base_url) as rg:
+        for _ in range(calls):
+            start = time.perf_counter()
+            rg.info()
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with FakeRapidgatorServer() as server:
+        for name, transport in [("simple", SimpleTransport()), ("pooled", PooledTransport())]:
+            latencies = sorted(run(transport, server.base_url, calls))
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            print(f"{name:>7}: {calls} calls, mean {statistics.mean(latencies) * 1000:.3f} ms, p50 {statistics.median(latencies) * 1000:.3f} ms, p99 {p99 * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,19 @@
 import dataclasses
+import logging
 from typing import Optional
 
-@dataclasses.dataclass
-class APIError():
+logger = logging.getLogger("rapidgatorAPI")
+
+@dataclasses.dataclass(eq=False)
+class APIError(Exception):
     status: int
     response: Optional[dict] = None
     details: Optional[str] = None
     
     def __post_init__(self):
-        print(self.details)
\ No newline at end of file
+        # Sets args like a regular exception, so errors can be pickled, e.g. back from a worker process
+        super().__init__(*(getattr(self, field.name) for field in dataclasses.fields(self)))
+        logger.debug("API error %s: %s", self.status, self.details)
+        
+    def __str__(self) -> str:
+        return f"{self.status}: {self.details}"
@@ -0,0 +1,13 @@
+import dataclasses
+
+@dataclasses.dataclass(slots=True)
+class AccountQuota:
+    username: str
+    # Bytes left as of the last info() request, minus the transfers finished since
+    traffic_left: int
+    storage_left: int
+    # Bytes of transfers that are running now
+    traffic_reserved: int = 0
+    storage_reserved: int = 0
+    # Seconds since the last info() request
+    age: float = 0
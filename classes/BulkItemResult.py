@@ -0,0 +1,8 @@
+import dataclasses
+from typing import Optional
+
+@dataclasses.dataclass(slots=True)
+class BulkItemResult:
+    item_id: str
+    success: bool
+    error: Optional[str] = None
@@ -0,0 +1,16 @@
+import dataclasses
+from typing import List
+
+from classes.BulkItemResult import BulkItemResult
+
+@dataclasses.dataclass(slots=True)
+class BulkReport:
+    items: List[BulkItemResult] = dataclasses.field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[str]:
+        return [item.item_id for item in self.items if item.success]
+
+    @property
+    def failed(self) -> List[BulkItemResult]:
+        return [item for item in self.items if not item.success]
@@ -2,7 +2,7 @@ import dataclasses
 
 from typing import Optional
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class CheckLinkResult:
     url: str
     filename: str
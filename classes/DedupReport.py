@@ -0,0 +1,15 @@
+import dataclasses
+from typing import Dict, List
+
+@dataclasses.dataclass(slots=True)
+class DedupReport:
+    # Files created on the server without sending bytes (hash copy or instant upload)
+    copied: List[str] = dataclasses.field(default_factory=list)
+    # Files whose bytes were sent
+    uploaded: List[str] = dataclasses.field(default_factory=list)
+    # Known hashes whose content the server doesn't have
+    missing: List[str] = dataclasses.field(default_factory=list)
+    # File -> error message
+    failed: Dict[str, str] = dataclasses.field(default_factory=dict)
+    bytes_uploaded: int = 0
+    bytes_saved: int = 0
@@ -2,7 +2,7 @@ import dataclasses
 
 from typing import Optional
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class File:
     name: Optional[str] = None
     size: Optional[int] = None
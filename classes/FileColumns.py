@@ -0,0 +1,101 @@
+import dataclasses
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Optional
+
+from classes.File import File
+
+# Stands in for a missing number in the integer columns
+_MISSING = -1
+# An MD5 hash of 16 zero bytes stands in for a missing hash
+_NO_HASH = bytes(16)
+
+def _number(value: Optional[int]) -> int:
+    return _MISSING if value is None else int(value)
+
+def _optional(value: int) -> Optional[int]:
+    return None if value == _MISSING else value
+
+def _hash(value: Optional[str]) -> bytes:
+    # Anything but 32 hex digits would shift the hashes of all following files
+    try:
+        hash = bytes.fromhex(value) if value else _NO_HASH
+    except ValueError:
+        return _NO_HASH
+    return hash if len(hash) == 16 else _NO_HASH
+
+@dataclasses.dataclass(slots=True)
+class FileColumns:
+    """Files of a large listing stored column by column instead of one object per file.
+
+    Numbers live in typed arrays, MD5 hashes as 16 raw bytes each, and names, folder ids and
+    mode labels are interned, so a million files take a fraction of the memory of a million
+    File objects. Indexing or iterating builds File objects on the fly.
+    """
+    file_ids: List[str] = dataclasses.field(default_factory=list)
+    names: List[Optional[str]] = dataclasses.field(default_factory=list)
+    folder_ids: List[Optional[str]] = dataclasses.field(default_factory=list)
+    urls: List[Optional[str]] = dataclasses.field(default_factory=list)
+    mode_labels: List[Optional[str]] = dataclasses.field(default_factory=list)
+    hashes: bytearray = dataclasses.field(default_factory=bytearray)
+    sizes: array = dataclasses.field(default_factory=lambda: array("q"))
+    nb_downloads: array = dataclasses.field(default_factory=lambda: array("q"))
+    modes: array = dataclasses.field(default_factory=lambda: array("i"))
+    created: array = dataclasses.field(default_factory=lambda: array("q"))
+
+    def __len__(self) -> int:
+        return len(self.file_ids)
+
+    def append(self, file: dict) -> None:
+        """Adds a file as it appears in an API response."""
+        intern = sys.intern
+        name, folder_id, mode_label, hash = file.get("name"), file.get("folder_id"), file.get("mode_label"), file.get("hash")
+        self.file_ids.append(file.get("file_id"))
+        self.names.append(intern(name) if name is not None else None)
+        self.folder_ids.append(intern(folder_id) if folder_id is not None else None)
+        self.urls.append(file.get("url"))
+        self.mode_labels.append(intern(mode_label) if mode_label is not None else None)
+        self.hashes += _hash(hash)
+        self.sizes.append(_number(file.get("size")))
+        self.nb_downloads.append(_number(file.get("nb_downloads")))
+        self.modes.append(_number(file.get("mode")))
+        self.created.append(_number(file.get("created")))
+
+    def extend(self, files: Iterable[dict]) -> None:
+        """Adds files as they appear in an API response."""
+        for file in files:
+            self.append(file)
+
+    def add(self, file: File) -> None:
+        """Adds a File object."""
+        self.append(dataclasses.asdict(file))
+
+    def __iadd__(self, other: "FileColumns") -> "FileColumns":
+        for field in dataclasses.fields(self):
+            getattr(self, field.name).extend(getattr(other, field.name))
+        return self
+
+    def __getitem__(self, index: int) -> File:
+        if index < 0:
+            index += len(self)
+        hash = self.hashes[index * 16:index * 16 + 16]
+        return File(
+            name=self.names[index],
+            size=_optional(self.sizes[index]),
+            hash=None if hash == _NO_HASH else hash.hex(),
+            nb_downloads=_optional(self.nb_downloads[index]),
+            file_id=self.file_ids[index],
+            mode=_optional(self.modes[index]),
+            mode_label=self.mode_labels[index],
+            folder_id=self.folder_ids[index],
+            url=self.urls[index],
+            created=_optional(self.created[index]),
+        )
+
+    def __iter__(self) -> Iterator[File]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def total_size(self) -> int:
+        return sum(size for size in self.sizes if size != _MISSING)
@@ -1,6 +1,6 @@
 import dataclasses
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class FileDownload:
     download_url: str
     delay: int
\ No newline at end of file
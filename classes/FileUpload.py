@@ -3,7 +3,7 @@ from typing import Optional
 
 from classes.File import File
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class FileUpload:
     upload_id: str
     state: int
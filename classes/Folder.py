@@ -3,12 +3,12 @@ from typing import Optional, List
 
 from classes.File import File
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Folder:
     folder_id: str
     mode: int
     mode_label: str
-    parent_folder_id: str
+    parent_folder_id: Optional[str]
     name: str
     url: str
     nb_folders: int
@@ -2,7 +2,7 @@ import dataclasses
 
 from classes.File import File
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class OneTimeLink:
     link_id: str
     file: File
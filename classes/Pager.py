@@ -1,6 +1,6 @@
 import dataclasses
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Pager:
     current: int
     total: int
\ No newline at end of file
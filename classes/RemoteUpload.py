@@ -1,7 +1,7 @@
 import dataclasses
 from typing import Optional
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class RemoteUpload:
     max_nb_jobs: int
     refresh_time: int
\ No newline at end of file
@@ -3,7 +3,7 @@ from typing import Optional
 
 from classes.File import File
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class RemoteUploadJob:
     job_id: int
     type: int
@@ -14,7 +14,7 @@ class RemoteUploadJob:
     size: int
     state: int
     state_label: str
-    file: File
+    file: Optional[File]
     dl_size: int
     speed: int
     created: int
@@ -0,0 +1,19 @@
+import dataclasses
+from typing import Optional
+
+@dataclasses.dataclass(slots=True)
+class RequestEvent:
+    method: str
+    # API endpoint such as 'file/info', or 'upload' / 'download' for file transfers
+    endpoint: str
+    # None if no response arrived (e.g. connection error)
+    status: Optional[int]
+    # Seconds from the first attempt to the parsed response, retry delays included
+    latency: float
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    cached: bool = False
+    # Answered by an identical request of another thread or coroutine that was already running
+    coalesced: bool = False
+    error: Optional[str] = None
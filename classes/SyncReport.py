@@ -0,0 +1,14 @@
+import dataclasses
+from typing import Dict, List
+
+@dataclasses.dataclass(slots=True)
+class SyncReport:
+    # Relative paths of files whose bytes were sent or received
+    transferred: List[str] = dataclasses.field(default_factory=list)
+    # Relative paths of files created on the server without sending bytes (hash copy or instant upload)
+    copied: List[str] = dataclasses.field(default_factory=list)
+    skipped: List[str] = dataclasses.field(default_factory=list)
+    deleted: List[str] = dataclasses.field(default_factory=list)
+    # Relative path -> error message
+    failed: Dict[str, str] = dataclasses.field(default_factory=dict)
+    bytes_transferred: int = 0
@@ -1,7 +1,7 @@
 import dataclasses
 from typing import Optional
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Traffic:
     total: Optional[str] = None
     left: Optional[int] = None
\ No newline at end of file
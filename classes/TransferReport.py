@@ -0,0 +1,9 @@
+import dataclasses
+from typing import Any, Dict
+
+@dataclasses.dataclass(slots=True)
+class TransferReport:
+    # File id -> downloaded path, or local path -> (client holding the file, File) for uploads
+    done: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    # File id or local path -> error message
+    failed: Dict[str, str] = dataclasses.field(default_factory=dict)
@@ -1,7 +1,7 @@
 import dataclasses
 from typing import Optional
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Upload:
     max_file_size: int
     nb_pipes: int
\ No newline at end of file
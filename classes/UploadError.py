@@ -0,0 +1,10 @@
+import dataclasses
+from typing import Optional
+
+from classes.APIError import APIError
+from classes.FileUpload import FileUpload
+
+@dataclasses.dataclass(eq=False)
+class UploadError(APIError):
+    # The final state of the upload as reported by file_upload_info
+    upload: Optional[FileUpload] = None
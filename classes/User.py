@@ -5,7 +5,7 @@ from classes.Storage import Storage
 from classes.Upload import Upload
 from classes.RemoteUpload import RemoteUpload
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class User:
     email: str
     is_premium: bool
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from classes.APIError import APIError
+from classes.AccountQuota import AccountQuota
+from classes.File import File
+from classes.TransferReport import TransferReport
+
+if TYPE_CHECKING:
+    from classes.User import User
+
+    from .rapidgator import RapidgatorAPI
+
+logger = logging.getLogger("rapidgatorAPI")
+
+class _Account():
+    __slots__ = ("api", "traffic_left", "storage_left", "traffic_reserved", "storage_reserved", "refreshed")
+
+    def __init__(self, api: RapidgatorAPI) -> None:
+        self.api = api
+        self.traffic_left = 0
+        self.storage_left = 0
+        self.traffic_reserved = 0
+        self.storage_reserved = 0
+        self.refreshed: Optional[float] = None
+
+    def headroom(self, resource: str) -> int:
+        return getattr(self, f"{resource}_left") - getattr(self, f"{resource}_reserved")
+
+class AccountPool():
+    """Spreads downloads and uploads over several accounts by their remaining traffic and storage.
+
+    Every transfer goes to the account with the most headroom, i.e. the quota left minus the
+    bytes of the transfers already running on it. The quotas are read with info() when the pool
+    is first used and again once they are older than refresh_interval; in between the pool
+    counts finished transfers against them, so picking an account costs no request.
+
+        pool = AccountPool([RapidgatorAPI("a@example.com", "pw"), RapidgatorAPI("b@example.com", "pw")])
+        report = pool.download_files(file_ids, "/downloads", workers=8)
+
+    File and folder ids belong to one account: a download is looked up with the account that
+    downloads it unless the caller names the owning client, and uploads go to the root folder
+    unless `folders` maps the username of the chosen account to a folder id.
+
+    Args:
+        clients (Iterable[RapidgatorAPI]): One client per account.
+        refresh_interval (float): Seconds after which the quota of an account is read again. Default is 300.
+        reserve (int): Bytes of traffic and storage that are never used on any account. Default is 0.
+    """
+
+    def __init__(self, clients: Iterable[RapidgatorAPI], refresh_interval: float = 300, reserve: int = 0) -> None:
+        self.accounts = [_Account(api) for api in clients]
+        if not self.accounts:
+            raise ValueError("an account pool needs at least one client")
+        self.refresh_interval = refresh_interval
+        self.reserve = reserve
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> None:
+        """Reads the quota of every account whose numbers are older than refresh_interval (or of all accounts if force)."""
+        # Threads that find the same stale accounts wait for the first one instead of asking again
+        with self._refresh_lock:
+            now = time.monotonic()
+            stale = [account for account in self.accounts if force or account.refreshed is None or now - account.refreshed >= self.refresh_interval]
+            if not stale:
+                return
+            with ThreadPoolExecutor(max_workers=len(stale)) as executor:
+                for account, user in zip(stale, executor.map(self._info, stale)):
+                    with self._lock:
+                        # An account whose info() fails gets no transfers until its next refresh
+                        account.traffic_left = (user.traffic.left or 0) if user else 0
+                        account.storage_left = (user.storage.left or 0) if user else 0
+                        account.refreshed = now
+
+    @staticmethod
+    def _info(account: _Account) -> Optional[User]:
+        try:
+            return account.api.info()
+        except (APIError, requests.RequestException) as e:
+            logger.warning("Can't read the quota of %s: %s", account.api.username, e)
+            return None
+
+    def quotas(self) -> List[AccountQuota]:
+        """Returns the quota the pool currently assumes for every account."""
+        now = time.monotonic()
+        with self._lock:
+            return [AccountQuota(account.api.username, account.traffic_left, account.storage_left, account.traffic_reserved, account.storage_reserved, now - account.refreshed if account.refreshed is not None else float("inf")) for account in self.accounts]
+
+    @contextmanager
+    def use(self, traffic: int = 0, storage: int = 0, api: Optional[RapidgatorAPI] = None) -> Iterator[RapidgatorAPI]:
+        """Reserves quota on the account with the most headroom and yields its client.
+
+        The reserved bytes count as used when the block finishes without an exception and are
+        released otherwise.
+
+        Args:
+            traffic (int): Bytes of traffic the transfer needs.
+            storage (int): Bytes of storage the transfer needs.
+            api (RapidgatorAPI): Reserve on the account of this client instead. Default is the account with the most headroom.
+
+        Raises:
+            ValueError: if no account (or not the account of api) has enough traffic and storage left
+        """
+        self.refresh()
+        resource = "traffic" if traffic >= storage else "storage"
+        with self._lock:
+            fitting = [account for account in self.accounts if (api is None or account.api is api) and self._fits(account, traffic, storage)]
+            if not fitting:
+                if api is not None and all(account.api is not api for account in self.accounts):
+                    raise ValueError(f"{api.username} is not an account of this pool")
+                raise ValueError(f"no account has {traffic} bytes of traffic and {storage} bytes of storage left")
+            account = max(fitting, key=lambda account: account.headroom(resource))
+            account.traffic_reserved += traffic
+            account.storage_reserved += storage
+        succeeded = False
+        try:
+            yield account.api
+            succeeded = True
+        finally:
+            with self._lock:
+                account.traffic_reserved -= traffic
+                account.storage_reserved -= storage
+                if succeeded:
+                    account.traffic_left -= traffic
+                    account.storage_left -= storage
+
+    def _fits(self, account: _Account, traffic: int, storage: int) -> bool:
+        return (not traffic or account.headroom("traffic") - traffic >= self.reserve) and (not storage or account.headroom("storage") - storage >= self.reserve)
+
+    def download_file(self, file_id: str, path: str, api: Optional[RapidgatorAPI] = None, size: Optional[int] = None, **kwargs) -> str:
+        """Downloads a file with the account that has the most traffic left.
+
+        Without a size the file is looked up with file_info() by the same account that downloads it.
+
+        Args:
+            file_id (str): The key that identifies the file.
+            path (str): The target file path or directory.
+            api (RapidgatorAPI): The client of the account that owns file_id. Default is the account with the most traffic left.
+            size (int): The file size in bytes, saves the file_info() request.
+            **kwargs: Passed on to RapidgatorAPI.download_file.
+
+        Raises:
+            ValueError: if no account (or not the account of api) has enough traffic left
+
+        Returns:
+            str: The path of the downloaded file
+        """
+        if size is None:
+            with self.use(api=api) as api:
+                size = api.file_info(file_id).size or 0
+        with self.use(traffic=size, api=api) as api:
+            return api.download_file(file_id, path, **kwargs)
+
+    def upload_file(self, path: str, folders: Optional[Dict[str, str]] = None, **kwargs) -> Tuple[RapidgatorAPI, File]:
+        """Uploads a file with the account that has the most storage left.
+
+        Args:
+            path (str): The local file path.
+            folders (Dict[str, str]): The destination folder id by username. Default is the root folder of the chosen account.
+            **kwargs: Passed on to RapidgatorAPI.upload_file.
+
+        Raises:
+            ValueError: if no account has enough storage left
+
+        Returns:
+            Tuple[RapidgatorAPI, File]: The client of the account holding the file, and the file
+        """
+        with self.use(storage=os.path.getsize(path)) as api:
+            return api, api.upload_file(path, folder_id=(folders or {}).get(api.username), **kwargs)
+
+    def download_files(self, file_ids: Iterable[str], directory: str, workers: int = 4, **kwargs) -> TransferReport:
+        """Downloads many files in parallel, each with the account that has the most traffic left when it starts.
+
+        A failed download doesn't stop the others.
+
+        Returns:
+            TransferReport: The downloaded path by file id, and the error by file id for the failures
+        """
+        return self._run(lambda file_id: self.download_file(file_id, directory, **kwargs), file_ids, workers)
+
+    def upload_files(self, paths: Iterable[str], folders: Optional[Dict[str, str]] = None, workers: int = 4, **kwargs) -> TransferReport:
+        """Uploads many files in parallel, each with the account that has the most storage left when it starts.
+
+        A failed upload doesn't stop the others.
+
+        Returns:
+            TransferReport: The client holding the file and the file by path, and the error by path for the failures
+        """
+        return self._run(lambda path: self.upload_file(path, folders, **kwargs), paths, workers)
+
+    @staticmethod
+    def _run(transfer: Callable[[str], Any], items: Iterable[str], workers: int) -> TransferReport:
+        report = TransferReport()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {item: executor.submit(transfer, item) for item in dict.fromkeys(items)}
+            for item, future in futures.items():
+                try:
+                    report.done[item] = future.result()
+                except Exception as e:
+                    report.failed[item] = str(e)
+        return report
+
+    def close(self) -> None:
+        for account in self.accounts:
+            account.api.close()
+
+    def __enter__(self) -> "AccountPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,215 @@
+import asyncio
+import dataclasses
+import time
+from typing import Any, Callable, List, Optional
+
+try:
+    import aiohttp
+except ImportError as e:
+    raise ImportError("AsyncRapidgatorAPI requires aiohttp, install it with `pip install aiohttp`") from e
+
+from classes.APIError import APIError
+from classes.RequestEvent import RequestEvent
+
+from .cache import ResponseCache
+from .decoding import loads
+from .endpoints import RapidgatorEndpoints
+from .metrics import RequestHook, run_after, run_before
+from .scheduler import RequestScheduler
+from .singleflight import COALESCED_ENDPOINTS, AsyncSingleFlight, request_key
+from .tokens import TokenStore
+
+@dataclasses.dataclass
+class AsyncRapidgatorAPI(RapidgatorEndpoints):
+    """Asynchronous client offering the same endpoints as RapidgatorAPI as coroutines.
+
+    All requests share one aiohttp connection pool. Log in with `await client.login()` or use the
+    client as an async context manager:
+
+        async with AsyncRapidgatorAPI("myEmail", "myPassword") as rg:
+            files = await asyncio.gather(*(rg.file_info(file_id) for file_id in file_ids))
+
+    Args:
+        max_concurrency (int): Maximum number of requests in flight at the same time. Default is 100.
+        limit (int): Maximum number of open connections. Default is 100.
+        limit_per_host (int): Maximum number of open connections per host, 0 means no limit. Default is 0.
+        timeout (float): Total timeout of a request in seconds. Default is 60.
+        cache (ResponseCache): Serve read-only endpoints from this cache.
+        scheduler (RequestScheduler): Rate limits and retries every request. Default retries transient failures without a rate limit.
+        token_store (TokenStore): Reuse the token stored for username instead of logging in, and store new tokens there.
+        hooks (List[RequestHook]): Called before and after every request, e.g. a metrics.Metrics collector.
+        coalesce (bool): Let concurrent identical read requests share one network call. Default is true.
+    """
+    username: str
+    password: str
+    two_factor_code: Optional[str] = None
+    base_url: str = "https://rapidgator.net/api/v2/"
+    max_concurrency: int = 100
+    limit: int = 100
+    limit_per_host: int = 0
+    timeout: float = 60
+    cache: Optional[ResponseCache] = dataclasses.field(default=None, repr=False)
+    scheduler: RequestScheduler = dataclasses.field(default_factory=RequestScheduler, repr=False)
+    token_store: Optional[TokenStore] = dataclasses.field(default=None, repr=False)
+    hooks: List[RequestHook] = dataclasses.field(default_factory=list, repr=False)
+    coalesce: bool = True
+
+    def __post_init__(self) -> None:
+        self.token = None
+        self.session = None
+        self._semaphore = None
+        self._token_lock = asyncio.Lock()
+        self._flights = AsyncSingleFlight()
+
+    async def login(self) -> None:
+        """Logs in and stores the token used by all other requests.
+
+        If a token store is set and has a token for username other than the current one, that
+        token is used instead.
+
+        Raises:
+            APIError: e.g. if the credentials are wrong
+        """
+        await self._relogin(self.token)
+
+    async def _relogin(self, expired: Optional[str]) -> None:
+        # Coroutines that find the same expired token wait for the first one, which logs in once
+        async with self._token_lock:
+            if self.token != expired:
+                return
+            if self.token_store is None:
+                self.token = await self._send("POST", "user/login", self._login_params(), lambda response: response["token"])
+                return
+            # The store's lock blocks, so it is only taken in a worker thread and never across an await
+            token = await asyncio.to_thread(self.token_store.get, self.username)
+            if token is None or token == expired:
+                token = await self._send("POST", "user/login", self._login_params(), lambda response: response["token"])
+                token = await asyncio.to_thread(self._store_token, expired, token)
+            self.token = token
+
+    def _store_token(self, expired: Optional[str], token: str) -> str:
+        """Stores token unless another client stored a new one during the login, and returns the token to use."""
+        with self.token_store.lock(self.username):
+            stored = self.token_store.get(self.username)
+            if stored is not None and stored != expired:
+                return stored
+            self.token_store.set(self.username, token)
+            return token
+
+    async def _send(self, method: str, endpoint: str, params: dict, parse: Optional[Callable[[Any], Any]] = None, check: bool = True) -> Any:
+        if not self.hooks:
+            return await self._send_attempts(method, endpoint, params, parse, check, None)
+        run_before(self.hooks, method, endpoint, params)
+        event = RequestEvent(method, endpoint, None, 0)
+        start = time.perf_counter()
+        try:
+            return await self._send_attempts(method, endpoint, params, parse, check, event)
+        except Exception as e:
+            event.error = str(e)
+            raise
+        finally:
+            event.latency = time.perf_counter() - start
+            run_after(self.hooks, event)
+
+    async def _send_attempts(self, method: str, endpoint: str, params: dict, parse: Optional[Callable[[Any], Any]], check: bool, event: Optional[RequestEvent]) -> Any:
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        # aiohttp only accepts str, int and float values and doesn't drop None like requests does
+        params = {key: str(value) for key, value in params.items() if value is not None}
+        url = self.base_url + endpoint
+        attempt = 0
+        while True:
+            await asyncio.sleep(self.scheduler.delay(endpoint))
+            status = None
+            try:
+                async with self._semaphore:
+                    await self.scheduler.acquire_async()
+                    try:
+                        if method == "GET":
+                            request = self.session.get(url, params=params)
+                        else:
+                            request = self.session.post(url, data=params)
+                        async with request as r:
+                            status, content = r.status, await r.read()
+                    finally:
+                        self.scheduler.release()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if not self.scheduler.should_retry(method, attempt, connect_error=isinstance(e, aiohttp.ClientConnectorError)):
+                    raise
+            if status is not None:
+                try:
+                    body = loads(content)
+                except ValueError:
+                    body = None
+                # A proxy or error page may send JSON that isn't an API response
+                if not isinstance(body, dict) or "status" not in body:
+                    body = None
+                status = body["status"] if body is not None else status
+                self.scheduler.record(status)
+                if event is not None:
+                    event.status, event.bytes_received = status, event.bytes_received + len(content)
+                if status == 200 or not self.scheduler.should_retry(method, attempt, status):
+                    break
+            await asyncio.sleep(self.scheduler.retry_delay(attempt))
+            attempt += 1
+            if event is not None:
+                event.retries = attempt
+        if body is None:
+            raise APIError(status, None, content[:200].decode(errors="replace"))
+        # An expired token raises even for endpoints whose status isn't checked, so it can be renewed
+        if (check and status != 200) or status == 401:
+            raise APIError(status, body, body.get("details"))
+        return parse(body["response"]) if parse else body["response"]
+
+    async def _request(self, method: str, endpoint: str, params: dict, parse: Optional[Callable[[Any], Any]] = None, check: bool = True) -> Any:
+        if self.token is None:
+            await self._relogin(None)
+        if self.cache is not None:
+            hit, response = self.cache.get(endpoint, params)
+            if hit:
+                if self.hooks:
+                    run_before(self.hooks, method, endpoint, params)
+                    run_after(self.hooks, RequestEvent(method, endpoint, 200, 0, cached=True))
+                return parse(response) if parse else response
+        if not self.coalesce:
+            response = await self._fetch(method, endpoint, params, check)
+        elif endpoint in COALESCED_ENDPOINTS:
+            response, shared = await self._flights.do(request_key(endpoint, params), lambda: self._fetch(method, endpoint, params, check))
+            if shared and self.hooks:
+                run_before(self.hooks, method, endpoint, params)
+                run_after(self.hooks, RequestEvent(method, endpoint, 200, 0, coalesced=True))
+        else:
+            response = await self._fetch(method, endpoint, params, check)
+            # Reads started after a mutation must not get a response that may predate it
+            self._flights.forget()
+        return parse(response) if parse else response
+
+    async def _fetch(self, method: str, endpoint: str, params: dict, check: bool) -> Any:
+        token = self.token
+        # Taken before sending, so a response that a concurrent mutation made stale isn't cached
+        generation = self.cache.generation if self.cache is not None else None
+        try:
+            response = await self._send(method, endpoint, dict(params, token=token), check=check)
+        except APIError as e:
+            if e.status != 401:
+                raise
+            await self._relogin(token)
+            response = await self._send(method, endpoint, dict(params, token=self.token), check=check)
+        if self.cache is not None:
+            self.cache.update(endpoint, params, response, generation)
+        return response
+
+    async def close(self) -> None:
+        """Closes all pooled connections."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self) -> "AsyncRapidgatorAPI":
+        await self.login()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
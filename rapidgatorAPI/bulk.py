@@ -0,0 +1,111 @@
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, List, Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from classes.APIError import APIError
+from classes.BulkItemResult import BulkItemResult
+from classes.BulkReport import BulkReport
+
+def _results(batch: List[str], response) -> Optional[List[BulkItemResult]]:
+    """Turns a copy/move/delete response into one result per id.
+
+    Returns None if nothing was applied, so the ids can safely be sent again one by one.
+    """
+    result = response.get("result") if isinstance(response, dict) else None
+    if result is None:
+        return None
+    if not result.get("fail"):
+        return [BulkItemResult(item_id, True) for item_id in batch]
+    if not result.get("success"):
+        return None
+    # Partly applied: sending the ids again could copy files twice, so blame the ids the errors name
+    errors = [str(error) for error in result.get("errors") or []]
+    failed = {item_id: error for error in errors for item_id in set(batch).intersection(re.findall(r"[\w-]+", error))}
+    if len(failed) == result["fail"]:
+        return [BulkItemResult(item_id, item_id not in failed, failed.get(item_id)) for item_id in batch]
+    error = f"{result['fail']} of {len(batch)} items in this request failed: {'; '.join(errors)}"
+    return [BulkItemResult(item_id, False, error) for item_id in batch]
+
+def _not_sent(error: Exception) -> bool:
+    """Whether the request failed before it reached the server, so sending it again is safe."""
+    if isinstance(error, APIError) or isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError):
+        return False
+    # requests wraps urllib3's MaxRetryError, whose reason is the error of the last attempt
+    reason = error.args[0] if error.args else None
+    return isinstance(getattr(reason, "reason", reason), NewConnectionError)
+
+def bulk_apply(operation: Callable[[str], dict], ids: Iterable[str], batch_size: int = 100, workers: int = 4) -> BulkReport:
+    """Applies a copy, move or delete operation to many ids.
+
+    The ids are sent comma-separated in batches of batch_size, running up to `workers` batches
+    at the same time. If a batch is rejected with an APIError, can't connect or nothing of it was
+    applied, its ids are sent again one by one so every id gets its own result; any other exception,
+    including a connection lost after the request was sent, fails the whole batch. Nothing is
+    aborted because of a single failure. If a
+    batch was applied only partly, the failures are attributed to the ids named in the response's
+    errors, or to the whole batch if the errors don't name them.
+
+    Args:
+        operation (Callable[[str], dict]): Sends the request for comma-separated ids and returns the response, e.g. `lambda ids: api.file_move(ids, dest)`.
+        ids (Iterable[str]): The keys of the files or folders.
+        batch_size (int): Number of ids per request. Default is 100.
+        workers (int): Maximum number of requests in flight. Default is 4.
+
+    Returns:
+        BulkReport: One result per id
+    """
+    ids = list(dict.fromkeys(ids))
+    batch_size = max(1, batch_size)
+
+    def run(batch: List[str]) -> Optional[List[BulkItemResult]]:
+        try:
+            response = operation(",".join(batch))
+        except Exception as e:
+            if len(batch) == 1 or not _not_sent(e):
+                # The batch may have been applied, sending its ids again could copy files twice
+                return [BulkItemResult(item_id, False, str(e)) for item_id in batch]
+            return None
+        results = _results(batch, response)
+        if results is None and len(batch) == 1:
+            return [BulkItemResult(batch[0], False, str(response))]
+        return results
+
+    report = BulkReport()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {executor.submit(run, ids[start:start + batch_size]): ids[start:start + batch_size] for start in range(0, len(ids), batch_size)}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = running.pop(future)
+                results = future.result()
+                if results is None:
+                    running.update({executor.submit(run, [item_id]): [item_id] for item_id in batch})
+                else:
+                    report.items.extend(results)
+    return report
+
+def bulk_map(operation: Callable[[str], object], ids: Iterable[str], workers: int = 4) -> BulkReport:
+    """Runs a single-id operation for many ids concurrently and records every outcome.
+
+    Args:
+        operation (Callable[[str], object]): Sends the request for one id, e.g. `lambda file_id: api.file_rename(file_id, names[file_id])`.
+        ids (Iterable[str]): The keys of the files or folders.
+        workers (int): Maximum number of requests in flight. Default is 4.
+
+    Returns:
+        BulkReport: One result per id
+    """
+    def run(item_id: str) -> BulkItemResult:
+        try:
+            operation(item_id)
+        except Exception as e:
+            return BulkItemResult(item_id, False, str(e))
+        return BulkItemResult(item_id, True)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return BulkReport(list(executor.map(run, dict.fromkeys(ids))))
@@ -0,0 +1,182 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+# Seconds a response of a read-only endpoint stays fresh
+DEFAULT_TTLS = {
+    "user/info": 30,
+    "folder/info": 30,
+    "folder/content": 30,
+    "file/info": 60,
+    "file/check_link": 300,
+    "file/onetimelink_info": 30,
+}
+
+# Requests to these endpoints neither change anything nor are cached
+_PASSIVE_ENDPOINTS = {"user/login", "file/upload_info", "file/download", "trashcan/content", "remote/info"}
+
+# Mutations whose effect can't be narrowed down to the ids in their parameters
+_BROAD_MUTATIONS = {"trashcan/restore"}
+
+# Mutations that target the root folder if no folder_id is passed
+_ROOT_MUTATIONS = {"file/upload", "folder/create"}
+
+# Reads whose responses name no ids to tag them with, so every mutation drops them
+_UNTAGGED_ENDPOINTS = {"user/info", "file/check_link"}
+
+_ID_KEYS = ("file_id", "folder_id", "folder_id_dest", "parent_folder_id", "link_id")
+
+# Tag for listings of the root folder requested without a folder_id
+_ROOT = "/"
+
+def _collect_ids(value: Any, ids: Set[str]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in _ID_KEYS and isinstance(item, str):
+                ids.update(item.split(","))
+            else:
+                _collect_ids(item, ids)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_ids(item, ids)
+
+class ResponseCache():
+    """An opt-in LRU cache for responses of read-only endpoints.
+
+    Every entry expires after the TTL of its endpoint. Entries are tagged with the file, folder
+    and link ids of their parameters and response; a mutating request drops all entries tagged
+    with an id it touches (e.g. file_move drops the cached file_info of the file, the listing of
+    the folder that contained it and the listing of the destination folder). Any mutation also
+    drops cached user/info responses, whose storage numbers may have changed, and
+    file/check_link responses, which only name urls.
+
+    A read that was sent before a mutation may be answered after it. Pass the `generation`
+    taken before sending to update(), and the response is not stored if one of its ids or its
+    endpoint was invalidated since.
+
+    Args:
+        ttls (Dict[str, float]): TTL in seconds per endpoint; only these endpoints are cached. Default is DEFAULT_TTLS.
+        max_entries (int): Maximum number of cached responses. Default is 1024.
+        max_bytes (int): Maximum total size of the cached responses, measured as JSON. Default is 64 MiB.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 1024, max_bytes: int = 64 << 20) -> None:
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Set[str], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Counts invalidations; the last one of every id and endpoint is remembered for up to
+        # max_entries ids, reads that started before the oldest forgotten one are not stored
+        self.generation = 0
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._endpoints_invalidated: Dict[str, int] = {}
+        self._floor = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(endpoint: str, params: dict) -> Hashable:
+        return endpoint, tuple(sorted((key, str(value)) for key, value in params.items()))
+
+    def get(self, endpoint: str, params: dict) -> Tuple[bool, Any]:
+        """Looks up a response.
+
+        Args:
+            endpoint (str): The endpoint, e.g. 'file/info'.
+            params (dict): The request parameters without the token.
+
+        Returns:
+            Tuple[bool, Any]: Whether a fresh response was found, and the response
+        """
+        if endpoint not in self.ttls:
+            return False, None
+        key = self._key(endpoint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[3]
+
+    def update(self, endpoint: str, params: dict, response: Any, generation: Optional[int] = None) -> None:
+        """Stores the response of a read-only endpoint or invalidates the entries a mutation touches.
+
+        Args:
+            endpoint (str): The endpoint, e.g. 'file/move'.
+            params (dict): The request parameters without the token.
+            response (Any): The 'response' part of the body.
+            generation (int): The cache's generation when the request was sent. If passed, a read is only stored if nothing it is tagged with was invalidated since.
+        """
+        if endpoint in self.ttls:
+            self._put(endpoint, params, response, generation)
+        elif endpoint not in _PASSIVE_ENDPOINTS:
+            if endpoint in _BROAD_MUTATIONS:
+                self.clear()
+                return
+            ids = set()
+            _collect_ids(params, ids)
+            if endpoint in _ROOT_MUTATIONS and "folder_id" not in params:
+                ids.add(_ROOT)
+            self.invalidate(ids, endpoints=_UNTAGGED_ENDPOINTS)
+
+    def _put(self, endpoint: str, params: dict, response: Any, generation: Optional[int]) -> None:
+        nbytes = len(json.dumps(response))
+        if nbytes > self.max_bytes:
+            return
+        ids = set()
+        _collect_ids(params, ids)
+        _collect_ids(response, ids)
+        if endpoint.startswith("folder/") and "folder_id" not in params:
+            ids.add(_ROOT)
+        key = self._key(endpoint, params)
+        with self._lock:
+            if generation is not None and self._stale(endpoint, ids, generation):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttls[endpoint], nbytes, ids, response)
+            self.nbytes += nbytes
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def _stale(self, endpoint: str, ids: Set[str], generation: int) -> bool:
+        if generation < self._floor or self._endpoints_invalidated.get(endpoint, 0) > generation:
+            return True
+        return any(self._invalidated.get(item_id, 0) > generation for item_id in ids)
+
+    def invalidate(self, ids: Set[str], endpoints: Set[str] = frozenset()) -> None:
+        """Drops every entry tagged with one of the ids or belonging to one of the endpoints."""
+        with self._lock:
+            self.generation += 1
+            for item_id in ids:
+                self._invalidated[item_id] = self.generation
+                self._invalidated.move_to_end(item_id)
+            while len(self._invalidated) > self.max_entries:
+                self._floor = self._invalidated.popitem(last=False)[1]
+            for endpoint in endpoints:
+                self._endpoints_invalidated[endpoint] = self.generation
+            for key in [key for key, entry in self._entries.items() if key[0] in endpoints or entry[2] & ids]:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            # Every read in flight may predate this
+            self._floor = self.generation
+            self._invalidated.clear()
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _drop(self, key: Hashable) -> None:
+        self.nbytes -= self._entries.pop(key)[1]
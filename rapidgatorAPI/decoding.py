@@ -0,0 +1,116 @@
+import dataclasses
+import importlib
+import json
+import threading
+import typing
+from typing import Any, Callable, Dict, Optional, Union
+
+# The JSON parser, chosen on the first call of loads() so importing the package stays cheap
+_loads: Optional[Callable[[Union[bytes, str]], Any]] = None
+
+# Compiled decoders by class and by class name
+_decoders: Dict[type, Callable[[dict], Any]] = {}
+_models: Dict[str, Callable[[dict], Any]] = {}
+# Placeholders of the classes being compiled; they are kept apart from _decoders so other
+# threads never get a placeholder whose class isn't compiled yet
+_pending: Dict[type, Callable[[dict], Any]] = {}
+_compile_lock = threading.RLock()
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parses a JSON body, with orjson if it is installed.
+
+    Raises:
+        ValueError: if data is not valid JSON
+    """
+    global _loads
+    if _loads is None:
+        try:
+            import orjson
+            _loads = orjson.loads
+        except ImportError:
+            _loads = json.loads
+    return _loads(data)
+
+def _unwrap_optional(hint: Any) -> Any:
+    args = typing.get_args(hint)
+    if typing.get_origin(hint) is Union and type(None) in args:
+        rest = [arg for arg in args if arg is not type(None)]
+        if len(rest) == 1:
+            return rest[0], True
+    return hint, False
+
+def decoder(cls: type) -> Callable[[dict], Any]:
+    """Returns a function that builds a dataclass instance from a decoded JSON object.
+
+    The function is generated once per class from its type hints: nested dataclasses and lists
+    of dataclasses are converted with their own decoders, all other values are passed on as they
+    are, without the type checks dacite does. Unknown keys are ignored, missing keys fall back to
+    the field default or to None for Optional fields.
+
+    Args:
+        cls (type): A dataclass.
+
+    Returns:
+        Callable[[dict], Any]: The decoder. It raises ValueError if a required key is missing.
+    """
+    decode = _decoders.get(cls)
+    if decode is not None:
+        return decode
+    with _compile_lock:
+        decode = _decoders.get(cls) or _pending.get(cls)
+        if decode is not None:
+            return decode
+        # Placeholder for classes that (indirectly) contain themselves, only called once compiled
+        _pending[cls] = lambda data: _decoders[cls](data)
+        try:
+            _decoders[cls] = decode = _compile(cls)
+        finally:
+            del _pending[cls]
+        return decode
+
+def _compile(cls: type) -> Callable[[dict], Any]:
+    hints = typing.get_type_hints(cls)
+    namespace = {"cls": cls}
+    arguments = []
+    for number, field in enumerate(dataclasses.fields(cls)):
+        if not field.init:
+            continue
+        hint, optional = _unwrap_optional(hints[field.name])
+        key = repr(field.name)
+        if field.default is not dataclasses.MISSING:
+            namespace[f"default{number}"] = field.default
+            raw = f"data.get({key}, default{number})"
+        elif field.default_factory is not dataclasses.MISSING:
+            namespace[f"factory{number}"] = field.default_factory
+            raw = f"(data[{key}] if {key} in data else factory{number}())"
+        elif optional:
+            raw = f"data.get({key})"
+        else:
+            raw = f"data[{key}]"
+        item, _ = _unwrap_optional(typing.get_args(hint)[0]) if typing.get_origin(hint) is list else (None, False)
+        if dataclasses.is_dataclass(hint):
+            namespace[f"decode{number}"] = decoder(hint)
+            value = f"decode{number}(value{number})"
+        elif item is not None and dataclasses.is_dataclass(item):
+            namespace[f"decode{number}"] = decoder(item)
+            value = f"[decode{number}(item) for item in value{number}]"
+        else:
+            arguments.append(f"{field.name}={raw}")
+            continue
+        arguments.append(f"{field.name}=None if (value{number} := {raw}) is None else {value}")
+    source = (
+        "def decode(data):\n"
+        "    try:\n"
+        f"        return cls({', '.join(arguments)})\n"
+        "    except KeyError as e:\n"
+        f"        raise ValueError(f'{cls.__name__} is missing the field {{e}}') from None\n"
+    )
+    exec(source, namespace)
+    return namespace["decode"]
+
+def model(name: str) -> Callable[[dict], Any]:
+    """Returns the decoder of the class `classes.<name>`, importing the class on first use."""
+    decode = _models.get(name)
+    if decode is None:
+        decode = _models[name] = decoder(getattr(importlib.import_module(f"classes.{name}"), name))
+    return decode
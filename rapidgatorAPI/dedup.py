@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from classes.APIError import APIError
+from classes.DedupReport import DedupReport
+from classes.File import File
+
+from .hashing import HashCache, hash_files
+
+def _hashcopy(api, entries: Dict[str, Tuple[str, str]], folder_id: str, workers: int) -> Dict[str, Union[File, Exception]]:
+    """Sends file_hashcopy for every (name, hash) entry and returns the copied file or the error by key."""
+    def copy(key: str) -> Union[File, Exception]:
+        name, hash = entries[key]
+        try:
+            return api.file_hashcopy(hash, folder_id, name)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return dict(zip(entries, executor.map(copy, entries)))
+
+def hashcopy_files(api, hashes: Dict[str, str], folder_id: str = None, workers: int = 8) -> DedupReport:
+    """Creates files from contents the server already has, with concurrent file_hashcopy requests.
+
+    Args:
+        api (RapidgatorAPI): The client.
+        hashes (Dict[str, str]): The MD5 hash by file name.
+        folder_id (str): The key that identifies the destination folder. If the folder_id is not passed, the root folder is used.
+        workers (int): Maximum number of requests in flight. Default is 8.
+
+    Returns:
+        DedupReport: The copied names, the names whose content the server doesn't have in missing, and the bytes saved
+    """
+    report = DedupReport()
+    folder_id = folder_id or api.folder_info().folder_id
+    for name, result in _hashcopy(api, {name: (name, hash) for name, hash in hashes.items()}, folder_id, workers).items():
+        if not isinstance(result, Exception):
+            report.copied.append(name)
+            report.bytes_saved += result.size or 0
+        elif isinstance(result, APIError) and result.status == 404:
+            report.missing.append(name)
+        else:
+            report.failed[name] = str(result)
+    return report
+
+def upload_files(api, paths: Iterable[str], folder_id: str = None, workers: int = 4, hash_cache: Optional[HashCache] = None, poll_interval: float = 1) -> DedupReport:
+    """Uploads local files, sending bytes only for contents the server doesn't have yet.
+
+    The files are hashed in parallel. Every distinct content is first probed with file_hashcopy,
+    which creates the file right away if the server knows the hash. The remaining contents are
+    uploaded concurrently (the server may still answer with an instant upload), and further
+    local files with the same content are hash-copied afterwards instead of uploaded again.
+    Files are named after their local file names.
+
+    Args:
+        api (RapidgatorAPI): The client.
+        paths (Iterable[str]): The local files.
+        folder_id (str): The key that identifies the destination folder. If the folder_id is not passed, the root folder is used.
+        workers (int): Maximum number of concurrent requests and uploads. Default is 4.
+        hash_cache (HashCache): Hashes to reuse and to extend.
+        poll_interval (float): Seconds between file_upload_info requests while an upload is processed. Default is 1.
+
+    Returns:
+        DedupReport: What happened to every path, with the bytes sent and the bytes saved
+    """
+    hashes = hash_files(paths, cache=hash_cache)
+    folder_id = folder_id or api.folder_info().folder_id
+    groups: Dict[str, List[str]] = {}
+    for path, hash in hashes.items():
+        groups.setdefault(hash, []).append(path)
+    report = DedupReport()
+
+    def record(path: str, result: Union[File, Exception, int, None]) -> bool:
+        """Adds the outcome for a path to the report and returns whether the file was created.
+
+        result is the number of bytes sent, None for an instant upload or the File of a hash copy.
+        """
+        if isinstance(result, Exception):
+            report.failed[path] = str(result)
+            return False
+        if isinstance(result, int):
+            report.uploaded.append(path)
+            report.bytes_uploaded += result
+        else:
+            report.copied.append(path)
+            report.bytes_saved += os.path.getsize(path)
+        return True
+
+    def upload(path: str) -> Optional[int]:
+        # Stays None if the server answered file/upload with a finished (instant) upload
+        sent = None
+
+        def progress(done: int, total: int) -> None:
+            nonlocal sent
+            sent = done
+
+        api.upload_file(path, folder_id, hash=hashes[path], poll_interval=poll_interval, progress=progress)
+        return sent
+
+    # Probe every distinct content with its first file
+    firsts = [group[0] for group in groups.values()]
+    probed = _hashcopy(api, {path: (os.path.basename(path), hashes[path]) for path in firsts}, folder_id, workers)
+    known = {hashes[path] for path, result in probed.items() if not isinstance(result, Exception)}
+    for path in firsts:
+        if hashes[path] in known:
+            record(path, probed[path])
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {path: executor.submit(upload, path) for path in firsts if hashes[path] not in known}
+        for path, future in futures.items():
+            try:
+                result = future.result()
+            except Exception as e:
+                result = e
+            if record(path, result):
+                known.add(hashes[path])
+    duplicates = [path for group in groups.values() for path in group[1:]]
+    copied = _hashcopy(api, {path: (os.path.basename(path), hashes[path]) for path in duplicates if hashes[path] in known}, folder_id, workers)
+    for path in duplicates:
+        record(path, copied.get(path) or IOError(f"the first file with the content of {path} failed"))
+    return report
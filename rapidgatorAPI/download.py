@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from .transport import Transport
+
+class DownloadJournal():
+    """Remembers which byte ranges of a download are already on disk.
+
+    The journal lives next to the target file as `<path>.rgdownload` and is rewritten atomically
+    at most once per `interval` seconds, so an interrupted download can continue where it
+    stopped.
+
+    Args:
+        path (str): The journal file path.
+        file_id (str): The key that identifies the downloaded file.
+        size (int): The file size.
+        segments (List[List[int]]): [start, end, done] for every segment, end is exclusive and done counts the bytes written from start.
+        interval (float): Minimum number of seconds between two writes of the journal. Default is 1.
+    """
+
+    def __init__(self, path: str, file_id: str, size: int, segments: List[List[int]], interval: float = 1) -> None:
+        self.path = path
+        self.file_id = file_id
+        self.size = size
+        self.segments = segments
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._saved = 0.0
+
+    @classmethod
+    def load(cls, path: str, file_id: str, size: int) -> Optional["DownloadJournal"]:
+        """Returns the journal stored at path if it belongs to the same file, otherwise None."""
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("file_id") != file_id or state.get("size") != size:
+            return None
+        return cls(path, file_id, size, state["segments"])
+
+    @property
+    def done(self) -> int:
+        return sum(segment[2] for segment in self.segments)
+
+    def advance(self, index: int, nbytes: int) -> None:
+        with self._lock:
+            self.segments[index][2] += nbytes
+            if time.monotonic() - self._saved >= self.interval:
+                self._save()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save()
+
+    def _save(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"file_id": self.file_id, "size": self.size, "segments": self.segments}, f)
+        os.replace(tmp, self.path)
+        self._saved = time.monotonic()
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def split_segments(size: int, segments: int, min_segment_size: int) -> List[List[int]]:
+    """Splits size bytes into at most `segments` ranges of at least min_segment_size bytes."""
+    count = max(1, min(segments, size // max(min_segment_size, 1)))
+    step = -(-size // count)
+    return [[start, min(start + step, size), 0] for start in range(0, size, step)] or [[0, 0, 0]]
+
+def download_segments(transport: Transport, url: str, path: str, journal: DownloadJournal, chunk_size: int, retries: int = 3, progress: Optional[Callable[[int, int], None]] = None) -> None:
+    """Fetches the missing bytes of every journal segment in parallel into the preallocated file.
+
+    Each segment is requested with an HTTP Range header starting at the first byte not yet
+    written and is written in place through its own file handle. A broken connection is retried
+    from where the segment stopped.
+
+    Args:
+        transport (Transport): The transport used for the range requests.
+        url (str): The download URL.
+        path (str): The target file, already allocated to the full size.
+        journal (DownloadJournal): The segments and their progress.
+        chunk_size (int): Number of bytes read from the connection and written per step.
+        retries (int): How often a broken segment is requested again. Default is 3.
+        progress (Callable[[int, int], None]): Called with (bytes on disk, size) after every chunk.
+
+    Raises:
+        IOError: e.g. if the server ignores the Range header
+        requests.RequestException: e.g. if a segment still fails after all retries
+    """
+    import requests
+
+    def fetch(index: int) -> None:
+        for attempt in range(retries + 1):
+            start, end, done = journal.segments[index]
+            if start + done >= end:
+                return
+            if attempt:
+                time.sleep(0.5 * 2 ** (attempt - 1))
+            headers = {"Range": f"bytes={start + done}-{end - 1}"}
+            try:
+                with transport.request("GET", url, headers=headers, stream=True) as r:
+                    r.raise_for_status()
+                    if r.status_code != 206 and start + done > 0:
+                        raise IOError("the download server ignored the Range header")
+                    with open(path, "r+b") as f:
+                        f.seek(start + done)
+                        for chunk in r.iter_content(chunk_size):
+                            chunk = chunk[:end - f.tell()]
+                            f.write(chunk)
+                            journal.advance(index, len(chunk))
+                            if progress:
+                                progress(journal.done, journal.size)
+                            if f.tell() >= end:
+                                break
+            except requests.RequestException:
+                if attempt == retries:
+                    raise
+        start, end, done = journal.segments[index]
+        if start + done < end:
+            raise IOError(f"bytes {start + done}-{end - 1} could not be downloaded")
+
+    with ThreadPoolExecutor(max_workers=len(journal.segments)) as executor:
+        try:
+            # list() re-raises the first segment that failed for good
+            list(executor.map(fetch, range(len(journal.segments))))
+        finally:
+            journal.save()
@@ -0,0 +1,630 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
+
+from classes.APIError import APIError
+
+from .decoding import model
+
+if TYPE_CHECKING:
+    from classes.User import User
+    from classes.Folder import Folder
+    from classes.Pager import Pager
+    from classes.File import File
+    from classes.FileColumns import FileColumns
+    from classes.FileUpload import FileUpload
+    from classes.FileDownload import FileDownload
+    from classes.OneTimeLink import OneTimeLink
+    from classes.CheckLinkResult import CheckLinkResult
+    from classes.RemoteUploadJob import RemoteUploadJob
+
+class RapidgatorEndpoints():
+    """The Rapidgator API endpoints, shared by RapidgatorAPI and AsyncRapidgatorAPI.
+
+    Every endpoint validates its arguments, builds the request parameters and hands them to
+    `_request` together with a parser for the response. Subclasses implement `_request`: the
+    synchronous client returns the parsed result, the asynchronous client returns a coroutine.
+    """
+    
+    def _request(self, method: str, endpoint: str, params: dict, parse: Optional[Callable[[Any], Any]] = None, check: bool = True) -> Any:
+        """Sends an authenticated request and parses the response.
+
+        Args:
+            method (str): 'GET' or 'POST'.
+            endpoint (str): The endpoint path below the API base URL, e.g. 'file/info'.
+            params (dict): The request parameters without the token.
+            parse (Callable): Turns the 'response' part of the body into the result. If not passed, the 'response' part is returned as is.
+            check (bool): Raise if the body's status is not 200. Default is true.
+        """
+        raise NotImplementedError
+    
+    def _login_params(self) -> dict:
+        params = {
+            "login": self.username,
+            "password": self.password,
+        }
+        if self.two_factor_code:
+            params["code"] = self.two_factor_code
+        return params
+    
+    def info(self) -> User:
+        """Returns a list of the user's personal information.
+
+        Raises:
+            APIError: e.g. if user is not found
+
+        Returns:
+            User: The user's personal information
+        """
+        params = {}
+        return self._request("GET", "user/info", params, lambda response: model("User")(response["user"]))
+        
+    def folder_create(self, name: str, parent_folder_id: str = None) -> Folder:
+        """Creates a folder.
+
+        Args:
+            name (str): The name of the folder to be created.
+            parent_folder_id (str): The key that identifies the folder. If the parent_folder_id is not passed, will return the root folder details.
+
+        Raises:
+            APIError: e.g. if the parent folder is not found
+
+        Returns:
+            Folder: The created folder
+        """
+        params = {
+            "name": name
+        }
+        if parent_folder_id:
+            params["folder_id"] = parent_folder_id
+        return self._request("POST", "folder/create", params, lambda response: model("Folder")(response["folder"]))
+        
+    def folder_info(self, folder_id: str = None) -> Folder:
+        """Returns a folder's and list of sub folders details.
+
+        Args:
+            folder_id (str): The key that identifies the folder. If the folder_id is not passed, will return the root folder details.
+
+        Raises:
+            APIError: e.g. if the folder is not found
+
+        Returns:
+            Folder: The folder information
+        """
+        params = {}
+        if folder_id:
+            params["folder_id"] = folder_id
+        return self._request("GET", "folder/info", params, lambda response: model("Folder")(response["folder"]))
+        
+    def folder_content(self, folder_id: str = None, page: int = 1, per_page: int = 500, sort_column: str = "name", sort_direction: str = "ASC") -> Tuple[Folder, Pager]:
+        """Returns a folder's, list of sub folders and list of files details.
+
+        Args:
+            folder_id (str): The key that identifies the folder. If the folder_id is not passed, will return the root folder details.
+            page (int): Page number. Default is 1
+            per_page (int): TNumber of files per page. Default is 500.
+            sort_column (str): Sort column name. Possible values: 'name', 'created', 'size', 'nb_downloads'. Default is 'name'.
+            sort_direction (str): Sort direction. Possible values: 'ASC', 'DESC'. Default is 'ASC'.
+
+        Raises:
+            APIError: e.g. if the folder is not found
+            ValueError: e.g. if sort_column or sort_direction is invalid
+
+        Returns:
+            Folder: The folder information
+        """
+        params = self._folder_content_params(folder_id, page, per_page, sort_column, sort_direction)
+        return self._request("GET", "folder/content", params, lambda response: (model("Folder")(response["folder"]), model("Pager")(response["pager"])))
+        
+    def folder_content_columns(self, columns: FileColumns, folder_id: str = None, page: int = 1, per_page: int = 500, sort_column: str = "name", sort_direction: str = "ASC") -> Tuple[Folder, Pager]:
+        """Like folder_content, but appends the files to a FileColumns container instead of creating a File object per file.
+
+        Args:
+            columns (FileColumns): Receives the files of the page.
+            folder_id (str): The key that identifies the folder. If the folder_id is not passed, will return the root folder details.
+            page (int): Page number. Default is 1
+            per_page (int): Number of files per page. Default is 500.
+            sort_column (str): Sort column name. Possible values: 'name', 'created', 'size', 'nb_downloads'. Default is 'name'.
+            sort_direction (str): Sort direction. Possible values: 'ASC', 'DESC'. Default is 'ASC'.
+
+        Raises:
+            APIError: e.g. if the folder is not found
+            ValueError: e.g. if sort_column or sort_direction is invalid
+
+        Returns:
+            Tuple[Folder, Pager]: The folder information without files, and the pager
+        """
+        def parse(response: dict) -> Tuple[Folder, Pager]:
+            # The response may be cached, so it is copied rather than modified
+            folder = model("Folder")(dict(response["folder"], files=None))
+            columns.extend(response["folder"].get("files") or [])
+            return folder, model("Pager")(response["pager"])
+
+        params = self._folder_content_params(folder_id, page, per_page, sort_column, sort_direction)
+        return self._request("GET", "folder/content", params, parse)
+    
+    @staticmethod
+    def _folder_content_params(folder_id: Optional[str], page: int, per_page: int, sort_column: str, sort_direction: str) -> dict:
+        params = {}
+        if folder_id:
+            params["folder_id"] = folder_id
+        if page:
+            params["page"] = page
+        if per_page:
+            params["per_page"] = per_page
+        if sort_column:
+            if sort_column not in ["name", "created", "size", "nb_downloads"]:
+                raise ValueError("sort_column must be one of 'name', 'created', 'size', 'nb_downloads'")
+            params["sort_column"] = sort_column
+        if sort_direction:
+            if sort_direction not in ["ASC", "DESC"]:
+                raise ValueError("sort_direction must be one of 'ASC', 'DESC'")
+            params["sort_direction"] = sort_direction
+        return params
+        
+    def folder_rename(self, folder_id: str, name: str) -> Folder:
+        """Rename a folder.
+
+        Args:
+            folder_id (str): The key that identifies the folder to be renamed.
+            name (str): The new name of the folder.
+
+        Returns:
+            Folder: The renamed folder
+        """
+        params = {
+            "folder_id": folder_id,
+            "name": name
+        }
+        return self._request("POST", "folder/rename", params, lambda response: model("Folder")(response["folder"]))
+        
+    def folder_copy(self, folder_id: str, folder_id_dest: str) -> dict:
+        """Copy a folder to another folder (This operation also works with foreign folders).
+
+        Args:
+            folder_id (str): The key that identifies the folder to be copied. Several keys can be passed separated by comma.
+            folder_id_dest (str): The key that identifies the destination folder.
+
+        Returns:
+            Folder: The copied folder
+        """
+        params = {
+            "folder_id": folder_id,
+            "folder_id_dest": folder_id_dest
+        }
+        # Even if the folder is not found, the API returns a 200 status code. WTF?
+        return self._request("POST", "folder/copy", params, check=False)
+    
+    def folder_move(self, folder_id: str, folder_id_dest: str) -> dict:
+        """Move a folder to another folder (This operation also works with foreign folders).
+
+        Args:
+            folder_id (str): The key that identifies the folder to be moved. Several keys can be passed separated by comma.
+            folder_id_dest (str): The key that identifies the destination folder.
+
+        Returns:
+            Folder: The moved folder
+        """
+        params = {
+            "folder_id": folder_id,
+            "folder_id_dest": folder_id_dest
+        }
+        # Even if the folder is not found, the API returns a 200 status code. WTF?
+        return self._request("POST", "folder/move", params, check=False)
+    
+    def folder_delete(self, folder_id: str) -> dict:
+        """Delete a folder.
+
+        Args:
+            folder_id (str): The key that identifies the folder to be deleted. Several keys can be passed separated by comma.
+
+        Returns:
+            dict: The response
+        """
+        params = {
+            "folder_id": folder_id
+        }
+        # Even if the folder is not found, the API returns a 200 status code. WTF?
+        return self._request("POST", "folder/delete", params, check=False)
+    
+    # def folder_change_mode(self, folder_id: str, mode: int) -> Folder:
+    #     """Change a folder mode.
+
+    #     Args:
+    #         folder_id (str): The key that identifies the folder to be changed.
+    #         mode (int): The new mode of the folder. Possible values: 0 - Public, 1 - Premium only, 2 - Private, 3 - Hotlink.
+            
+    #     Raises:
+    #         APIError: e.g. if the folder is not found
+    #         ValueError: e.g. if mode is invalid
+
+    #     Returns:
+    #         Folder: The changed folder
+    #     """
+    #     if mode not in [0, 1, 2, 3]:
+    #         raise ValueError("mode must be one of 0, 1, 2, 3")
+    #     params = {
+    #         "folder_id": folder_id,
+    #         "mode": mode
+    #     }
+    #     return self._request("POST", "folder/change_mode", params, lambda response: model("Folder")(response["folder"]))
+        
+    def file_upload(self, name: str, hash: str, size: int, folder_id: int = None, multipart: bool = True) -> FileUpload:
+        """Checks if instant upload is possible and return upload session object with file info or upload URL.
+        
+        Upload steps:
+            1. Do file_upload API request. If upload state not equal 0 no need other steps.
+            2. Upload file to upload url.
+            3. Do file_upload_info API request.
+            
+        RapidgatorAPI.upload_file does all three steps for a local file.
+
+        Args:
+            name (str): The file name
+            hash (str): MD5 hash of the file
+            size (int): The file size
+            folder_id (int): The key that identifies the folder. If the folder_id is not passed, will upload to the root folder.
+            multipart (bool): This parameter indicates the type of upload. Default is true.
+
+        Raises:
+            APIError: e.g. you can't create more than 10 copies of the same file
+
+        Returns:
+            FileUpload: The uploaded file status
+        """
+        params = {
+            "name": name,
+            "hash": hash,
+            "size": size
+        }
+        if folder_id:
+            params["folder_id"] = folder_id
+        if multipart is not None:
+            params["multipart"] = multipart
+        return self._request("POST", "file/upload", params, lambda response: model("FileUpload")(response["upload"]))
+        
+    def file_upload_info(self, upload_id: str) -> FileUpload:
+        """Checks upload session state.
+
+        Args:
+            upload_id (str): The upload session id.
+
+        Raises:
+            APIError: e.g. if the upload id is not found
+
+        Returns:
+            FileUpload: The uploaded file status
+        """
+        params = {
+            "upload_id": upload_id
+        }
+        return self._request("GET", "file/upload_info", params, lambda response: model("FileUpload")(response["upload"]))
+        
+    def file_download(self, file_id: str) -> FileDownload:
+        """Download a file.
+
+        Args:
+            file_id (str): The key that identifies the file.
+
+        Raises:
+            APIError: e.g. if the file is not found
+
+        Returns:
+            FileDownload: The file download URL
+        """
+        params = {
+            "file_id": file_id
+        }
+        return self._request("GET", "file/download", params, lambda response: model("FileDownload")(response["file"]))
+        
+    def file_info(self, file_id: str) -> File:
+        """Returns a file's details.
+
+        Args:
+            file_id (str): The key that identifies the file.
+
+        Raises:
+            APIError: e.g. if the file is not found
+
+        Returns:
+            File: The file information
+        """
+        params = {
+            "file_id": file_id
+        }
+        return self._request("GET", "file/info", params, lambda response: model("File")(response["file"]))
+        
+    def file_rename(self, file_id: str, name: str) -> File:
+        """Rename a file.
+
+        Args:
+            file_id (str): The key that identifies the file to be renamed.
+            name (str): The new name of the file.
+
+        Returns:
+            File: The renamed file
+        """
+        params = {
+            "file_id": file_id,
+            "name": name
+        }
+        return self._request("POST", "file/rename", params, lambda response: model("File")(response["file"]))
+        
+    def file_copy(self, file_id: str, folder_id_dest: str) -> dict:
+        """Copy a file to another folder (This operation also works with foreign folders).
+
+        Args:
+            file_id (str): The key that identifies the file to be copied. Several keys can be passed separated by comma.
+            folder_id_dest (str): The key that identifies the destination folder.
+            
+        Raises:
+            APIError: e.g. if the destination folder is not found
+
+        Returns:
+            dict: The response
+        """
+        params = {
+            "file_id": file_id,
+            "folder_id_dest": folder_id_dest
+        }
+        return self._request("POST", "file/copy", params)
+        
+    def file_xcopy(self, url: str, folder_id_dest: str) -> File:
+        """Copy a file to another folder by download link.
+
+        Args:
+            url (str): The key that identifies the file to be copied.
+            folder_id_dest (str): The key that identifies the destination folder.
+            
+        Raises:
+            APIError: e.g. you can't create more than 10 copies of the same file
+
+        Returns:
+            File: The copied file
+        """
+        params = {
+            "url": url,
+            "folder_id_dest": folder_id_dest
+        }
+        return self._request("POST", "file/xcopy", params, lambda response: model("File")(response["file"]))
+        
+    def file_hashcopy(self, hash: str, folder_id_dest: str, name: str) -> File:
+        """Copy a file to another folder by MD5 hash.
+
+        Args:
+            hash (str): The key that identifies the file to be copied.
+            folder_id_dest (str): The key that identifies the destination folder.
+            name (str): The new name of the file.
+            
+        Raises:
+            APIError: e.g. if the file is not found
+
+        Returns:
+            File: The copied file
+        """
+        params = {
+            "hash": hash,
+            "folder_id_dest": folder_id_dest,
+            "name": name
+        }
+        return self._request("POST", "file/hashcopy", params, lambda response: model("File")(response["file"]))
+        
+    def file_move(self, file_id: str, folder_id_dest: str) -> dict:
+        """Move a file to another folder (This operation also works with foreign folders).
+
+        Args:
+            file_id (str): The key that identifies the file to be moved. Several keys can be passed separated by comma.
+            folder_id_dest (str): The key that identifies the destination folder.
+
+        Returns:
+            dict: The response
+        """
+        params = {
+            "file_id": file_id,
+            "folder_id_dest": folder_id_dest
+        }
+        # Even if the file is not found, the API returns a 200 status code. WTF?
+        return self._request("POST", "file/move", params, check=False)
+    
+    def file_delete(self, file_id: str) -> dict:
+        """Delete a file.
+
+        Args:
+            file_id (str): The key that identifies the file to be deleted. Several keys can be passed separated by comma.
+
+        Returns:
+            dict: The response
+        """
+        params = {
+            "file_id": file_id
+        }
+        # Even if the file is not found, the API returns a 200 status code. WTF?
+        return self._request("POST", "file/delete", params, check=False)
+    
+    def file_change_mode(self, file_id: str, mode: int) -> File:
+        """Change a file mode.
+
+        Args:
+            file_id (str): The key that identifies the file to be changed.
+            mode (int): The new mode of the file. Possible values: 0 - Public, 1 - Premium only, 2 - Private, 3 - Hotlink.
+            
+        Raises:
+            APIError: e.g. if the file is not found
+            ValueError: e.g. if mode is invalid
+
+        Returns:
+            File: The changed file
+        """
+        if mode not in [0, 1, 2, 3]:
+            raise ValueError("mode must be one of 0, 1, 2, 3")
+        params = {
+            "file_id": file_id,
+            "mode": mode
+        }
+        return self._request("POST", "file/change_mode", params, lambda response: model("File")(response["file"]))
+        
+    def file_check_link(self, url: str) -> List[CheckLinkResult]:
+        """Check a file download link.
+
+        Args:
+            url (str): The file download link. Several links can be passed separated by comma.
+            
+        Raises:
+            APIError: e.g. to many links
+
+        Returns:
+            List[CheckLinkResult]: The check link result
+        """
+        params = {
+            "url": url
+        }
+        return self._request("GET", "file/check_link", params, lambda response: list(map(model("CheckLinkResult"), response)))
+        
+    def file_onetimelink_create(self, file_id: str, callback_url: str = None, notify: bool = None) -> OneTimeLink:
+        """Create a one time download link.
+
+        Args:
+            file_id (str): The key that identifies the file.
+            callback_url (str): Callback URL. A callback URL will be invoked when file will be downloaded.
+            notify (bool): Send notification letter when file will be downloaded
+            
+        Raises:
+            APIError: e.g. if the file is not found
+
+        Returns:
+            OneTimeLink: The one time download link
+        """
+        params = {
+            "file_id": file_id
+        }
+        if callback_url:
+            params["url"] = callback_url
+        if notify is not None:
+            params["notify"] = notify
+        return self._request("POST", "file/onetimelink_create", params, lambda response: model("OneTimeLink")(response["link"]))
+        
+    def file_onetimelink_info(self, link_id: str = None) -> List[OneTimeLink]:
+        """Returns a one time download link details.
+
+        Args:
+            link_id (str): The key that identifies the one-time link. You can also specify multiple link keys separated by comma. If the link_id is not passed, will return all one-time link details.
+
+        Raises:
+            APIError: e.g. if the link is not found
+
+        Returns:
+            List[OneTimeLink]: The one time download link details
+        """
+        params = {
+            "link_id": link_id
+        }
+        return self._request("GET", "file/onetimelink_info", params, lambda response: list(map(model("OneTimeLink"), response["links"])))
+        
+    def trashcan_content(self, page: int = 1, per_page: int = 500, sort_column: str = "name", sort_direction: str = "ASC") -> Tuple[List[File], Pager]:
+        """Returns a list of files in the trashcan.
+
+        Args:
+            page (int): Page number. Default is 1
+            per_page (int): TNumber of files per page. Default is 500.
+            sort_column (str): Sort column name. Possible values: 'name', 'created', 'size', 'delete_time'. Default is 'name'
+            sort_direction (str): Sort direction. Possible values: 'ASC', 'DESC'. Default is 'ASC'.
+
+        Raises:
+            ValueError: e.g. if sort_column or sort_direction is invalid
+
+        Returns:
+            Tuple[List[File], Pager]: The list of files in the trashcan and the pager
+        """
+        params = {}
+        if page:
+            params["page"] = page
+        if per_page:
+            params["per_page"] = per_page
+        if sort_column:
+            if sort_column not in ["name", "created", "size", "delete_time"]:
+                raise ValueError("sort_column must be one of 'name', 'created', 'size', 'delete_time'")
+            params["sort_column"] = sort_column
+        if sort_direction:
+            if sort_direction not in ["ASC", "DESC"]:
+                raise ValueError("sort_direction must be one of 'ASC', 'DESC'")
+            params["sort_direction"] = sort_direction
+        return self._request("GET", "trashcan/content", params, lambda response: (list(map(model("File"), response["files"])), model("Pager")(response["pager"])))
+        
+    def trashcan_restore(self, file_id: str = None) -> dict:
+        """Restore a file from the trashcan to root folder.
+
+        Args:
+            file_id (str): The key that identifies the file. If not specified will be restored all files.
+
+        Returns:
+            dict: The response
+        """
+        params = {
+        }
+        if file_id:
+            params["file_id"] = file_id
+        # Even if the file is not found, the API returns a 200 status code. WTF?
+        return self._request("POST", "trashcan/restore", params, check=False)
+    
+    def trashcan_empty(self, file_id: str = None) -> dict:
+        """Empty the trashcan.
+        
+        Args:
+            file_id (str): The key that identifies the file. If not specified will be deleted all files.
+
+        Returns:
+            dict: The response
+        """
+        params = {
+        }
+        if file_id:
+            params["file_id"] = file_id
+        # Even if the file is not found, the API returns a 200 status code. WTF?
+        return self._request("POST", "trashcan/empty", params, check=False)
+    
+    def remote_upload_create(self, url: str) -> List[RemoteUploadJob]:
+        """Create a remote upload job.
+
+        Args:
+            url (str): The URL of the file to be uploaded.
+            
+        Raises:
+            APIError: e.g. Exceeded the storage quota
+
+        Returns:
+            List[RemoteUploadJob]: The remote upload job
+        """
+        params = {
+            "url": url
+        }
+        return self._request("POST", "remote/create", params, lambda response: list(map(model("RemoteUploadJob"), response["jobs"])))
+        
+    def remote_upload_info(self, job_id: int = None) -> List[RemoteUploadJob]:
+        """Returns a remote upload job details.
+
+        Args:
+            job_id (int): The key that identifies the remote upload job. If the job_id is not passed, will return all remote upload job details.
+
+        Returns:
+            List[RemoteUploadJob]: The remote upload job details
+        """
+        params = {
+        }
+        if job_id:
+            params["job_id"] = job_id
+        return self._request("GET", "remote/info", params, lambda response: list(map(model("RemoteUploadJob"), response["jobs"])), check=False)
+    
+    def remote_job_delete(self, job_id: int) -> dict:
+        """Delete a remote upload job.
+
+        Args:
+            job_id (int): The key that identifies the remote upload job.
+
+        Returns:
+            dict: The response
+        """
+        params = {
+            "job_id": job_id
+        }
+        # Even if the job is not found, the API returns a 200 status code. WTF?
+        return self._request("POST", "remote/delete", params, check=False)
\ No newline at end of file
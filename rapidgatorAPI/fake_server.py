@@ -0,0 +1,686 @@
+import collections
+import dataclasses
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+# An endpoint handler gets the merged query/form parameters and returns (status, response) or (status, response, details)
+Handler = Callable[[dict], Tuple[int, Optional[dict]]]
+# A transfer handler gets (method, path below its prefix, request headers, request body) and returns (HTTP status, headers, body)
+TransferHandler = Callable[[str, str, dict, bytes], Tuple[int, dict, bytes]]
+
+# Transfer bodies are read and written in blocks of this size when the bandwidth is limited
+_BLOCK_SIZE = 64 << 10
+
+class _Table(dict):
+    """A dict that counts its changes, so indexes built from it know when to rebuild."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.version = 0
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _throttle(self, nbytes: int, start: float) -> None:
+        """Sleeps until nbytes could have been transferred since start at the fake's bandwidth."""
+        bandwidth = self.server.fake.bandwidth
+        if bandwidth:
+            time.sleep(max(0.0, start + nbytes / bandwidth - time.monotonic()))
+
+    def _read_body(self, limited: bool) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not limited or not self.server.fake.bandwidth:
+            return self.rfile.read(length) if length else b""
+        blocks, received, start = [], 0, time.monotonic()
+        while received < length:
+            blocks.append(self.rfile.read(min(_BLOCK_SIZE, length - received)))
+            received += len(blocks[-1])
+            self._throttle(received, start)
+        return b"".join(blocks)
+
+    def _dispatch(self) -> None:
+        url = urlsplit(self.path)
+        is_api = url.path.startswith("/api/v2/")
+        data = self._read_body(limited=not is_api)
+        fake = self.server.fake
+        if fake.latency:
+            time.sleep(fake.latency)
+        fake.connections.add(self.client_address)
+        fake.requests += 1
+        fake.calls[url.path[len("/api/v2/"):] if url.path.startswith("/api/v2/") else url.path] += 1
+        if not is_api:
+            prefix, _, rest = url.path.lstrip("/").partition("/")
+            handler = fake.transfer_routes.get(prefix)
+            if handler is None:
+                self._respond(404, {}, b"")
+            else:
+                self._respond(*handler(self.command, rest, dict(self.headers), data), limited=True)
+            return
+        params = dict(parse_qsl(url.query))
+        params.update(parse_qsl(data.decode()))
+        endpoint = url.path[len("/api/v2/"):]
+        handler = fake.routes.get(endpoint)
+        raw = fake.take_raw(endpoint)
+        if raw is not None:
+            self._respond(raw[0], {"Content-Type": "application/json"}, raw[1])
+            return
+        if handler is None:
+            status, response, *details = 404, None, "Error: Unknown endpoint"
+        elif endpoint != "user/login" and params.get("token") != fake.token:
+            status, response, *details = 401, None, "Error: Invalid token"
+        elif fake.take_throttle():
+            status, response, *details = 429, None, "Error: Too many requests"
+        elif (error := fake.take_error(endpoint)) is not None:
+            status, response, *details = error[0], None, error[1]
+        else:
+            status, response, *details = handler(params)
+            if fake.take_drop(endpoint):
+                self.close_connection = True
+                return
+        body = json.dumps({"response": response, "status": status, "details": details[0] if details else None}).encode()
+        self._respond(200, {"Content-Type": "application/json"}, body)
+
+    def _respond(self, status: int, headers: dict, body: bytes, limited: bool = False) -> None:
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        if not limited or not self.server.fake.bandwidth:
+            self.wfile.write(body)
+            return
+        start = time.monotonic()
+        for offset in range(0, len(body), _BLOCK_SIZE):
+            block = body[offset:offset + _BLOCK_SIZE]
+            self._throttle(offset + len(block), start)
+            self.wfile.write(block)
+
+    do_GET = _dispatch
+    do_POST = _dispatch
+    do_PUT = _dispatch
+    do_HEAD = _dispatch
+
+@dataclasses.dataclass
+class FakeRapidgatorServer():
+    """A minimal in-process stand-in for the Rapidgator API, listening on localhost.
+
+    Point a client at it with `RapidgatorAPI(..., base_url=server.base_url)`.
+
+    Args:
+        host (str): The interface to listen on. Default is '127.0.0.1'.
+        port (int): The port to listen on. Default is 0 (any free port).
+    """
+    host: str = "127.0.0.1"
+    port: int = 0
+
+    def __post_init__(self) -> None:
+        self.token = "fake-token"
+        self.logins = 0
+        self.requests = 0
+        # Requests per API endpoint, or per path for uploads and downloads
+        self.calls = collections.Counter()
+        self.connections = set()
+        self.root_folder_id = "root"
+        self.folders: Dict[str, dict] = _Table()
+        self.files: Dict[str, dict] = _Table()
+        self.uploads: Dict[str, dict] = {}
+        self.trash: Dict[str, dict] = {}
+        self.links: Dict[str, dict] = {}
+        self.remote_jobs: Dict[int, dict] = {}
+        self.max_remote_jobs = 10
+        self.remote_refresh_time = 5
+        # Number of upload part requests that are answered with HTTP 500 before parts are accepted again
+        self.fail_upload_parts = 0
+        self.download_delay = 0
+        self.max_check_links = 25
+        # Number of API requests that are answered with status 429 before requests are served again
+        self.throttle_requests = 0
+        self.bytes_served = 0
+        # Remaining quota of the account; downloads use traffic, new files use storage
+        self.traffic_left = 1 << 40
+        self.storage_left = 4 << 40
+        # Seconds every request waits before it is answered, like the round trip to the real API
+        self.latency = 0
+        # Bytes per second and connection for upload and download bodies, None means unlimited
+        self.bandwidth: Optional[float] = None
+        # Share of API requests that fail with status 500, drawn from a seeded generator
+        self.error_rate = 0.0
+        self._errors: Dict[str, List[Tuple[int, str]]] = collections.defaultdict(list)
+        # Bodies per endpoint that are sent as they are instead of an API response
+        self._raw: Dict[str, List[Tuple[int, bytes]]] = collections.defaultdict(list)
+        # Number of requests per endpoint that are applied but never answered
+        self._drops: Dict[str, int] = collections.Counter()
+        self._random = random.Random(0)
+        self._indexes: Dict[str, Tuple[int, dict]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.folders[self.root_folder_id] = self._folder_record(self.root_folder_id, "", None)
+        self.routes: Dict[str, Handler] = {
+            "user/login": self._user_login,
+            "user/info": self._user_info,
+            "folder/info": self._folder_info,
+            "folder/content": self._folder_content,
+            "folder/create": self._folder_create,
+            "file/info": self._file_info,
+            "file/upload": self._file_upload,
+            "file/upload_info": self._file_upload_info,
+            "file/download": self._file_download,
+            "file/check_link": self._file_check_link,
+            "file/rename": self._file_rename,
+            "file/move": self._file_move,
+            "file/copy": self._file_copy,
+            "file/delete": self._file_delete,
+            "file/hashcopy": self._file_hashcopy,
+            "file/xcopy": self._file_xcopy,
+            "file/change_mode": self._file_change_mode,
+            "file/onetimelink_create": self._file_onetimelink_create,
+            "file/onetimelink_info": self._file_onetimelink_info,
+            "folder/rename": self._folder_rename,
+            "folder/copy": self._folder_copy,
+            "folder/move": self._folder_move,
+            "folder/delete": self._folder_delete,
+            "trashcan/content": self._trashcan_content,
+            "trashcan/restore": self._trashcan_restore,
+            "trashcan/empty": self._trashcan_empty,
+            "remote/create": self._remote_create,
+            "remote/info": self._remote_info,
+            "remote/delete": self._remote_delete,
+        }
+        self.transfer_routes: Dict[str, TransferHandler] = {
+            "upload": self._receive_upload,
+            "download": self._send_download,
+        }
+        self._server = ThreadingHTTPServer((self.host, self.port), _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api/v2/"
+
+    def start(self) -> "FakeRapidgatorServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeRapidgatorServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def add_folder(self, name: str, parent_folder_id: Optional[str] = None) -> str:
+        """Creates a folder and returns its id."""
+        folder_id = f"d{next(self._ids)}"
+        self.folders[folder_id] = self._folder_record(folder_id, name, parent_folder_id or self.root_folder_id)
+        return folder_id
+
+    def add_file(self, name: str, content: bytes = b"", folder_id: Optional[str] = None) -> str:
+        """Stores a file and returns its id."""
+        file_id = f"f{next(self._ids)}"
+        self.files[file_id] = {
+            "file_id": file_id,
+            "name": name,
+            "size": len(content),
+            "hash": hashlib.md5(content).hexdigest(),
+            "nb_downloads": 0,
+            "mode": 0,
+            "mode_label": "Public",
+            "folder_id": folder_id or self.root_folder_id,
+            "url": f"https://rapidgator.net/file/{file_id}/{name}.html",
+            "created": 1700000000,
+            "content": content,
+        }
+        return file_id
+
+    def add_tree(self, depth: int, folders_per_folder: int, files_per_folder: int, file_size: int = 0, parent_folder_id: Optional[str] = None) -> str:
+        """Creates a synthetic folder tree for load tests and returns the id of its top folder.
+
+        Every folder, the top one included, holds files_per_folder files and, down to the given
+        depth, folders_per_folder subfolders. File contents are distinct, so hashes are too.
+
+        Args:
+            depth (int): Number of subfolder levels below the top folder.
+            folders_per_folder (int): Subfolders per folder.
+            files_per_folder (int): Files per folder.
+            file_size (int): Size of every file in bytes. Default is 0.
+            parent_folder_id (str): Where to create the top folder. Default is the root folder.
+        """
+        top = self.add_folder(f"tree{next(self._ids)}", parent_folder_id)
+        level = [top]
+        for remaining in range(depth, -1, -1):
+            children = []
+            for folder_id in level:
+                for i in range(files_per_folder):
+                    content = f"{folder_id}/{i}".encode()
+                    self.add_file(f"file{i}.bin", (content * (file_size // len(content) + 1))[:file_size] if file_size else b"", folder_id)
+                if remaining:
+                    children += [self.add_folder(f"folder{i}", folder_id) for i in range(folders_per_folder)]
+            level = children
+        return top
+
+    def inject_error(self, endpoint: str, status: int = 500, count: int = 1, details: str = "Error: Injected failure") -> None:
+        """Makes the next count requests to endpoint fail with status, after the token is checked."""
+        with self._lock:
+            self._errors[endpoint] += [(status, details)] * count
+
+    def inject_raw(self, endpoint: str, body: bytes, status: int = 200) -> None:
+        """Makes the next request to endpoint answer with an HTTP status and a body that is not an API response, like a proxy error page."""
+        with self._lock:
+            self._raw[endpoint].append((status, body))
+
+    def take_raw(self, endpoint: str) -> Optional[Tuple[int, bytes]]:
+        with self._lock:
+            return self._raw[endpoint].pop(0) if self._raw.get(endpoint) else None
+
+    def drop_connection(self, endpoint: str, count: int = 1) -> None:
+        """Makes the next count requests to endpoint take effect, then closes the connection without an answer."""
+        with self._lock:
+            self._drops[endpoint] += count
+
+    def take_drop(self, endpoint: str) -> bool:
+        with self._lock:
+            if self._drops[endpoint] > 0:
+                self._drops[endpoint] -= 1
+                return True
+            return False
+
+    def take_error(self, endpoint: str) -> Optional[Tuple[int, str]]:
+        with self._lock:
+            if self._errors.get(endpoint):
+                return self._errors[endpoint].pop(0)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 500, "Error: Random failure"
+            return None
+
+    def _index(self, name: str, table: _Table, key: str) -> Dict[str, List[dict]]:
+        """Returns the records of table grouped by key, rebuilt only after the table changed.
+
+        Handlers change indexed keys by replacing the record, never in place, so the table
+        version covers every change.
+        """
+        cached = self._indexes.get(name)
+        if cached is not None and cached[0] == table.version:
+            return cached[1]
+        version, index = table.version, {}
+        for record in list(table.values()):
+            index.setdefault(record[key], []).append(record)
+        self._indexes[name] = (version, index)
+        return index
+
+    def _subfolders(self, folder_id: str) -> List[dict]:
+        return self._index("parent_folder_id", self.folders, "parent_folder_id").get(folder_id, [])
+
+    def _folder_files(self, folder_id: str) -> List[dict]:
+        return self._index("folder_id", self.files, "folder_id").get(folder_id, [])
+
+    def _folder_record(self, folder_id: str, name: str, parent_folder_id: Optional[str]) -> dict:
+        return {
+            "folder_id": folder_id,
+            "mode": 0,
+            "mode_label": "Public",
+            "parent_folder_id": parent_folder_id,
+            "name": name,
+            "url": f"https://rapidgator.net/folder/{folder_id}/{name}.html",
+            "created": 1700000000,
+        }
+
+    def _file_response(self, file: dict) -> dict:
+        return {key: value for key, value in file.items() if key != "content"}
+
+    def _folder_response(self, folder_id: str) -> dict:
+        files = self._folder_files(folder_id)
+        return dict(self.folders[folder_id], nb_folders=len(self._subfolders(folder_id)), nb_files=len(files), size_files=sum(file["size"] for file in files))
+
+    def take_throttle(self) -> bool:
+        with self._lock:
+            if self.throttle_requests > 0:
+                self.throttle_requests -= 1
+                return True
+            return False
+
+    def expire_token(self) -> None:
+        """Invalidates the current token; the next login gets a new one."""
+        self.token = f"fake-token-{next(self._ids)}"
+
+    def _user_login(self, params: dict) -> Tuple[int, Optional[dict]]:
+        self.logins += 1
+        return 200, {"token": self.token}
+
+    def _user_info(self, params: dict) -> Tuple[int, Optional[dict]]:
+        return 200, {"user": {
+            "email": "user@example.com",
+            "is_premium": True,
+            "state": 1,
+            "state_label": "Active",
+            "traffic": {"total": "1099511627776", "left": self.traffic_left},
+            "storage": {"total": "4398046511104", "left": self.storage_left},
+            "upload": {"max_file_size": 5368709120, "nb_pipes": 4},
+            "remote_upload": {"max_nb_jobs": self.max_remote_jobs, "refresh_time": self.remote_refresh_time},
+        }}
+
+    def _folder_info(self, params: dict) -> Tuple[int, Optional[dict]]:
+        folder_id = params.get("folder_id", self.root_folder_id)
+        if folder_id not in self.folders:
+            return 404, None
+        folder = self._folder_response(folder_id)
+        folder["folders"] = [self._folder_response(child["folder_id"]) for child in self._subfolders(folder_id)]
+        return 200, {"folder": folder}
+
+    def _folder_create(self, params: dict) -> Tuple[int, Optional[dict]]:
+        parent_folder_id = params.get("folder_id", self.root_folder_id)
+        if parent_folder_id not in self.folders:
+            return 404, None, "Error: Folder not found"
+        return 200, {"folder": self._folder_response(self.add_folder(params.get("name", ""), parent_folder_id))}
+
+    def _folder_content(self, params: dict) -> Tuple[int, Optional[dict]]:
+        folder_id = params.get("folder_id", self.root_folder_id)
+        if folder_id not in self.folders:
+            return 404, None
+        folder = self._folder_response(folder_id)
+        folder["folders"] = [self._folder_response(child["folder_id"]) for child in self._subfolders(folder_id)]
+        folder["files"], pager = self._paged_files(self._folder_files(folder_id), params)
+        return 200, {"folder": folder, "pager": pager}
+
+    def _paged_files(self, files, params: dict) -> Tuple[list, dict]:
+        page, per_page = int(params.get("page", 1)), int(params.get("per_page", 500))
+        files = sorted(files, key=lambda file: file.get(params.get("sort_column", "name"), 0), reverse=params.get("sort_direction") == "DESC")
+        return [self._file_response(file) for file in files[(page - 1) * per_page:page * per_page]], {"current": page, "total": max(1, -(-len(files) // per_page))}
+
+    def _trashcan_content(self, params: dict) -> Tuple[int, Optional[dict]]:
+        files, pager = self._paged_files(self.trash.values(), params)
+        return 200, {"files": files, "pager": pager}
+
+    def _trashcan_restore(self, params: dict) -> Tuple[int, Optional[dict]]:
+        ids = params.get("file_id") or ",".join(self.trash)
+        return self._apply(ids, self.trash, lambda file_id: self.files.update({file_id: self.trash.pop(file_id)})) if ids else (200, {"result": {"success": 0, "fail": 0, "errors": []}})
+
+    def _trashcan_empty(self, params: dict) -> Tuple[int, Optional[dict]]:
+        ids = params.get("file_id") or ",".join(self.trash)
+        return self._apply(ids, self.trash, self.trash.pop) if ids else (200, {"result": {"success": 0, "fail": 0, "errors": []}})
+
+    def _file_check_link(self, params: dict) -> Tuple[int, Optional[dict]]:
+        urls = params.get("url", "").split(",")
+        if len(urls) > self.max_check_links:
+            return 400, None, "Error: Too many links"
+        by_url = self._index("url", self.files, "url")
+        results = []
+        for url in urls:
+            file = by_url.get(url, [None])[0]
+            if file is None:
+                results.append({"url": url, "filename": "", "status": "NO_ACCESS"})
+            else:
+                results.append({"url": url, "filename": file["name"], "status": "ACCESS", "size": file["size"]})
+        return 200, results
+
+    def _file_rename(self, params: dict) -> Tuple[int, Optional[dict]]:
+        file = self.files.get(params.get("file_id"))
+        if file is None:
+            return 404, None
+        file["name"] = params["name"]
+        return 200, {"file": self._file_response(file)}
+
+    def _file_change_mode(self, params: dict) -> Tuple[int, Optional[dict]]:
+        file = self.files.get(params.get("file_id"))
+        if file is None:
+            return 404, None
+        mode = int(params.get("mode", 0))
+        file.update(mode=mode, mode_label=("Public", "Premium only", "Private", "Hotlink")[mode])
+        return 200, {"file": self._file_response(file)}
+
+    def _folder_rename(self, params: dict) -> Tuple[int, Optional[dict]]:
+        folder = self.folders.get(params.get("folder_id"))
+        if folder is None:
+            return 404, None
+        folder["name"] = params["name"]
+        return 200, {"folder": self._folder_response(folder["folder_id"])}
+
+    def _file_onetimelink_create(self, params: dict) -> Tuple[int, Optional[dict]]:
+        file = self.files.get(params.get("file_id"))
+        if file is None:
+            return 404, None
+        link_id = f"l{next(self._ids)}"
+        self.links[link_id] = {
+            "link_id": link_id, "file": self._file_response(file), "url": f"https://rapidgator.net/file/{link_id}",
+            "state": "0", "state_label": "Not downloaded", "callback_url": params.get("url"),
+            "notify": params.get("notify") in ("1", "True", "true"), "created": 1700000000, "downloaded": False,
+        }
+        return 200, {"link": self.links[link_id]}
+
+    def _file_onetimelink_info(self, params: dict) -> Tuple[int, Optional[dict]]:
+        if not params.get("link_id"):
+            return 200, {"links": list(self.links.values())}
+        links = [self.links[link_id] for link_id in params["link_id"].split(",") if link_id in self.links]
+        if not links:
+            return 404, None
+        return 200, {"links": links}
+
+    def _apply(self, ids: str, items: Dict[str, dict], action: Callable[[str], None], dest_required: Optional[str] = None) -> Tuple[int, Optional[dict]]:
+        ids = ids.split(",")
+        if dest_required is not None and dest_required not in self.folders:
+            return 200, {"result": {"success": 0, "fail": len(ids), "errors": ["Destination folder not found"]}}
+        found = [item_id for item_id in ids if item_id in items]
+        errors = [f"{item_id} not found" for item_id in ids if item_id not in items]
+        for item_id in found:
+            action(item_id)
+        return 200, {"result": {"success": len(found), "fail": len(errors), "errors": errors}}
+
+    def _file_move(self, params: dict) -> Tuple[int, Optional[dict]]:
+        dest = params.get("folder_id_dest")
+        return self._apply(params.get("file_id", ""), self.files, lambda file_id: self.files.update({file_id: dict(self.files[file_id], folder_id=dest)}), dest)
+
+    def _file_copy(self, params: dict) -> Tuple[int, Optional[dict]]:
+        dest = params.get("folder_id_dest")
+        return self._apply(params.get("file_id", ""), self.files, lambda file_id: self.add_file(self.files[file_id]["name"], self.files[file_id]["content"], dest), dest)
+
+    def _file_delete(self, params: dict) -> Tuple[int, Optional[dict]]:
+        return self._apply(params.get("file_id", ""), self.files, lambda file_id: self.trash.update({file_id: self.files.pop(file_id)}))
+
+    def _copy_folder(self, folder_id: str, dest: str) -> None:
+        copy = self.add_folder(self.folders[folder_id]["name"], dest)
+        for file in list(self._folder_files(folder_id)):
+            self.add_file(file["name"], file["content"], copy)
+        for child in list(self._subfolders(folder_id)):
+            self._copy_folder(child["folder_id"], copy)
+
+    def _delete_folder(self, folder_id: str) -> None:
+        for child in list(self._subfolders(folder_id)):
+            self._delete_folder(child["folder_id"])
+        for file in list(self._folder_files(folder_id)):
+            self.trash[file["file_id"]] = self.files.pop(file["file_id"])
+        del self.folders[folder_id]
+
+    def _folder_copy(self, params: dict) -> Tuple[int, Optional[dict]]:
+        dest = params.get("folder_id_dest")
+        return self._apply(params.get("folder_id", ""), self.folders, lambda folder_id: self._copy_folder(folder_id, dest), dest)
+
+    def _folder_move(self, params: dict) -> Tuple[int, Optional[dict]]:
+        dest = params.get("folder_id_dest")
+        return self._apply(params.get("folder_id", ""), self.folders, lambda folder_id: self.folders.update({folder_id: dict(self.folders[folder_id], parent_folder_id=dest)}), dest)
+
+    def _folder_delete(self, params: dict) -> Tuple[int, Optional[dict]]:
+        return self._apply(params.get("folder_id", ""), self.folders, self._delete_folder)
+
+    def _file_info(self, params: dict) -> Tuple[int, Optional[dict]]:
+        file = self.files.get(params.get("file_id"))
+        if file is None:
+            return 404, None
+        return 200, {"file": self._file_response(file)}
+
+    def _file_hashcopy(self, params: dict) -> Tuple[int, Optional[dict]]:
+        known = self._find_by_hash(params.get("hash", ""))
+        folder_id = params.get("folder_id_dest")
+        if known is None or folder_id not in self.folders:
+            return 404, None, "Error: File not found"
+        file_id = self.add_file(params.get("name") or known["name"], known["content"], folder_id)
+        return 200, {"file": self._file_response(self.files[file_id])}
+
+    def _file_xcopy(self, params: dict) -> Tuple[int, Optional[dict]]:
+        known = self._index("url", self.files, "url").get(params.get("url", ""), [None])[0]
+        folder_id = params.get("folder_id_dest")
+        if known is None or folder_id not in self.folders:
+            return 404, None, "Error: File not found"
+        file_id = self.add_file(known["name"], known["content"], folder_id)
+        return 200, {"file": self._file_response(self.files[file_id])}
+
+    def _find_by_hash(self, hash: str) -> Optional[dict]:
+        return self._index("hash", self.files, "hash").get(hash, [None])[0]
+
+    def _upload_response(self, upload: dict) -> dict:
+        response = {key: upload[key] for key in ("upload_id", "state", "state_label")}
+        if upload["file_id"]:
+            response["file"] = self._file_response(self.files[upload["file_id"]])
+        if upload["state"] == 0:
+            response["url"] = f"{self.base_url[:-len('api/v2/')]}upload/{upload['upload_id']}"
+        return response
+
+    def _file_upload(self, params: dict) -> Tuple[int, Optional[dict]]:
+        folder_id = params.get("folder_id", self.root_folder_id)
+        if folder_id not in self.folders:
+            return 404, None
+        upload = {
+            "upload_id": f"u{next(self._ids)}",
+            "state": 0,
+            "state_label": "Uploading",
+            "file_id": None,
+            "name": params["name"],
+            "hash": params["hash"],
+            "size": int(params["size"]),
+            "folder_id": folder_id,
+        }
+        known = self._find_by_hash(params["hash"])
+        if known is not None and known["size"] == upload["size"]:
+            upload.update(state=2, state_label="Done", file_id=self.add_file(upload["name"], known["content"], folder_id))
+            self.storage_left -= upload["size"]
+        self.uploads[upload["upload_id"]] = upload
+        return 200, {"upload": self._upload_response(upload)}
+
+    def _file_upload_info(self, params: dict) -> Tuple[int, Optional[dict]]:
+        upload = self.uploads.get(params.get("upload_id"))
+        if upload is None:
+            return 404, None
+        return 200, {"upload": self._upload_response(upload)}
+
+    def _remote_create(self, params: dict) -> Tuple[int, Optional[dict]]:
+        with self._lock:
+            if sum(1 for job in self.remote_jobs.values() if job["state"] < 2) >= self.max_remote_jobs:
+                return 400, None, "Error: Too many remote upload jobs"
+            job_id = next(self._ids)
+            url = params.get("url", "")
+            self.remote_jobs[job_id] = {
+                "job_id": job_id, "type": 1, "type_label": "Remote upload", "folder_id": self.root_folder_id, "url": url,
+                "name": url.rstrip("/").rpartition("/")[2], "size": 0, "state": 0, "state_label": "Waiting", "file": None,
+                "dl_size": 0, "speed": 0, "created": 1700000000,
+            }
+            return 200, {"jobs": [dict(self.remote_jobs[job_id])]}
+
+    def _remote_info(self, params: dict) -> Tuple[int, Optional[dict]]:
+        """Every poll moves each job one step on: waiting, downloading, then done (or failed if 'fail' is in its URL)."""
+        with self._lock:
+            for job in self.remote_jobs.values():
+                if job["state"] == 0:
+                    job.update(state=1, state_label="Downloading")
+                elif job["state"] == 1 and "fail" in job["url"]:
+                    job.update(state=3, state_label="Failed", error="Error: Download failed")
+                elif job["state"] == 1:
+                    file_id = self.add_file(job["name"], job["url"].encode(), job["folder_id"])
+                    job.update(state=2, state_label="Done", size=self.files[file_id]["size"], dl_size=self.files[file_id]["size"], file=self._file_response(self.files[file_id]))
+            jobs = list(self.remote_jobs.values())
+            if "job_id" in params:
+                jobs = [job for job in jobs if str(job["job_id"]) == params["job_id"]]
+                if not jobs:
+                    return 404, None
+            return 200, {"jobs": [dict(job) for job in jobs]}
+
+    def _remote_delete(self, params: dict) -> Tuple[int, Optional[dict]]:
+        with self._lock:
+            self.remote_jobs.pop(int(params.get("job_id", 0)), None)
+        return 200, {"result": True}
+
+    def _receive_upload(self, method: str, upload_id: str, headers: dict, data: bytes) -> Tuple[int, dict, bytes]:
+        upload = self.uploads.get(upload_id)
+        if upload is None or method != "POST":
+            return 404, {}, b""
+        content_type = headers.get("Content-Type", "")
+        if content_type.startswith("multipart/form-data"):
+            boundary = content_type.split("boundary=", 1)[1].encode()
+            part = data.split(b"--" + boundary)[1]
+            data = part.split(b"\r\n\r\n", 1)[1][:-len(b"\r\n")]
+        content_range = headers.get("Content-Range")
+        if content_range:
+            if self.fail_upload_parts > 0:
+                self.fail_upload_parts -= 1
+                return 500, {}, b""
+            start = int(content_range.split()[1].split("-")[0])
+            with self._lock:
+                parts = upload.setdefault("parts", {})
+                parts[start] = data
+                if sum(len(part) for part in parts.values()) < upload["size"]:
+                    return 200, {"Content-Type": "application/json"}, b"{}"
+                data = b"".join(parts[offset] for offset in sorted(parts))
+        if len(data) != upload["size"] or hashlib.md5(data).hexdigest() != upload["hash"]:
+            upload.update(state=3, state_label="Fail")
+        else:
+            upload.update(state=2, state_label="Done", file_id=self.add_file(upload["name"], data, upload["folder_id"]))
+            self.storage_left -= len(data)
+        return 200, {"Content-Type": "application/json"}, b"{}"
+
+    def _file_download(self, params: dict) -> Tuple[int, Optional[dict]]:
+        if params.get("file_id") not in self.files:
+            return 404, None
+        return 200, {"file": {"download_url": f"{self.base_url[:-len('api/v2/')]}download/{params['file_id']}", "delay": self.download_delay}}
+
+    def _send_download(self, method: str, file_id: str, headers: dict, data: bytes) -> Tuple[int, dict, bytes]:
+        file = self.files.get(file_id)
+        if file is None:
+            return 404, {}, b""
+        content = file["content"]
+        range_header = headers.get("Range")
+        if range_header is None:
+            status, body = 200, content
+            response_headers = {"Accept-Ranges": "bytes"}
+        else:
+            start, end = range_header.split("=", 1)[1].split("-")
+            start, end = int(start), int(end) if end else len(content) - 1
+            status, body = 206, content[start:end + 1]
+            response_headers = {"Accept-Ranges": "bytes", "Content-Range": f"bytes {start}-{start + len(body) - 1}/{len(content)}"}
+        with self._lock:
+            self.bytes_served += len(body)
+            self.traffic_left -= len(body)
+        response_headers["Content-Type"] = "application/octet-stream"
+        return status, response_headers, body
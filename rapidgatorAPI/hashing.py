@@ -0,0 +1,130 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Optional
+
+# Files at least this large are hashed through a memory map instead of read into a buffer
+MMAP_THRESHOLD = 64 << 20
+
+def file_md5(path: str, buffer_size: int = 1 << 20) -> str:
+    """Computes the MD5 hash of a file without reading it into memory at once.
+
+    Large files are memory-mapped, smaller ones are read into a single reused buffer, so no
+    memory is allocated per block either way.
+
+    Args:
+        path (str): The file path
+        buffer_size (int): Number of bytes hashed per step. Default is 1 MiB.
+
+    Returns:
+        str: The hex digest
+    """
+    md5 = hashlib.md5()
+    with open(path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                for offset in range(0, size, buffer_size):
+                    md5.update(view[offset:offset + buffer_size])
+            return md5.hexdigest()
+        buffer = bytearray(buffer_size)
+        with memoryview(buffer) as view:
+            while True:
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                md5.update(view[:n])
+    return md5.hexdigest()
+
+def hash_files(paths: Iterable[str], workers: Optional[int] = None, cache: Optional["HashCache"] = None) -> Dict[str, str]:
+    """Computes the MD5 hashes of many files in parallel.
+
+    Files are hashed in a process pool, so hashing uses all CPU cores. Files whose hash is in
+    the cache are not read; new hashes are added to the cache.
+
+    Args:
+        paths (Iterable[str]): The file paths.
+        workers (int): Number of processes. Default is the number of CPUs.
+        cache (HashCache): Hashes to reuse and to extend.
+
+    Returns:
+        Dict[str, str]: The hex digest by path
+    """
+    paths = list(dict.fromkeys(paths))
+    hashes, stats = {}, {}
+    for path in paths:
+        stats[path] = os.stat(path)
+        hash = cache.lookup(stats[path]) if cache is not None else None
+        if hash is not None:
+            hashes[path] = hash
+    missing = [path for path in paths if path not in hashes]
+    workers = min(workers or os.cpu_count() or 1, len(missing))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            hashes.update(zip(missing, executor.map(file_md5, missing, chunksize=max(1, len(missing) // (workers * 4)))))
+    else:
+        hashes.update((path, file_md5(path)) for path in missing)
+    if cache is not None:
+        cache.store_many((stats[path], hashes[path]) for path in missing)
+    return {path: hashes[path] for path in paths}
+
+class HashCache():
+    """Remembers the MD5 hashes of local files so unchanged files are never read again.
+
+    Hashes are stored by device and inode together with size and modification time, so a
+    stored hash survives renames and moves and is dropped as soon as the content may have
+    changed. The cache is safe to use from several threads.
+
+    Args:
+        path (str): The SQLite database file. Default is ':memory:' (not persisted).
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS file_hashes (device INTEGER, inode INTEGER, size INTEGER, mtime_ns INTEGER, hash TEXT, PRIMARY KEY (device, inode))")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "HashCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def lookup(self, stat: os.stat_result) -> Optional[str]:
+        """Returns the stored hash of the file with this stat result, or None if it is unknown or outdated."""
+        with self._lock:
+            row = self.db.execute("SELECT hash FROM file_hashes WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ?", (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)).fetchone()
+            if row:
+                self.hits += 1
+                return row[0]
+            self.misses += 1
+            return None
+
+    def store_many(self, entries: Iterable) -> None:
+        """Stores (stat result, hash) pairs."""
+        with self._lock, self.db:
+            self.db.executemany("INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?)", [(stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns, hash) for stat, hash in entries])
+
+    def md5(self, path: str) -> str:
+        """Returns the MD5 hash of a file, computing it only if the file changed since it was cached.
+
+        Args:
+            path (str): The file path
+
+        Returns:
+            str: The hex digest
+        """
+        stat = os.stat(path)
+        hash = self.lookup(stat)
+        if hash is None:
+            hash = file_md5(path)
+            self.store_many([(stat, hash)])
+        return hash
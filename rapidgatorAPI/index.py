@@ -0,0 +1,208 @@
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Optional, Tuple
+
+from classes.File import File
+from classes.Folder import Folder
+
+from .pagination import iter_pages
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    folder_id TEXT PRIMARY KEY,
+    parent_folder_id TEXT,
+    name TEXT,
+    path TEXT,
+    mode INTEGER,
+    mode_label TEXT,
+    url TEXT,
+    nb_folders INTEGER,
+    nb_files INTEGER,
+    size_files INTEGER,
+    created INTEGER,
+    listed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS folders_parent ON folders (parent_folder_id);
+CREATE INDEX IF NOT EXISTS folders_path ON folders (path);
+CREATE TABLE IF NOT EXISTS files (
+    file_id TEXT PRIMARY KEY,
+    folder_id TEXT,
+    name TEXT,
+    size INTEGER,
+    hash TEXT,
+    nb_downloads INTEGER,
+    mode INTEGER,
+    mode_label TEXT,
+    url TEXT,
+    created INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_folder ON files (folder_id);
+CREATE INDEX IF NOT EXISTS files_name ON files (name);
+CREATE INDEX IF NOT EXISTS files_hash ON files (hash);
+"""
+
+_FOLDER_COLUMNS = ("folder_id", "mode", "mode_label", "parent_folder_id", "name", "url", "nb_folders", "nb_files", "created", "size_files")
+_FILE_COLUMNS = ("name", "size", "hash", "nb_downloads", "file_id", "mode", "mode_label", "folder_id", "url", "created")
+
+class FolderIndex():
+    """A local SQLite mirror of the account's folder tree for fast lookups.
+
+    `sync` requests folder_info for every folder and only lists the files of folders whose
+    nb_files, nb_folders or size_files changed since the last sync, so refreshing an unchanged
+    tree costs one small request per folder instead of all file pages.
+
+    Args:
+        path (str): The SQLite database file. Use ':memory:' for an index that is not persisted.
+        api (RapidgatorAPI): The client used by sync.
+    """
+
+    def __init__(self, path: str, api=None) -> None:
+        self.api = api
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "FolderIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def sync(self, folder_id: str = None, workers: int = 8, per_page: int = 500) -> int:
+        """Brings the index of a folder tree up to date.
+
+        Paths always start at the account's root folder, also when only a sub folder is synced.
+
+        Args:
+            folder_id (str): The key that identifies the top folder. If the folder_id is not passed, the whole account is synced.
+            workers (int): Maximum number of requests in flight. Default is 8.
+            per_page (int): Number of files per page when a folder is listed. Default is 500.
+
+        Raises:
+            APIError: e.g. if the top folder is not found
+
+        Returns:
+            int: The number of folders whose files were listed again
+        """
+        def fetch(folder_id: str, changed: bool, known: Optional[Folder]) -> Tuple[Folder, Optional[List[File]]]:
+            if not changed:
+                return known or self.api.folder_info(folder_id), None
+            folder, files = None, []
+            for page in iter_pages(lambda number: self.api.folder_content(folder_id, number, per_page), prefetch=False):
+                folder = folder or page
+                files.extend(page.files or [])
+            return folder, files
+
+        top = self.api.folder_info(folder_id)
+        row = self.db.execute("SELECT path FROM folders WHERE folder_id = ?", (top.folder_id,)).fetchone()
+        paths = {top.folder_id: row[0] if row else self._full_path(top)}
+        listed = 0
+        # The top folder's info is already at hand, only its listing may still be needed
+        pending = [(top.folder_id, self._changed(top), top)]
+        running = set()
+        with self.db, ThreadPoolExecutor(max_workers=workers) as executor:
+            while pending or running:
+                while pending and len(running) < workers:
+                    running.add(executor.submit(fetch, *pending.pop()))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder, files = future.result()
+                    path = paths.pop(folder.folder_id)
+                    self._store_folder(folder, path, files is not None)
+                    if files is not None:
+                        listed += 1
+                        self.db.execute("DELETE FROM files WHERE folder_id = ?", (folder.folder_id,))
+                        self.db.executemany(f"INSERT OR REPLACE INTO files ({', '.join(_FILE_COLUMNS)}) VALUES ({', '.join('?' * len(_FILE_COLUMNS))})", [tuple(getattr(file, column) for column in _FILE_COLUMNS) for file in files])
+                    subfolders = folder.folders or []
+                    self._remove_missing(folder.folder_id, [subfolder.folder_id for subfolder in subfolders])
+                    for subfolder in subfolders:
+                        paths[subfolder.folder_id] = path.rstrip("/") + "/" + subfolder.name
+                        pending.append((subfolder.folder_id, self._changed(subfolder), None))
+        return listed
+
+    def _full_path(self, folder: Folder) -> str:
+        """Returns the path of a folder from the root, asking for the parents that aren't indexed yet."""
+        names = []
+        while folder.parent_folder_id:
+            names.append(folder.name)
+            row = self.db.execute("SELECT path FROM folders WHERE folder_id = ?", (folder.parent_folder_id,)).fetchone()
+            if row:
+                return row[0].rstrip("/") + "/" + "/".join(reversed(names))
+            folder = self.api.folder_info(folder.parent_folder_id)
+        return "/" + "/".join(reversed(names))
+
+    def _changed(self, folder: Folder) -> bool:
+        row = self.db.execute("SELECT nb_folders, nb_files, size_files, listed FROM folders WHERE folder_id = ?", (folder.folder_id,)).fetchone()
+        return row is None or not row[3] or row[:3] != (folder.nb_folders, folder.nb_files, folder.size_files)
+
+    def _store_folder(self, folder: Folder, path: str, listed: bool) -> None:
+        values = tuple(getattr(folder, column) for column in _FOLDER_COLUMNS)
+        row = self.db.execute("SELECT listed FROM folders WHERE folder_id = ?", (folder.folder_id,)).fetchone()
+        listed = listed or bool(row and row[0])
+        self.db.execute(f"INSERT OR REPLACE INTO folders ({', '.join(_FOLDER_COLUMNS)}, path, listed) VALUES ({', '.join('?' * (len(_FOLDER_COLUMNS) + 2))})", values + (path, int(listed)))
+
+    def _remove_missing(self, parent_folder_id: str, folder_ids: List[str]) -> None:
+        stored = [row[0] for row in self.db.execute("SELECT folder_id FROM folders WHERE parent_folder_id = ?", (parent_folder_id,))]
+        for folder_id in set(stored) - set(folder_ids):
+            subtree = [row[0] for row in self.db.execute(
+                "WITH RECURSIVE tree(id) AS (SELECT ? UNION ALL SELECT folder_id FROM folders JOIN tree ON parent_folder_id = tree.id) SELECT id FROM tree", (folder_id,))]
+            self.db.executemany("DELETE FROM files WHERE folder_id = ?", [(id,) for id in subtree])
+            self.db.executemany("DELETE FROM folders WHERE folder_id = ?", [(id,) for id in subtree])
+
+    def _files(self, where: str, params: tuple) -> List[File]:
+        rows = self.db.execute(f"SELECT {', '.join(_FILE_COLUMNS)} FROM files WHERE {where}", params)
+        return [File(*row) for row in rows]
+
+    def _folders(self, where: str, params: tuple) -> List[Folder]:
+        rows = self.db.execute(f"SELECT {', '.join(_FOLDER_COLUMNS)} FROM folders WHERE {where}", params)
+        return [Folder(*row) for row in rows]
+
+    def file(self, file_id: str) -> Optional[File]:
+        """Returns the file with the given key, or None if it is not indexed."""
+        files = self._files("file_id = ?", (file_id,))
+        return files[0] if files else None
+
+    def files_by_name(self, name: str) -> List[File]:
+        """Returns all files with the given name."""
+        return self._files("name = ?", (name,))
+
+    def files_by_hash(self, hash: str) -> List[File]:
+        """Returns all files with the given MD5 hash."""
+        return self._files("hash = ?", (hash,))
+
+    def files_in_folder(self, folder_id: str) -> List[File]:
+        """Returns the files directly inside a folder."""
+        return self._files("folder_id = ?", (folder_id,))
+
+    def folder(self, folder_id: str) -> Optional[Folder]:
+        """Returns the folder with the given key, or None if it is not indexed."""
+        folders = self._folders("folder_id = ?", (folder_id,))
+        return folders[0] if folders else None
+
+    def folder_by_path(self, path: str) -> Optional[Folder]:
+        """Returns the folder at a path like '/photos/2023', or None if it is not indexed."""
+        folders = self._folders("path = ?", ("/" + path.strip("/"),))
+        return folders[0] if folders else None
+
+    def path(self, folder_id: str) -> Optional[str]:
+        """Returns the path of a folder, or None if it is not indexed."""
+        row = self.db.execute("SELECT path FROM folders WHERE folder_id = ?", (folder_id,)).fetchone()
+        return row[0] if row else None
+
+    def folder_size(self, folder_id: str, recursive: bool = True) -> int:
+        """Returns the total size of the files in a folder.
+
+        Args:
+            folder_id (str): The key that identifies the folder.
+            recursive (bool): Include the files of all sub folders. Default is true.
+
+        Returns:
+            int: The size in bytes
+        """
+        if not recursive:
+            return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM files WHERE folder_id = ?", (folder_id,)).fetchone()[0]
+        return self.db.execute(
+            "WITH RECURSIVE tree(id) AS (SELECT ? UNION ALL SELECT folder_id FROM folders JOIN tree ON parent_folder_id = tree.id) "
+            "SELECT COALESCE(SUM(size), 0) FROM files WHERE folder_id IN tree", (folder_id,)).fetchone()[0]
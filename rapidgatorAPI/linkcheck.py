@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List
+
+from classes.APIError import APIError
+from classes.CheckLinkResult import CheckLinkResult
+
+# The details of the 400 response for a batch over the link limit
+_TOO_MANY_LINKS = "Error: Too many links"
+
+def _too_many_links(error: Exception) -> bool:
+    # Rate limits also say "too many", but they are the scheduler's to retry
+    return isinstance(error, APIError) and error.status == 400 and (error.details or "").strip() == _TOO_MANY_LINKS
+
+class _Split(Exception):
+    """Raised by a worker when its batch has to be checked as two halves."""
+
+    def __init__(self, batch: List[str]) -> None:
+        super().__init__()
+        self.batch = batch
+
+def check_links(api, urls: Iterable[str], batch_size: int = 50, workers: int = 4) -> Iterator[CheckLinkResult]:
+    """Checks many download links with as few file_check_link requests as possible.
+
+    Duplicate URLs are checked once. URLs are packed comma-separated into batches of batch_size
+    that are checked concurrently. If the API rejects a batch as too many links, the batch is
+    split in half and the batch size is lowered for all batches that follow.
+
+    Args:
+        api (RapidgatorAPI): The client used for the file_check_link requests.
+        urls (Iterable[str]): The download links.
+        batch_size (int): Number of links per request to start with. Default is 50.
+        workers (int): Maximum number of requests in flight. Default is 4.
+
+    Raises:
+        APIError: e.g. if a single link is rejected
+
+    Returns:
+        Iterator[CheckLinkResult]: The results in the order the batches complete
+    """
+    urls = list(dict.fromkeys(urls))
+    lock = threading.Lock()
+    size = max(1, batch_size)
+
+    def check(batch: List[str]) -> List[CheckLinkResult]:
+        nonlocal size
+        try:
+            return api.file_check_link(",".join(batch))
+        except Exception as e:
+            if len(batch) == 1 or not _too_many_links(e):
+                raise
+            with lock:
+                size = min(size, len(batch) // 2)
+            raise _Split(batch)
+
+    pending = []
+    position = 0
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while position < len(urls) or pending or running:
+            while len(running) < workers and (pending or position < len(urls)):
+                if pending:
+                    batch = pending.pop()
+                else:
+                    batch = urls[position:position + size]
+                    position += len(batch)
+                running[executor.submit(check, batch)] = batch
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                try:
+                    results = future.result()
+                except _Split as split:
+                    middle = len(split.batch) // 2
+                    pending.extend([split.batch[middle:], split.batch[:middle]])
+                    continue
+                yield from results
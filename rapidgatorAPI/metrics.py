@@ -0,0 +1,248 @@
+import bisect
+import collections
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from classes.RequestEvent import RequestEvent
+
+logger = logging.getLogger("rapidgatorAPI")
+
+# Upper bounds of the latency histogram buckets in seconds (the Prometheus client defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 7.5, 10)
+# Upper bounds of the response size histogram buckets in bytes, 256 B to 64 MiB
+SIZE_BUCKETS = tuple(256 << (2 * i) for i in range(10))
+# Parameters that are never passed to hooks
+SECRET_PARAMS = frozenset(("token", "password", "code"))
+
+class RequestHook():
+    """Receives a callback before and after every API request and file transfer of a client.
+
+    Pass hooks to a client with `RapidgatorAPI(..., hooks=[hook])`. `before` gets the request
+    parameters without the token and credentials, `after` gets a RequestEvent, also for
+    requests that failed and for responses served from the cache. Exceptions raised by a hook
+    are logged and don't affect the request.
+    """
+
+    def before(self, method: str, endpoint: str, params: dict) -> None:
+        pass
+
+    def after(self, event: RequestEvent) -> None:
+        pass
+
+def run_before(hooks: Iterable[RequestHook], method: str, endpoint: str, params: dict) -> None:
+    params = {key: value for key, value in params.items() if key not in SECRET_PARAMS and value is not None}
+    for hook in hooks:
+        try:
+            hook.before(method, endpoint, params)
+        except Exception:
+            logger.exception("Request hook %r failed", hook)
+
+def run_after(hooks: Iterable[RequestHook], event: RequestEvent) -> None:
+    for hook in hooks:
+        try:
+            hook.after(event)
+        except Exception:
+            logger.exception("Request hook %r failed", hook)
+
+class Histogram():
+    """Counts observations in fixed buckets, like a Prometheus histogram.
+
+    Args:
+        bounds (Sequence[float]): Upper bounds of the buckets in ascending order; a last bucket without bound is added.
+    """
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimates the q-quantile by linear interpolation inside its bucket (as histogram_quantile does).
+
+        Returns None without observations and the largest bound if the quantile falls into the last bucket.
+        """
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[index - 1] if index else 0
+                return lower + (self.bounds[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.bounds[-1]
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Returns (upper bound, observations up to it) pairs, ending with (inf, count)."""
+        total, pairs = 0, []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+class EndpointMetrics():
+    """Counters and histograms of one endpoint, see Metrics."""
+
+    def __init__(self, latency_buckets: Sequence[float], size_buckets: Sequence[float]) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.statuses = collections.Counter()
+        self.latency = Histogram(latency_buckets)
+        self.sizes = Histogram(size_buckets)
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "statuses": dict(self.statuses),
+            "latency_mean": self.latency.sum / self.latency.count if self.latency.count else None,
+            "latency_p50": self.latency.quantile(0.5),
+            "latency_p99": self.latency.quantile(0.99),
+        }
+
+class Metrics(RequestHook):
+    """Collects per-endpoint counters and histograms of every request of the clients it is passed to.
+
+    Requests served from the cache only count as cache hits and requests that shared another
+    request's response only as coalesced, so `requests` is the number of API calls that count
+    against the rate limit. File transfers appear as the endpoints 'upload' and 'download'.
+
+        metrics = Metrics()
+        rg = RapidgatorAPI("myEmail", "myPassword", hooks=[metrics])
+        ...
+        print(metrics.summary()["folder/content"]["latency_p99"])
+        print(metrics.to_prometheus())
+
+    The collector is safe to share between threads and clients.
+
+    Args:
+        latency_buckets (Sequence[float]): Upper bounds of the latency buckets in seconds. Default is LATENCY_BUCKETS.
+        size_buckets (Sequence[float]): Upper bounds of the response size buckets in bytes. Default is SIZE_BUCKETS.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = LATENCY_BUCKETS, size_buckets: Sequence[float] = SIZE_BUCKETS) -> None:
+        self.latency_buckets = latency_buckets
+        self.size_buckets = size_buckets
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def after(self, event: RequestEvent) -> None:
+        with self._lock:
+            metrics = self.endpoints.get(event.endpoint)
+            if metrics is None:
+                metrics = self.endpoints[event.endpoint] = EndpointMetrics(self.latency_buckets, self.size_buckets)
+            if event.cached:
+                metrics.cache_hits += 1
+                return
+            if event.coalesced:
+                metrics.coalesced += 1
+                return
+            metrics.requests += 1
+            metrics.retries += event.retries
+            metrics.statuses[event.status] += 1
+            if event.status != 200:
+                metrics.errors += 1
+            metrics.bytes_sent += event.bytes_sent
+            metrics.bytes_received += event.bytes_received
+            metrics.latency.observe(event.latency)
+            metrics.sizes.observe(event.bytes_received)
+
+    def summary(self) -> Dict[str, dict]:
+        """Returns the counters and latency estimates by endpoint as plain dicts."""
+        with self._lock:
+            return {endpoint: metrics.summary() for endpoint, metrics in sorted(self.endpoints.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints.clear()
+
+    def to_prometheus(self, prefix: str = "rapidgator") -> str:
+        """Renders all metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prepended to every metric name. Default is 'rapidgator'.
+        """
+        lines = []
+        def family(name: str, kind: str, help: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            family("requests_total", "counter", "API requests sent, by endpoint and status (0 without response).")
+            for endpoint, metrics in endpoints:
+                for status, count in sorted(metrics.statuses.items(), key=lambda item: item[0] or 0):
+                    lines.append(f'{prefix}_requests_total{{endpoint="{endpoint}",status="{status or 0}"}} {count}')
+            for name, attribute, help in (
+                ("retries_total", "retries", "Retried attempts, by endpoint."),
+                ("cache_hits_total", "cache_hits", "Responses served from the response cache, by endpoint."),
+                ("coalesced_total", "coalesced", "Requests that shared the response of an identical concurrent request, by endpoint."),
+                ("sent_bytes_total", "bytes_sent", "Bytes of file content sent, by endpoint."),
+                ("received_bytes_total", "bytes_received", "Bytes of responses and file content received, by endpoint."),
+            ):
+                family(name, "counter", help)
+                lines += [f'{prefix}_{name}{{endpoint="{endpoint}"}} {getattr(metrics, attribute)}' for endpoint, metrics in endpoints]
+            for name, attribute, help in (
+                ("request_duration_seconds", "latency", "Request latency including retries, by endpoint."),
+                ("response_size_bytes", "sizes", "Response size, by endpoint."),
+            ):
+                family(name, "histogram", help)
+                for endpoint, metrics in endpoints:
+                    histogram = getattr(metrics, attribute)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{prefix}_{name}_bucket{{endpoint="{endpoint}",le="{"+Inf" if bound == float("inf") else f"{bound:g}"}"}} {count}')
+                    lines.append(f'{prefix}_{name}_sum{{endpoint="{endpoint}"}} {histogram.sum:g}')
+                    lines.append(f'{prefix}_{name}_count{{endpoint="{endpoint}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+class OpenTelemetryHook(RequestHook):
+    """Records every request as an OpenTelemetry span (requires `opentelemetry-api`).
+
+    Spans are named after the endpoint and carry the HTTP method, status, retries and byte
+    counts as attributes; failed requests get an error status.
+
+    Args:
+        tracer: The tracer to use. Default is the tracer of the global tracer provider.
+    """
+
+    def __init__(self, tracer=None) -> None:
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError("OpenTelemetryHook requires opentelemetry-api, install it with `pip install opentelemetry-api`") from e
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("rapidgatorAPI")
+
+    def after(self, event: RequestEvent) -> None:
+        end = time.time_ns()
+        span = self.tracer.start_span(f"rapidgator {event.endpoint}", kind=self._trace.SpanKind.CLIENT, start_time=end - int(event.latency * 1e9), attributes={
+            "http.request.method": event.method,
+            "rapidgator.endpoint": event.endpoint,
+            "rapidgator.status": event.status or 0,
+            "rapidgator.retries": event.retries,
+            "rapidgator.cached": event.cached,
+            "rapidgator.coalesced": event.coalesced,
+            "rapidgator.bytes_sent": event.bytes_sent,
+            "rapidgator.bytes_received": event.bytes_received,
+        })
+        if event.status != 200:
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, event.error))
+        span.end(end_time=end)
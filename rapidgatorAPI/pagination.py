@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Tuple, TypeVar
+
+from classes.Pager import Pager
+
+T = TypeVar("T")
+
+def iter_pages(fetch: Callable[[int], Tuple[T, Pager]], page: int = 1, prefetch: bool = True) -> Iterator[T]:
+    """Yields one page after the other until the pager's last page.
+
+    With prefetch, the next page is requested in a background thread while the consumer works
+    on the current one. Pages after the one the consumer stops at are never requested, apart
+    from the single page being prefetched.
+
+    Args:
+        fetch (Callable[[int], Tuple[T, Pager]]): Requests a page by number and returns it with its pager.
+        page (int): The first page. Default is 1.
+        prefetch (bool): Request the next page in the background. Default is true.
+
+    Returns:
+        Iterator[T]: The pages
+    """
+    if not prefetch:
+        while True:
+            result, pager = fetch(page)
+            yield result
+            if page >= pager.total:
+                return
+            page += 1
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch, page)
+        try:
+            while future is not None:
+                result, pager = future.result()
+                future = executor.submit(fetch, page + 1) if page < pager.total else None
+                page += 1
+                yield result
+        finally:
+            if future is not None:
+                future.cancel()
@@ -1,719 +1,687 @@
+from __future__ import annotations
+
 import dataclasses
-import requests
-from dacite import from_dict
-from typing import List, Optional, Tuple
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from classes.APIError import APIError
-from classes.User import User
-from classes.Folder import Folder
-from classes.Pager import Pager
-from classes.File import File
-from classes.FileUpload import FileUpload
-from classes.FileDownload import FileDownload
-from classes.OneTimeLink import OneTimeLink
-from classes.CheckLinkResult import CheckLinkResult
-from classes.RemoteUploadJob import RemoteUploadJob
+
+from .cache import ResponseCache
+from .decoding import loads
+from .endpoints import RapidgatorEndpoints
+from .scheduler import RequestScheduler
+from .singleflight import COALESCED_ENDPOINTS, SingleFlight, request_key
+from .tokens import TokenStore
+from .transport import Transport, PooledTransport
+
+# requests, the models and the helpers for bulk operations, uploads and downloads are
+# imported on first use, so importing the package and creating a client stay cheap
+if TYPE_CHECKING:
+    from classes.BulkReport import BulkReport
+    from classes.DedupReport import DedupReport
+    from classes.CheckLinkResult import CheckLinkResult
+    from classes.File import File
+    from classes.FileColumns import FileColumns
+    from classes.FileUpload import FileUpload
+    from classes.Folder import Folder
+    from classes.RemoteUploadJob import RemoteUploadJob
+    from classes.RequestEvent import RequestEvent
+    from classes.SyncReport import SyncReport
+
+    from .hashing import HashCache
+    from .metrics import RequestHook
+    from .remote import RemoteUploadManager
 
 @dataclasses.dataclass
-class RapidgatorAPI():
+class RapidgatorAPI(RapidgatorEndpoints):
+    """Synchronous Rapidgator API client.
+
+    Creating a client doesn't send anything: it logs in with the first request that needs a
+    token (or takes the token from the token store). Call `login` to log in right away.
+
+    A request that fails because the token expired logs in again once and is repeated.
+
+    One client can be shared by many threads: the connection pool, cache, scheduler and metrics
+    are thread-safe, and when the token expires only one thread logs in while the others wait
+    for its token. Threads that make the same read request at the same time share one network
+    call (see SingleFlight) unless coalesce is false.
+
+    Args:
+        username (str): The account's email address.
+        password (str): The account's password.
+        two_factor_code (str): The current two-factor authentication code, if enabled.
+        transport (Transport): The HTTP layer. Default is a PooledTransport.
+        base_url (str): The API base URL.
+        cache (ResponseCache): Serve read-only endpoints from this cache.
+        scheduler (RequestScheduler): Rate limits and retries every request. Default retries transient failures without a rate limit.
+        token_store (TokenStore): Reuse the token stored for username instead of logging in, and store new tokens there.
+        hooks (List[RequestHook]): Called before and after every request and file transfer, e.g. a metrics.Metrics collector.
+        coalesce (bool): Let concurrent identical read requests share one network call. Default is true.
+    """
     username: str
     password: str
     two_factor_code: Optional[str] = None
+    transport: Transport = dataclasses.field(default_factory=PooledTransport, repr=False)
+    base_url: str = "https://rapidgator.net/api/v2/"
+    cache: Optional[ResponseCache] = dataclasses.field(default=None, repr=False)
+    scheduler: RequestScheduler = dataclasses.field(default_factory=RequestScheduler, repr=False)
+    token_store: Optional[TokenStore] = dataclasses.field(default=None, repr=False)
+    hooks: List[RequestHook] = dataclasses.field(default_factory=list, repr=False)
+    coalesce: bool = True
     
     def __post_init__(self) -> None:
-        params = {
-            "login": self.username,
-            "password": self.password,
-        }
-        if self.two_factor_code:
-            params["code"] = self.two_factor_code
-        r = requests.post("https://rapidgator.net/api/v2/user/login", data=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            self.token = r.json()["response"]["token"]
-            
-    def info(self) -> User:
-        """Returns a list of the user's personal information.
-
-        Raises:
-            APIError: e.g. if user is not found
-
-        Returns:
-            User: The user's personal information
-        """
-        params = {
-            "token": self.token
-        }
-        r = requests.get("https://rapidgator.net/api/v2/user/info", params=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(User, r.json()["response"]["user"])
+        self.token = None
+        self._token_lock = threading.Lock()
+        self._flights = SingleFlight()
         
-    def folder_create(self, name: str, parent_folder_id: str = None) -> Folder:
-        """Creates a folder.
+    def login(self) -> None:
+        """Logs in and stores the token used by all other requests.
 
-        Args:
-            name (str): The name of the folder to be created.
-            parent_folder_id (str): The key that identifies the folder. If the parent_folder_id is not passed, will return the root folder details.
+        If a token store is set and has a token for username other than the current one, that
+        token is used instead.
 
         Raises:
-            APIError: e.g. if the parent folder is not found
-
-        Returns:
-            Folder: The created folder
+            APIError: e.g. if the credentials are wrong
         """
-        params = {
-            "token": self.token,
-            "name": name
-        }
-        if parent_folder_id:
-            params["folder_id"] = parent_folder_id
-        r = requests.post("https://rapidgator.net/api/v2/folder/create", data=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(Folder, r.json()["response"]["folder"])
+        self._relogin(self.token)
         
-    def folder_info(self, folder_id: str = None) -> Folder:
-        """Returns a folder's and list of sub folders details.
-
-        Args:
-            folder_id (str): The key that identifies the folder. If the folder_id is not passed, will return the root folder details.
-
-        Raises:
-            APIError: e.g. if the folder is not found
+    def _login(self) -> str:
+        return self._send("POST", "user/login", self._login_params(), lambda response: response["token"])
+    
+    def _relogin(self, expired: Optional[str]) -> None:
+        """Replaces the expired token, preferring a newer token from the token store over a login.
 
-        Returns:
-            Folder: The folder information
+        Threads that find the same expired token wait for the first one, which logs in once.
         """
-        params = {
-            "token": self.token
-        }
-        if folder_id:
-            params["folder_id"] = folder_id
-        r = requests.get("https://rapidgator.net/api/v2/folder/info", params=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
+        with self._token_lock:
+            if self.token != expired:
+                return
+            if self.token_store is None:
+                self.token = self._login()
+                return
+            with self.token_store.lock(self.username):
+                token = self.token_store.get(self.username)
+                if token is None or token == expired:
+                    token = self._login()
+                    self.token_store.set(self.username, token)
+                self.token = token
+            
+    def _send(self, method: str, endpoint: str, params: dict, parse: Optional[Callable[[Any], Any]] = None, check: bool = True) -> Any:
+        if not self.hooks:
+            return self._send_attempts(method, endpoint, params, parse, check, None)
+        from classes.RequestEvent import RequestEvent
+        from .metrics import run_after, run_before
+        run_before(self.hooks, method, endpoint, params)
+        event = RequestEvent(method, endpoint, None, 0)
+        start = time.perf_counter()
+        try:
+            return self._send_attempts(method, endpoint, params, parse, check, event)
+        except Exception as e:
+            event.error = str(e)
+            raise
+        finally:
+            event.latency = time.perf_counter() - start
+            run_after(self.hooks, event)
+
+    def _send_attempts(self, method: str, endpoint: str, params: dict, parse: Optional[Callable[[Any], Any]], check: bool, event: Optional[RequestEvent]) -> Any:
+        url = self.base_url + endpoint
+        attempt = 0
+        import requests
+        while True:
+            time.sleep(self.scheduler.delay(endpoint))
+            r = None
+            try:
+                with self.scheduler.slot():
+                    if method == "GET":
+                        r = self.transport.request(method, url, params=params)
+                    else:
+                        r = self.transport.request(method, url, data=params)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not self.scheduler.should_retry(method, attempt, connect_error=isinstance(e, requests.ConnectTimeout)):
+                    raise
+            if r is not None:
+                try:
+                    body = loads(r.content)
+                except ValueError:
+                    body = None
+                # A proxy or error page may send JSON that isn't an API response
+                if not isinstance(body, dict) or "status" not in body:
+                    body = None
+                status = body["status"] if body is not None else r.status_code
+                self.scheduler.record(status)
+                if event is not None:
+                    event.status, event.bytes_received = status, event.bytes_received + len(r.content)
+                if status == 200 or not self.scheduler.should_retry(method, attempt, status):
+                    break
+            time.sleep(self.scheduler.retry_delay(attempt))
+            attempt += 1
+            if event is not None:
+                event.retries = attempt
+        if body is None:
+            raise APIError(status, None, r.text[:200])
+        # An expired token raises even for endpoints whose status isn't checked, so it can be renewed
+        if (check and status != 200) or status == 401:
+            raise APIError(status, body, body.get("details"))
+        return parse(body["response"]) if parse else body["response"]
+    
+    def _request(self, method: str, endpoint: str, params: dict, parse: Optional[Callable[[Any], Any]] = None, check: bool = True) -> Any:
+        if self.token is None:
+            self._relogin(None)
+        if self.cache is not None:
+            hit, response = self.cache.get(endpoint, params)
+            if hit:
+                if self.hooks:
+                    self._served_locally(method, endpoint, params, cached=True)
+                return parse(response) if parse else response
+        if not self.coalesce:
+            response = self._fetch(method, endpoint, params, check)
+        elif endpoint in COALESCED_ENDPOINTS:
+            response, shared = self._flights.do(request_key(endpoint, params), lambda: self._fetch(method, endpoint, params, check))
+            if shared and self.hooks:
+                self._served_locally(method, endpoint, params, coalesced=True)
         else:
-            return from_dict(Folder, r.json()["response"]["folder"])
+            response = self._fetch(method, endpoint, params, check)
+            # Reads started after a mutation must not get a response that may predate it
+            self._flights.forget()
+        return parse(response) if parse else response
+
+    def _fetch(self, method: str, endpoint: str, params: dict, check: bool) -> Any:
+        token = self.token
+        # Taken before sending, so a response that a concurrent mutation made stale isn't cached
+        generation = self.cache.generation if self.cache is not None else None
+        try:
+            response = self._send(method, endpoint, dict(params, token=token), check=check)
+        except APIError as e:
+            if e.status != 401:
+                raise
+            self._relogin(token)
+            response = self._send(method, endpoint, dict(params, token=self.token), check=check)
+        if self.cache is not None:
+            self.cache.update(endpoint, params, response, generation)
+        return response
+    
+    def _served_locally(self, method: str, endpoint: str, params: dict, cached: bool = False, coalesced: bool = False) -> None:
+        """Reports a request answered from the cache or by another thread's request to the hooks."""
+        from classes.RequestEvent import RequestEvent
+        from .metrics import run_after, run_before
+        run_before(self.hooks, method, endpoint, params)
+        run_after(self.hooks, RequestEvent(method, endpoint, 200, 0, cached=cached, coalesced=coalesced))
+
+    def _transfer(self, method: str, endpoint: str, params: dict, transfer: Callable[[], int], sent: bool) -> None:
+        """Runs transfer, which returns the number of bytes it moved, and reports it to the hooks as endpoint."""
+        if not self.hooks:
+            transfer()
+            return
+        from classes.RequestEvent import RequestEvent
+        from .metrics import run_after, run_before
+        run_before(self.hooks, method, endpoint, params)
+        event = RequestEvent(method, endpoint, None, 0)
+        start = time.perf_counter()
+        try:
+            nbytes = transfer()
+            event.status = 200
+            if sent:
+                event.bytes_sent = nbytes
+            else:
+                event.bytes_received = nbytes
+        except Exception as e:
+            event.error = str(e)
+            raise
+        finally:
+            event.latency = time.perf_counter() - start
+            run_after(self.hooks, event)
+
+    def close(self) -> None:
+        """Closes all pooled connections of the client's transport."""
+        self.transport.close()
         
-    def folder_content(self, folder_id: str = None, page: int = 1, per_page: int = 500, sort_column: str = "name", sort_direction: str = "ASC") -> Tuple[Folder, Pager]:
-        """Returns a folder's, list of sub folders and list of files details.
+    def __enter__(self) -> "RapidgatorAPI":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def iter_folder_files(self, folder_id: str = None, per_page: int = 500, sort_column: str = "name", sort_direction: str = "ASC", prefetch: bool = True) -> Iterator[File]:
+        """Yields the files of a folder, requesting folder_content page by page.
 
         Args:
-            folder_id (str): The key that identifies the folder. If the folder_id is not passed, will return the root folder details.
-            page (int): Page number. Default is 1
-            per_page (int): TNumber of files per page. Default is 500.
+            folder_id (str): The key that identifies the folder. If the folder_id is not passed, the root folder is listed.
+            per_page (int): Number of files per page. Default is 500.
             sort_column (str): Sort column name. Possible values: 'name', 'created', 'size', 'nb_downloads'. Default is 'name'.
             sort_direction (str): Sort direction. Possible values: 'ASC', 'DESC'. Default is 'ASC'.
+            prefetch (bool): Request the next page while the current one is consumed. Default is true.
 
         Raises:
             APIError: e.g. if the folder is not found
             ValueError: e.g. if sort_column or sort_direction is invalid
 
         Returns:
-            Folder: The folder information
+            Iterator[File]: The files
         """
-        params = {
-            "token": self.token
-        }
-        if folder_id:
-            params["folder_id"] = folder_id
-        if page:
-            params["page"] = page
-        if per_page:
-            params["per_page"] = per_page
-        if sort_column:
-            if sort_column not in ["name", "created", "size", "nb_downloads"]:
-                raise ValueError("sort_column must be one of 'name', 'created', 'size', 'nb_downloads'")
-            params["sort_column"] = sort_column
-        if sort_direction:
-            if sort_direction not in ["ASC", "DESC"]:
-                raise ValueError("sort_direction must be one of 'ASC', 'DESC'")
-            params["sort_direction"] = sort_direction
-        r = requests.get("https://rapidgator.net/api/v2/folder/content", params=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(Folder, r.json()["response"]["folder"]), from_dict(Pager, r.json()["response"]["pager"])
-        
-    def folder_rename(self, folder_id: str, name: str) -> Folder:
-        """Rename a folder.
-
-        Args:
-            folder_id (str): The key that identifies the folder to be renamed.
-            name (str): The new name of the folder.
+        from .pagination import iter_pages
+        fetch = lambda page: self.folder_content(folder_id, page, per_page, sort_column, sort_direction)
+        for folder in iter_pages(fetch, prefetch=prefetch):
+            yield from folder.files or []
+    
+    def iter_folder_subfolders(self, folder_id: str = None) -> Iterator[Folder]:
+        """Yields the sub folders of a folder.
 
-        Returns:
-            Folder: The renamed folder
-        """
-        params = {
-            "token": self.token,
-            "folder_id": folder_id,
-            "name": name
-        }
-        r = requests.post("https://rapidgator.net/api/v2/folder/rename", data=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(Folder, r.json()["response"]["folder"])
-        
-    def folder_copy(self, folder_id: str, folder_id_dest: str) -> dict:
-        """Copy a folder to another folder (This operation also works with foreign folders).
+        The sub folders come from a single folder_info request, so no file pages are fetched.
 
         Args:
-            folder_id (str): The key that identifies the folder to be copied.
-            folder_id_dest (str): The key that identifies the destination folder.
-
-        Returns:
-            Folder: The copied folder
-        """
-        params = {
-            "token": self.token,
-            "folder_id": folder_id,
-            "folder_id_dest": folder_id_dest
-        }
-        r = requests.post("https://rapidgator.net/api/v2/folder/copy", data=params)
-
-        # Even if the folder is not found, the API returns a 200 status code. WTF?
-        return r.json()["response"]
-    
-    def folder_move(self, folder_id: str, folder_id_dest: str) -> dict:
-        """Move a folder to another folder (This operation also works with foreign folders).
+            folder_id (str): The key that identifies the folder. If the folder_id is not passed, the root folder is listed.
 
-        Args:
-            folder_id (str): The key that identifies the folder to be moved.
-            folder_id_dest (str): The key that identifies the destination folder.
+        Raises:
+            APIError: e.g. if the folder is not found
 
         Returns:
-            Folder: The moved folder
+            Iterator[Folder]: The sub folders
         """
-        params = {
-            "token": self.token,
-            "folder_id": folder_id,
-            "folder_id_dest": folder_id_dest
-        }
-        r = requests.post("https://rapidgator.net/api/v2/folder/move", data=params)
-
-        # Even if the folder is not found, the API returns a 200 status code. WTF?
-        return r.json()["response"]
+        yield from self.folder_info(folder_id).folders or []
     
-    def folder_delete(self, folder_id: str) -> dict:
-        """Delete a folder.
+    def iter_trashcan(self, per_page: int = 500, sort_column: str = "name", sort_direction: str = "ASC", prefetch: bool = True) -> Iterator[File]:
+        """Yields the files in the trashcan, requesting trashcan_content page by page.
 
         Args:
-            folder_id (str): The key that identifies the folder to be deleted.
+            per_page (int): Number of files per page. Default is 500.
+            sort_column (str): Sort column name. Possible values: 'name', 'created', 'size', 'delete_time'. Default is 'name'.
+            sort_direction (str): Sort direction. Possible values: 'ASC', 'DESC'. Default is 'ASC'.
+            prefetch (bool): Request the next page while the current one is consumed. Default is true.
+
+        Raises:
+            ValueError: e.g. if sort_column or sort_direction is invalid
 
         Returns:
-            dict: The response
+            Iterator[File]: The files
         """
-        params = {
-            "token": self.token,
-            "folder_id": folder_id
-        }
-        r = requests.post("https://rapidgator.net/api/v2/folder/delete", data=params)
-
-        # Even if the folder is not found, the API returns a 200 status code. WTF?
-        return r.json()["response"]
+        from .pagination import iter_pages
+        fetch = lambda page: self.trashcan_content(page, per_page, sort_column, sort_direction)
+        for files in iter_pages(fetch, prefetch=prefetch):
+            yield from files
     
-    # def folder_change_mode(self, folder_id: str, mode: int) -> Folder:
-    #     """Change a folder mode.
+    def walk(self, folder_id: str = None, workers: int = 8, per_page: int = 500, columnar: bool = False) -> Iterator[Tuple[Folder, List[Folder], Union[List[File], FileColumns]]]:
+        """Walks a folder tree like os.walk, listing up to `workers` folders at the same time.
 
-    #     Args:
-    #         folder_id (str): The key that identifies the folder to be changed.
-    #         mode (int): The new mode of the folder. Possible values: 0 - Public, 1 - Premium only, 2 - Private, 3 - Hotlink.
-            
-    #     Raises:
-    #         APIError: e.g. if the folder is not found
-    #         ValueError: e.g. if mode is invalid
-
-    #     Returns:
-    #         Folder: The changed folder
-    #     """
-    #     if mode not in [0, 1, 2, 3]:
-    #         raise ValueError("mode must be one of 0, 1, 2, 3")
-    #     params = {
-    #         "token": self.token,
-    #         "folder_id": folder_id,
-    #         "mode": mode
-    #     }
-    #     r = requests.post("https://rapidgator.net/api/v2/folder/change_mode", data=params)
-    #     if r.json()["status"] != 200:
-    #         raise Exception(r.json())
-    #     else:
-    #         return from_dict(Folder, r.json()["response"]["folder"])
-        
-    def file_upload(self, name: str, hash: str, size: int, folder_id: int = None, multipart: bool = True) -> FileUpload:
-        """Checks if instant upload is possible and return upload session object with file info or upload URL.
-        
-        Upload steps:
-            1. Do file_upload API request. If upload state not equal 0 no need other steps.
-            2. Upload file to upload url.
-            3. Do file_upload_info API request.
+        See rapidgatorAPI.walk.walk.
 
         Args:
-            name (str): The file name
-            hash (str): MD5 hash of the file
-            size (int): The file size
-            folder_id (int): The key that identifies the folder. If the folder_id is not passed, will upload to the root folder.
-            multipart (bool): This parameter indicates the type of upload. Default is true.
-
-        Raises:
-            APIError: e.g. you can't create more than 10 copies of the same file
+            folder_id (str): The key that identifies the top folder. If the folder_id is not passed, the root folder is walked.
+            workers (int): Maximum number of folder listings in flight. Default is 8.
+            per_page (int): Number of files per page. Default is 500.
+            columnar (bool): Yield the files of each folder as a FileColumns container. Default is false.
 
         Returns:
-            FileUpload: The uploaded file status
+            Iterator[Tuple[Folder, List[Folder], Union[List[File], FileColumns]]]: (folder, sub folders, files) for every folder
         """
-        params = {
-            "token": self.token,
-            "name": name,
-            "hash": hash,
-            "size": size
-        }
-        if folder_id:
-            params["folder_id"] = folder_id
-        if multipart is not None:
-            params["multipart"] = multipart
-        r = requests.post("https://rapidgator.net/api/v2/file/upload", data=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(FileUpload, r.json()["response"]["upload"])
-        
-    def file_upload_info(self, upload_id: str) -> FileUpload:
-        """Checks upload session state.
-
-        Args:
-            upload_id (str): The upload session id.
-
-        Raises:
-            APIError: e.g. if the upload id is not found
+        from .walk import walk
+        return walk(self, folder_id, workers, per_page, columnar)
+    
+    def file_columns(self, folder_id: str = None, recursive: bool = False, workers: int = 8, per_page: int = 500) -> FileColumns:
+        """Lists the files of a folder into a memory-compact FileColumns container.
 
-        Returns:
-            FileUpload: The uploaded file status
-        """
-        params = {
-            "token": self.token,
-            "upload_id": upload_id
-        }
-        r = requests.get("https://rapidgator.net/api/v2/file/upload_info", params=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(FileUpload, r.json()["response"]["upload"])
-        
-    def file_download(self, file_id: str) -> FileDownload:
-        """Download a file.
+        No File object is created per file, which keeps inventories of millions of files small.
 
         Args:
-            file_id (str): The key that identifies the file.
+            folder_id (str): The key that identifies the folder. If the folder_id is not passed, the root folder is listed.
+            recursive (bool): Include the files of all sub folders. Default is false.
+            workers (int): Maximum number of folder listings in flight if recursive. Default is 8.
+            per_page (int): Number of files per page. Default is 500.
 
         Raises:
-            APIError: e.g. if the file is not found
+            APIError: e.g. if the folder is not found
 
         Returns:
-            FileDownload: The file download URL
+            FileColumns: The files
         """
-        params = {
-            "token": self.token,
-            "file_id": file_id
-        }
-        r = requests.get("https://rapidgator.net/api/v2/file/download", params=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(FileDownload, r.json()["response"]["file"])
-        
-    def file_info(self, file_id: str) -> File:
-        """Returns a file's details.
-
-        Args:
-            file_id (str): The key that identifies the file.
-
-        Raises:
-            APIError: e.g. if the file is not found
+        from classes.FileColumns import FileColumns
+        from .pagination import iter_pages
+        columns = FileColumns()
+        if not recursive:
+            for _ in iter_pages(lambda page: self.folder_content_columns(columns, folder_id, page, per_page), prefetch=False):
+                pass
+            return columns
+        for _, _, files in self.walk(folder_id, workers, per_page, columnar=True):
+            columns += files
+        return columns
+    
+    def check_links(self, urls: Iterable[str], batch_size: int = 50, workers: int = 4) -> Iterator[CheckLinkResult]:
+        """Checks many download links with batched, concurrent file_check_link requests.
 
-        Returns:
-            File: The file information
-        """
-        params = {
-            "token": self.token,
-            "file_id": file_id
-        }
-        r = requests.get("https://rapidgator.net/api/v2/file/info", params=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(File, r.json()["response"]["file"])
-        
-    def file_rename(self, file_id: str, name: str) -> File:
-        """Rename a file.
+        See rapidgatorAPI.linkcheck.check_links.
 
         Args:
-            file_id (str): The key that identifies the file to be renamed.
-            name (str): The new name of the file.
+            urls (Iterable[str]): The download links. Duplicates are checked once.
+            batch_size (int): Number of links per request to start with, lowered automatically if the API rejects it. Default is 50.
+            workers (int): Maximum number of requests in flight. Default is 4.
 
         Returns:
-            File: The renamed file
+            Iterator[CheckLinkResult]: The results as they arrive
         """
-        params = {
-            "token": self.token,
-            "file_id": file_id,
-            "name": name
-        }
-        r = requests.post("https://rapidgator.net/api/v2/file/rename", data=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(File, r.json()["response"]["file"])
-        
-    def file_copy(self, file_id: str, folder_id_dest: str) -> dict:
-        """Copy a file to another folder (This operation also works with foreign folders).
+        from .linkcheck import check_links
+        return check_links(self, urls, batch_size, workers)
+    
+    def files_copy(self, file_ids: Iterable[str], folder_id_dest: str, batch_size: int = 100, workers: int = 4) -> BulkReport:
+        """Copies many files to another folder, several files per request.
 
         Args:
-            file_id (str): The key that identifies the file to be copied.
+            file_ids (Iterable[str]): The keys that identify the files to be copied.
             folder_id_dest (str): The key that identifies the destination folder.
-            
-        Raises:
-            APIError: e.g. if the destination folder is not found
+            batch_size (int): Number of files per request. Default is 100.
+            workers (int): Maximum number of requests in flight. Default is 4.
 
         Returns:
-            dict: The response
+            BulkReport: The outcome for every file
         """
-        params = {
-            "token": self.token,
-            "file_id": file_id,
-            "folder_id_dest": folder_id_dest
-        }
-        r = requests.post("https://rapidgator.net/api/v2/file/copy", data=params)
-
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return r.json()["response"]
-        
-    def file_xcopy(self, url: str, folder_id_dest: str) -> File:
-        """Copy a file to another folder by download link.
+        from .bulk import bulk_apply
+        return bulk_apply(lambda ids: self.file_copy(ids, folder_id_dest), file_ids, batch_size, workers)
+    
+    def files_move(self, file_ids: Iterable[str], folder_id_dest: str, batch_size: int = 100, workers: int = 4) -> BulkReport:
+        """Moves many files to another folder, several files per request.
 
         Args:
-            url (str): The key that identifies the file to be copied.
+            file_ids (Iterable[str]): The keys that identify the files to be moved.
             folder_id_dest (str): The key that identifies the destination folder.
-            
-        Raises:
-            APIError: e.g. you can't create more than 10 copies of the same file
+            batch_size (int): Number of files per request. Default is 100.
+            workers (int): Maximum number of requests in flight. Default is 4.
 
         Returns:
-            File: The copied file
+            BulkReport: The outcome for every file
         """
-        params = {
-            "token": self.token,
-            "url": url,
-            "folder_id_dest": folder_id_dest
-        }
-        r = requests.post("https://rapidgator.net/api/v2/file/xcopy", data=params)
-
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(File, r.json()["response"]["file"])
-        
-    def file_hashcopy(self, hash: str, folder_id_dest: str, name: str) -> File:
-        """Copy a file to another folder by MD5 hash.
+        from .bulk import bulk_apply
+        return bulk_apply(lambda ids: self.file_move(ids, folder_id_dest), file_ids, batch_size, workers)
+    
+    def files_delete(self, file_ids: Iterable[str], batch_size: int = 100, workers: int = 4) -> BulkReport:
+        """Deletes many files, several files per request.
 
         Args:
-            hash (str): The key that identifies the file to be copied.
-            folder_id_dest (str): The key that identifies the destination folder.
-            name (str): The new name of the file.
-            
-        Raises:
-            APIError: e.g. if the file is not found
+            file_ids (Iterable[str]): The keys that identify the files to be deleted.
+            batch_size (int): Number of files per request. Default is 100.
+            workers (int): Maximum number of requests in flight. Default is 4.
 
         Returns:
-            File: The copied file
+            BulkReport: The outcome for every file
         """
-        params = {
-            "token": self.token,
-            "hash": hash,
-            "folder_id_dest": folder_id_dest
-        }
-        r = requests.post("https://rapidgator.net/api/v2/file/hashcopy", data=params)
-
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(File, r.json()["response"]["file"])
-        
-    def file_move(self, file_id: str, folder_id_dest: str) -> dict:
-        """Move a file to another folder (This operation also works with foreign folders).
+        from .bulk import bulk_apply
+        return bulk_apply(self.file_delete, file_ids, batch_size, workers)
+    
+    def files_rename(self, names: Dict[str, str], workers: int = 4) -> BulkReport:
+        """Renames many files concurrently, one request per file.
 
         Args:
-            file_id (str): The key that identifies the file to be moved.
-            folder_id_dest (str): The key that identifies the destination folder.
+            names (Dict[str, str]): The new name for every file key.
+            workers (int): Maximum number of requests in flight. Default is 4.
 
         Returns:
-            dict: The response
+            BulkReport: The outcome for every file
         """
-        params = {
-            "token": self.token,
-            "file_id": file_id,
-            "folder_id_dest": folder_id_dest
-        }
-        r = requests.post("https://rapidgator.net/api/v2/file/move", data=params)
-
-        # Even if the file is not found, the API returns a 200 status code. WTF?
-        return r.json()["response"]
+        from .bulk import bulk_map
+        return bulk_map(lambda file_id: self.file_rename(file_id, names[file_id]), names, workers)
     
-    def file_delete(self, file_id: str) -> dict:
-        """Delete a file.
+    def folders_copy(self, folder_ids: Iterable[str], folder_id_dest: str, batch_size: int = 100, workers: int = 4) -> BulkReport:
+        """Copies many folders to another folder, several folders per request.
 
         Args:
-            file_id (str): The key that identifies the file to be deleted.
+            folder_ids (Iterable[str]): The keys that identify the folders to be copied.
+            folder_id_dest (str): The key that identifies the destination folder.
+            batch_size (int): Number of folders per request. Default is 100.
+            workers (int): Maximum number of requests in flight. Default is 4.
 
         Returns:
-            dict: The response
+            BulkReport: The outcome for every folder
         """
-        params = {
-            "token": self.token,
-            "file_id": file_id
-        }
-        r = requests.post("https://rapidgator.net/api/v2/file/delete", data=params)
-
-        # Even if the file is not found, the API returns a 200 status code. WTF?
-        return r.json()["response"]
+        from .bulk import bulk_apply
+        return bulk_apply(lambda ids: self.folder_copy(ids, folder_id_dest), folder_ids, batch_size, workers)
     
-    def file_change_mode(self, file_id: str, mode: int) -> File:
-        """Change a file mode.
+    def folders_move(self, folder_ids: Iterable[str], folder_id_dest: str, batch_size: int = 100, workers: int = 4) -> BulkReport:
+        """Moves many folders to another folder, several folders per request.
 
         Args:
-            file_id (str): The key that identifies the file to be changed.
-            mode (int): The new mode of the file. Possible values: 0 - Public, 1 - Premium only, 2 - Private, 3 - Hotlink.
-            
-        Raises:
-            APIError: e.g. if the file is not found
-            ValueError: e.g. if mode is invalid
+            folder_ids (Iterable[str]): The keys that identify the folders to be moved.
+            folder_id_dest (str): The key that identifies the destination folder.
+            batch_size (int): Number of folders per request. Default is 100.
+            workers (int): Maximum number of requests in flight. Default is 4.
 
         Returns:
-            File: The changed file
+            BulkReport: The outcome for every folder
         """
-        if mode not in [0, 1, 2, 3]:
-            raise ValueError("mode must be one of 0, 1, 2, 3")
-        params = {
-            "token": self.token,
-            "file_id": file_id,
-            "mode": mode
-        }
-        r = requests.post("https://rapidgator.net/api/v2/file/change_mode", data=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(File, r.json()["response"]["file"])
-        
-    def file_check_link(self, url: str) -> List[CheckLinkResult]:
-        """Check a file download link.
+        from .bulk import bulk_apply
+        return bulk_apply(lambda ids: self.folder_move(ids, folder_id_dest), folder_ids, batch_size, workers)
+    
+    def folders_delete(self, folder_ids: Iterable[str], batch_size: int = 100, workers: int = 4) -> BulkReport:
+        """Deletes many folders, several folders per request.
 
         Args:
-            url (str): The file download link.
-            
-        Raises:
-            APIError: e.g. to many links
+            folder_ids (Iterable[str]): The keys that identify the folders to be deleted.
+            batch_size (int): Number of folders per request. Default is 100.
+            workers (int): Maximum number of requests in flight. Default is 4.
 
         Returns:
-            List[CheckLinkResult]: The check link result
+            BulkReport: The outcome for every folder
         """
-        params = {
-            "token": self.token,
-            "url": url
-        }
-        r = requests.get("https://rapidgator.net/api/v2/file/check_link", params=params)
-
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return [from_dict(CheckLinkResult, response) for response in r.json()["response"]]
-        
-    def file_onetimelink_create(self, file_id: str, callback_url: str = None, notify: bool = None) -> OneTimeLink:
-        """Create a one time download link.
+        from .bulk import bulk_apply
+        return bulk_apply(self.folder_delete, folder_ids, batch_size, workers)
+    
+    def remote_upload_urls(self, urls: Iterable[str], max_jobs: Optional[int] = None, refresh_time: Optional[float] = None, on_change: Optional[Callable[[RemoteUploadJob, Optional[int]], None]] = None, delete_finished: bool = True, workers: int = 4, timeout: Optional[float] = None) -> RemoteUploadManager:
+        """Remote uploads many URLs, keeping the account's job limit and polling all jobs at once.
 
-        Args:
-            file_id (str): The key that identifies the file.
-            callback_url (str): Callback URL. A callback URL will be invoked when file will be downloaded.
-            notify (bool): Send notification letter when file will be downloaded
-            
-        Raises:
-            APIError: e.g. if the file is not found
-
-        Returns:
-            OneTimeLink: The one time download link
-        """
-        params = {
-            "token": self.token,
-            "file_id": file_id
-        }
-        if callback_url:
-            params["url"] = callback_url
-        if notify is not None:
-            params["notify"] = notify
-        r = requests.post("https://rapidgator.net/api/v2/file/onetimelink_create", data=params)
-
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return from_dict(OneTimeLink, r.json()["response"]["link"])
-        
-    def file_onetimelink_info(self, link_id: str = None) -> List[OneTimeLink]:
-        """Returns a one time download link details.
+        See rapidgatorAPI.remote.RemoteUploadManager.
 
         Args:
-            link_id (str): The key that identifies the one-time link. You can also specify multiple link keys separated by comma. If the link_id is not passed, will return all one-time link details.
+            urls (Iterable[str]): The URLs of the files to be uploaded.
+            max_jobs (int): Maximum number of active jobs. Default is the account's RemoteUpload.max_nb_jobs.
+            refresh_time (float): Seconds between two polls. Default is the account's RemoteUpload.refresh_time.
+            on_change (Callable[[RemoteUploadJob, Optional[int]], None]): Called with the job and its previous state whenever a job changes its state.
+            delete_finished (bool): Delete finished jobs with remote_job_delete. Default is true.
+            workers (int): Maximum number of remote_upload_create requests in flight. Default is 4.
+            timeout (float): Give up after this many seconds. Default is None (wait forever).
 
         Raises:
-            APIError: e.g. if the link is not found
+            TimeoutError: if timeout is reached
 
         Returns:
-            List[OneTimeLink]: The one time download link details
+            RemoteUploadManager: The manager, with the finished jobs in done and failed and the rejected URLs in errors
         """
-        params = {
-            "token": self.token,
-            "link_id": link_id
-        }
-        r = requests.get("https://rapidgator.net/api/v2/file/onetimelink_info", params=params)
-
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return [from_dict(OneTimeLink, link) for link in r.json()["response"]["links"]]
-        
-    def trashcan_content(self, page: int = 1, per_page: int = 500, sort_column: str = "name", sort_direction: str = "ASC") -> Tuple[List[File], Pager]:
-        """Returns a list of files in the trashcan.
+        from .remote import RemoteUploadManager
+        manager = RemoteUploadManager(self, max_jobs, refresh_time, on_change, delete_finished, workers)
+        manager.add(urls)
+        manager.run(timeout)
+        return manager
+    
+    def sync(self, local_dir: str, folder_id: str = None, direction: str = "up", delete: bool = False, workers: int = 4, hash_cache: Optional[HashCache] = None) -> SyncReport:
+        """Syncs a local directory and a remote folder tree in one direction.
+
+        See rapidgatorAPI.sync.sync_up and rapidgatorAPI.sync.sync_down.
 
         Args:
-            page (int): Page number. Default is 1
-            per_page (int): TNumber of files per page. Default is 500.
-            sort_column (str): Sort column name. Possible values: 'name', 'created', 'size', 'delete_time'. Default is 'name'
-            sort_direction (str): Sort direction. Possible values: 'ASC', 'DESC'. Default is 'ASC'.
+            local_dir (str): The local directory.
+            folder_id (str): The key that identifies the remote folder. If the folder_id is not passed, the root folder is used.
+            direction (str): 'up' makes the remote folder match local_dir, 'down' makes local_dir match the remote folder. Default is 'up'.
+            delete (bool): Delete files and folders on the target side that don't exist on the source side. Default is false.
+            workers (int): Maximum number of concurrent transfers. Default is 4.
+            hash_cache (HashCache): Where local hashes are remembered between syncs, so unchanged files are not read again.
 
         Raises:
-            ValueError: e.g. if sort_column or sort_direction is invalid
+            APIError: e.g. if the remote folder is not found
+            ValueError: if direction is invalid
 
         Returns:
-            Tuple[List[File], Pager]: The list of files in the trashcan and the pager
+            SyncReport: What happened to every file
         """
-        params = {
-            "token": self.token
-        }
-        if page:
-            params["page"] = page
-        if per_page:
-            params["per_page"] = per_page
-        if sort_column:
-            if sort_column not in ["name", "created", "size", "delete_time"]:
-                raise ValueError("sort_column must be one of 'name', 'created', 'size', 'delete_time'")
-            params["sort_column"] = sort_column
-        if sort_direction:
-            if sort_direction not in ["ASC", "DESC"]:
-                raise ValueError("sort_direction must be one of 'ASC', 'DESC'")
-            params["sort_direction"] = sort_direction
-        r = requests.get("https://rapidgator.net/api/v2/trashcan/content", params=params)
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return Tuple([from_dict(File, file) for file in r.json()["response"]["files"]], from_dict(Pager, r.json()["response"]["pager"]))
-        
-    def trashcan_restore(self, file_id: str = None) -> dict:
-        """Restore a file from the trashcan to root folder.
+        from .sync import sync_down, sync_up
+        if direction == "up":
+            return sync_up(self, local_dir, folder_id, delete, workers, hash_cache)
+        if direction == "down":
+            return sync_down(self, folder_id, local_dir, delete, workers, hash_cache)
+        raise ValueError("direction must be one of 'up', 'down'")
+    
+    def upload_files(self, paths: Iterable[str], folder_id: str = None, workers: int = 4, hash_cache: Optional[HashCache] = None) -> DedupReport:
+        """Uploads many local files, sending bytes only for contents the server doesn't have yet.
+
+        See rapidgatorAPI.dedup.upload_files.
 
         Args:
-            file_id (str): The key that identifies the file. If not specified will be restored all files.
+            paths (Iterable[str]): The local files.
+            folder_id (str): The key that identifies the destination folder. If the folder_id is not passed, the root folder is used.
+            workers (int): Maximum number of concurrent requests and uploads. Default is 4.
+            hash_cache (HashCache): Hashes to reuse and to extend.
 
         Returns:
-            dict: The response
+            DedupReport: What happened to every path, with the bytes sent and the bytes saved
         """
-        params = {
-            "token": self.token,
-        }
-        if file_id:
-            params["file_id"] = file_id
-        r = requests.post("https://rapidgator.net/api/v2/trashcan/restore", data=params)
-
-        # Even if the file is not found, the API returns a 200 status code. WTF?
-        return r.json()["response"]
+        from .dedup import upload_files
+        return upload_files(self, paths, folder_id, workers, hash_cache)
     
-    def trashcan_empty(self, file_id: str = None) -> dict:
-        """Empty the trashcan.
-        
+    def hashcopy_files(self, hashes: Dict[str, str], folder_id: str = None, workers: int = 8) -> DedupReport:
+        """Creates many files from contents the server already has, with concurrent file_hashcopy requests.
+
         Args:
-            file_id (str): The key that identifies the file. If not specified will be deleted all files.
+            hashes (Dict[str, str]): The MD5 hash by file name.
+            folder_id (str): The key that identifies the destination folder. If the folder_id is not passed, the root folder is used.
+            workers (int): Maximum number of requests in flight. Default is 8.
 
         Returns:
-            dict: The response
+            DedupReport: The copied names, the names whose content the server doesn't have in missing, and the bytes saved
         """
-        params = {
-            "token": self.token,
-        }
-        if file_id:
-            params["file_id"] = file_id
-        r = requests.post("https://rapidgator.net/api/v2/trashcan/empty", data=params)
-
-        # Even if the file is not found, the API returns a 200 status code. WTF?
-        return r.json()["response"]
+        from .dedup import hashcopy_files
+        return hashcopy_files(self, hashes, folder_id, workers)
     
-    def remote_upload_create(self, url: str) -> List[RemoteUploadJob]:
-        """Create a remote upload job.
+    def upload_file(self, path: str, folder_id: str = None, name: str = None, chunk_size: int = 1 << 20, multipart: bool = True, poll_interval: float = 1, max_poll_interval: float = 30, timeout: float = None, pipes: Optional[int] = 1, part_size: int = 16 << 20, part_retries: int = 3, progress: Optional[Callable[[int, int], None]] = None, hash: Optional[str] = None) -> File:
+        """Uploads a local file.
+
+        The MD5 hash is computed in a streaming pass (unless it is passed) and an instant upload is tried first. If the
+        server doesn't know the content yet, the file is streamed to the upload URL in chunks of
+        chunk_size bytes and file_upload_info is polled with growing intervals until the upload
+        is done.
+        
+        With more than one pipe, a file larger than part_size is split into parts of part_size
+        bytes that are sent over up to `pipes` concurrent connections (see upload_parts).
 
         Args:
-            url (str): The URL of the file to be uploaded.
-            
+            path (str): The local file path.
+            folder_id (str): The key that identifies the destination folder. If the folder_id is not passed, will upload to the root folder.
+            name (str): The remote file name. Default is the local file name.
+            chunk_size (int): Number of bytes read from disk and sent per step. Default is 1 MiB.
+            multipart (bool): Send the file as multipart/form-data. Default is true.
+            poll_interval (float): Seconds to wait before the first file_upload_info request. Default is 1.
+            max_poll_interval (float): Upper bound for the growing poll interval in seconds. Default is 30.
+            timeout (float): Give up polling after this many seconds. If not passed, poll until the upload is final.
+            pipes (int): Number of concurrent connections. If None, the account's Upload.nb_pipes from info() is used. Default is 1.
+            part_size (int): Number of bytes per part when uploading over several pipes. Default is 16 MiB.
+            part_retries (int): How often a failed part is sent again. Default is 3.
+            progress (Callable[[int, int], None]): Called with (bytes sent, file size) when sending starts and while the file is sent; never called for an instant upload.
+            hash (str): The MD5 hash of the file, if it is already known.
+
         Raises:
-            APIError: e.g. Exceeded the storage quota
+            APIError: e.g. if the request for an upload was rejected
+            UploadError: if the upload failed on the server, e.g. because the sent bytes don't match the hash
+            TimeoutError: if the upload is not final after timeout seconds
+            ValueError: if the file is larger than the account's Upload.max_file_size (only checked if pipes is None)
 
         Returns:
-            List[RemoteUploadJob]: The remote upload job
+            File: The uploaded file
         """
-        params = {
-            "token": self.token,
-            "url": url
-        }
-        r = requests.post("https://rapidgator.net/api/v2/remote/create", data=params)
-
-        if r.json()["status"] != 200:
-            raise Exception(r.json())
-        else:
-            return [from_dict(RemoteUploadJob, job) for job in r.json()["response"]["jobs"]]
-        
-    def remote_upload_info(self, job_id: int = None) -> List[RemoteUploadJob]:
-        """Returns a remote upload job details.
+        from classes.UploadError import UploadError
+        from .hashing import file_md5
+        from .upload import UploadProgress, UploadStream, upload_parts, UPLOAD_STATE_UPLOADING, UPLOAD_STATE_FAIL
+        name = name or os.path.basename(path)
+        size = os.path.getsize(path)
+        if pipes is None:
+            limits = self.info().upload
+            if size > limits.max_file_size:
+                raise ValueError(f"{path} is larger than the maximum file size of {limits.max_file_size} bytes")
+            pipes = limits.nb_pipes
+        upload = self.file_upload(name, hash or file_md5(path), size, folder_id, multipart)
+        if upload.state == UPLOAD_STATE_UPLOADING:
+            counter = UploadProgress(size, progress)
+            # Also reported for an empty file, so callers can tell a real upload from an instant one
+            counter.add(0)
+            def send() -> int:
+                if pipes > 1 and size > part_size:
+                    upload_parts(self.transport, upload.url, path, name, size, pipes, part_size, chunk_size, multipart, counter, part_retries)
+                else:
+                    stream = UploadStream(path, name, chunk_size, multipart, on_chunk=counter.add)
+                    r = self.transport.request("POST", upload.url, data=stream, headers=stream.headers)
+                    r.raise_for_status()
+                return size
+            self._transfer("POST", "upload", {"upload_id": upload.upload_id}, send, sent=True)
+            upload = self.wait_for_upload(upload.upload_id, poll_interval, max_poll_interval, timeout)
+        if upload.state == UPLOAD_STATE_FAIL:
+            raise UploadError(200, None, f"upload {upload.upload_id} of {path} ended in state {upload.state_label}", upload)
+        return upload.file
+    
+    def wait_for_upload(self, upload_id: str, poll_interval: float = 1, max_poll_interval: float = 30, timeout: float = None) -> FileUpload:
+        """Polls file_upload_info until the upload session is done or failed.
 
         Args:
-            job_id (int): The key that identifies the remote upload job. If the job_id is not passed, will return all remote upload job details.
+            upload_id (str): The upload session id.
+            poll_interval (float): Seconds to wait before the first request, the interval grows by half after every request. Default is 1.
+            max_poll_interval (float): Upper bound for the poll interval in seconds. Default is 30.
+            timeout (float): Give up after this many seconds. If not passed, poll until the upload is final.
+
+        Raises:
+            TimeoutError: if the upload is not final after timeout seconds
 
         Returns:
-            List[RemoteUploadJob]: The remote upload job details
+            FileUpload: The final upload session state
         """
-        params = {
-            "token": self.token,
-        }
-        if job_id:
-            params["job_id"] = job_id
-        r = requests.get("https://rapidgator.net/api/v2/remote/info", params=params)
-
-        return [from_dict(RemoteUploadJob, job) for job in r.json()["response"]["jobs"]]
+        from .upload import UPLOAD_STATE_DONE, UPLOAD_STATE_FAIL
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(poll_interval)
+            upload = self.file_upload_info(upload_id)
+            if upload.state in (UPLOAD_STATE_DONE, UPLOAD_STATE_FAIL):
+                return upload
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"upload {upload_id} is still in state {upload.state_label}")
+            poll_interval = min(poll_interval * 1.5, max_poll_interval)
     
-    def remote_job_delete(self, job_id: int) -> dict:
-        """Delete a remote upload job.
+    def download_file(self, file_id: str, path: str, segments: int = 4, min_segment_size: int = 8 << 20, chunk_size: int = 1 << 20, retries: int = 3, verify: bool = True, progress: Optional[Callable[[int, int], None]] = None) -> str:
+        """Downloads a file, resuming an earlier interrupted download of it.
+
+        The target file is allocated to its full size up front and the file is fetched in
+        parallel segments with HTTP Range requests, each written in place. Progress is kept in a
+        `<path>.rgdownload` journal; calling download_file again after an interruption only
+        fetches the missing bytes. The file_download delay is honored before the first request.
 
         Args:
-            job_id (int): The key that identifies the remote upload job.
+            file_id (str): The key that identifies the file.
+            path (str): The target file path. If it is a directory, the remote file name is used inside it.
+            segments (int): Maximum number of parallel segments. Default is 4.
+            min_segment_size (int): Files are not split into segments smaller than this. Default is 8 MiB.
+            chunk_size (int): Number of bytes read from the connection and written per step. Default is 1 MiB.
+            retries (int): How often a broken segment is requested again. Default is 3.
+            verify (bool): Compare the MD5 hash of the result with File.hash. Default is true.
+            progress (Callable[[int, int], None]): Called with (bytes on disk, file size) while downloading.
+
+        Raises:
+            APIError: e.g. if the file is not found
+            IOError: e.g. if the downloaded file doesn't match File.hash
 
         Returns:
-            dict: The response
+            str: The path of the downloaded file
         """
-        params = {
-            "token": self.token,
-            "job_id": job_id
-        }
-        r = requests.post("https://rapidgator.net/api/v2/remote/delete", data=params)
-
-        # Even if the job is not found, the API returns a 200 status code. WTF?
-        return r.json()["response"]
\ No newline at end of file
+        from .download import DownloadJournal, download_segments, split_segments
+        from .hashing import file_md5
+        file = self.file_info(file_id)
+        if os.path.isdir(path):
+            path = os.path.join(path, file.name)
+        journal = DownloadJournal.load(path + ".rgdownload", file_id, file.size) if os.path.exists(path) else None
+        if journal is None:
+            journal = DownloadJournal(path + ".rgdownload", file_id, file.size, split_segments(file.size, segments, min_segment_size))
+            with open(path, "wb") as f:
+                f.truncate(file.size)
+            journal.save()
+        if journal.done < file.size:
+            download = self.file_download(file_id)
+            time.sleep(download.delay)
+            missing = file.size - journal.done
+            def receive() -> int:
+                download_segments(self.transport, download.download_url, path, journal, chunk_size, retries, progress)
+                return missing
+            self._transfer("GET", "download", {"file_id": file_id}, receive, sent=False)
+        journal.remove()
+        if verify and file.hash and file_md5(path) != file.hash:
+            raise IOError(f"{path} doesn't match the MD5 hash {file.hash} of file {file_id}")
+        return path
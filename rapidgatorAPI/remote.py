@@ -0,0 +1,150 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Union
+
+from classes.APIError import APIError
+from classes.RemoteUploadJob import RemoteUploadJob
+
+REMOTE_STATE_WAITING = 0
+REMOTE_STATE_DOWNLOADING = 1
+REMOTE_STATE_DONE = 2
+REMOTE_STATE_FAILED = 3
+
+_FINISHED_STATES = (REMOTE_STATE_DONE, REMOTE_STATE_FAILED)
+
+# The details of the 400 response for a job over the account's limit
+_TOO_MANY_JOBS = "Error: Too many remote upload jobs"
+
+def _is_job_limit(error: APIError) -> bool:
+    """Whether remote_upload_create was rejected because the account has too many active jobs."""
+    return error.status == 400 and (error.details or "").strip() == _TOO_MANY_JOBS
+
+class RemoteUploadManager():
+    """Runs many remote uploads while staying within the account's job limit.
+
+    Queued URLs are submitted with concurrent remote_upload_create requests whenever fewer than
+    `max_jobs` jobs are active on the account, counting jobs started elsewhere. The state of all
+    jobs is polled with one remote_upload_info request every `refresh_time` seconds instead of one
+    request per job. `on_change(job, previous_state)` is called whenever a job changes its state,
+    with previous_state None when the job is created. Finished jobs are moved to `done` or
+    `failed` and deleted from the account.
+
+    Args:
+        api (RapidgatorAPI): The client used for the requests.
+        max_jobs (int): Maximum number of active jobs. Default is the account's RemoteUpload.max_nb_jobs.
+        refresh_time (float): Seconds between two polls. Default is the account's RemoteUpload.refresh_time.
+        on_change (Callable[[RemoteUploadJob, Optional[int]], None]): Called on every state change.
+        delete_finished (bool): Delete finished jobs with remote_job_delete. Default is true.
+        workers (int): Maximum number of remote_upload_create requests in flight. Default is 4.
+    """
+
+    def __init__(self, api, max_jobs: Optional[int] = None, refresh_time: Optional[float] = None, on_change: Optional[Callable[[RemoteUploadJob, Optional[int]], None]] = None, delete_finished: bool = True, workers: int = 4) -> None:
+        self.api = api
+        self.max_jobs = max_jobs
+        self.refresh_time = refresh_time
+        self.on_change = on_change
+        self.delete_finished = delete_finished
+        self.workers = workers
+        self.pending: Deque[str] = deque()
+        self.active: Dict[int, RemoteUploadJob] = {}
+        self.done: List[RemoteUploadJob] = []
+        self.failed: List[RemoteUploadJob] = []
+        # URLs whose job could not be created, with the error
+        self.errors: Dict[str, APIError] = {}
+        self.polls = 0
+        self._elsewhere = 0
+
+    def add(self, urls: Union[str, Iterable[str]]) -> None:
+        """Queues one URL or many URLs."""
+        self.pending.extend([urls] if isinstance(urls, str) else urls)
+
+    def run(self, timeout: Optional[float] = None) -> List[RemoteUploadJob]:
+        """Submits and polls until every queued URL is finished.
+
+        Args:
+            timeout (float): Give up after this many seconds. Default is None (wait forever).
+
+        Raises:
+            TimeoutError: if timeout is reached; the manager keeps its state and run can be called again
+
+        Returns:
+            List[RemoteUploadJob]: The jobs that finished successfully
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._load_limits()
+        # Counts the jobs already running on the account before anything is submitted
+        self.poll()
+        self._submit()
+        while self.active or self.pending:
+            left = None if deadline is None else deadline - time.monotonic()
+            if left is not None and left <= 0:
+                raise TimeoutError(f"{len(self.active)} remote upload jobs still active, {len(self.pending)} queued")
+            # The last poll happens at the deadline rather than being skipped
+            time.sleep(self.refresh_time if left is None else min(self.refresh_time, left))
+            self.poll()
+            self._submit()
+        return self.done
+
+    def poll(self) -> None:
+        """Updates all active jobs with a single remote_upload_info request."""
+        jobs = {job.job_id: job for job in self.api.remote_upload_info() or []}
+        self.polls += 1
+        for job_id, job in list(self.active.items()):
+            current = jobs.get(job_id)
+            if current is None:
+                # Deleted outside the manager
+                del self.active[job_id]
+                self.failed.append(job)
+                continue
+            if current.state != job.state:
+                self.active[job_id] = current
+                self._notify(current, job.state)
+            if current.state in _FINISHED_STATES:
+                self._finish(current)
+        self._elsewhere = sum(1 for job_id, job in jobs.items() if job_id not in self.active and job.state not in _FINISHED_STATES)
+
+    def _load_limits(self) -> None:
+        if self.max_jobs is None or self.refresh_time is None:
+            limits = self.api.info().remote_upload
+            self.max_jobs = limits.max_nb_jobs if self.max_jobs is None else self.max_jobs
+            self.refresh_time = limits.refresh_time if self.refresh_time is None else self.refresh_time
+
+    def _submit(self) -> None:
+        free = self.max_jobs - len(self.active) - self._elsewhere
+        urls = [self.pending.popleft() for _ in range(min(free, len(self.pending)))]
+        if not urls:
+            return
+
+        def create(url: str) -> Union[List[RemoteUploadJob], APIError]:
+            try:
+                return self.api.remote_upload_create(url)
+            except APIError as e:
+                return e
+
+        rejected = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for url, result in zip(urls, executor.map(create, urls)):
+                if isinstance(result, APIError):
+                    if _is_job_limit(result):
+                        rejected.append(url)
+                    else:
+                        self.errors[url] = result
+                    continue
+                for job in result:
+                    self.active[job.job_id] = job
+                    self._notify(job, None)
+                    if job.state in _FINISHED_STATES:
+                        self._finish(job)
+        # Jobs started elsewhere since the last poll took the slots; these URLs go first next time
+        self.pending.extendleft(reversed(rejected))
+
+    def _finish(self, job: RemoteUploadJob) -> None:
+        del self.active[job.job_id]
+        (self.done if job.state == REMOTE_STATE_DONE else self.failed).append(job)
+        if self.delete_finished:
+            self.api.remote_job_delete(job.job_id)
+
+    def _notify(self, job: RemoteUploadJob, previous_state: Optional[int]) -> None:
+        if self.on_change is not None:
+            self.on_change(job, previous_state)
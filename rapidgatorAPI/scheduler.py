@@ -0,0 +1,192 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+# Statuses worth another attempt
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+# Statuses telling us to slow down; the request was not processed, so even POSTs are retried
+THROTTLE_STATUSES = {429, 503}
+
+class TokenBucket():
+    """A token bucket that hands out waiting times instead of blocking.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (float): Maximum number of tokens, i.e. requests that may be sent back to back.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how many seconds to wait until it may be used."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+def _resolve(future: Any) -> None:
+    if not future.done():
+        future.set_result(None)
+
+class RequestScheduler():
+    """Decides when requests are sent and whether failed ones are sent again.
+
+    Every request first takes a token from the global bucket (if `rate` is set) and from the
+    bucket of its endpoint (if listed in `budgets`), and waits as long as they demand. Transient
+    failures are retried with jittered exponential backoff: GET requests on TRANSIENT_STATUSES
+    and connection errors, POST requests only on THROTTLE_STATUSES and connect timeouts, where
+    the server certainly did not process them.
+
+    In adaptive mode a throttle response halves the number of requests allowed in flight and
+    the global rate; both grow back gradually with every successful request.
+
+    Args:
+        rate (float): Maximum requests per second over all endpoints. Default is None (no limit).
+        burst (float): Requests that may be sent back to back before `rate` applies. Default is 10.
+        budgets (Dict[str, Tuple[float, float]]): (rate, burst) per endpoint, e.g. {'file/check_link': (1, 2)}.
+        retries (int): Maximum number of retries per request. Default is 3.
+        backoff (float): Base of the exponential backoff in seconds. Default is 0.5.
+        max_backoff (float): Upper bound of a single backoff in seconds. Default is 30.
+        adaptive (bool): Lower concurrency and rate on throttle responses. Default is true.
+        max_concurrency (int): Maximum number of requests in flight. Default is None (no limit until throttled).
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: float = 10, budgets: Optional[Dict[str, Tuple[float, float]]] = None, retries: int = 3, backoff: float = 0.5, max_backoff: float = 30, adaptive: bool = True, max_concurrency: Optional[int] = None) -> None:
+        self.rate = rate
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.adaptive = adaptive
+        self.max_concurrency = max_concurrency
+        self.limit: Optional[float] = max_concurrency
+        self.in_flight = 0
+        self.throttled = 0
+        self._ceiling = max_concurrency
+        self._bucket = TokenBucket(rate, burst) if rate else None
+        self._budgets = {endpoint: TokenBucket(*budget) for endpoint, budget in (budgets or {}).items()}
+        self._condition = threading.Condition()
+        # (event loop, future) of coroutines waiting in acquire_async, woken like the threads in slot()
+        self._waiters: Deque[Tuple[Any, Any]] = deque()
+
+    def delay(self, endpoint: str) -> float:
+        """Reserves a token for a request to endpoint and returns how many seconds to wait before sending it."""
+        delay = self._bucket.reserve() if self._bucket else 0.0
+        if endpoint in self._budgets:
+            delay = max(delay, self._budgets[endpoint].reserve())
+        return delay
+
+    def retry_delay(self, attempt: int) -> float:
+        """Returns the jittered backoff before retry number attempt (starting at 0)."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def should_retry(self, method: str, attempt: int, status: Optional[int] = None, connect_error: bool = False) -> bool:
+        """Whether a failed request should be sent again.
+
+        Args:
+            method (str): 'GET' or 'POST'.
+            attempt (int): Number of retries already made.
+            status (int): The API or HTTP status, None if no response arrived.
+            connect_error (bool): The connection could not be established, so nothing was sent.
+        """
+        if attempt >= self.retries:
+            return False
+        if status is None:
+            return method == "GET" or connect_error
+        if status in THROTTLE_STATUSES:
+            return True
+        return method == "GET" and status in TRANSIENT_STATUSES
+
+    def try_acquire(self) -> bool:
+        """Takes a slot for a request in flight if the concurrency limit allows it."""
+        with self._condition:
+            if self.limit is not None and self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    async def acquire_async(self) -> None:
+        """Waits without blocking the event loop until the concurrency limit allows another request and takes the slot.
+
+        Release it with release().
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self.limit is None or self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                waiter = (loop, loop.create_future())
+                self._waiters.append(waiter)
+            try:
+                await waiter[1]
+            except BaseException:
+                with self._condition:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                    else:
+                        # Woken but cancelled: the free slot goes to the next waiter
+                        self._wake(1)
+                raise
+
+    def _wake(self, count: Optional[int] = None) -> None:
+        """Wakes count (or all) coroutines waiting in acquire_async; the caller holds the lock."""
+        while self._waiters and (count is None or count > 0):
+            loop, future = self._waiters.popleft()
+            loop.call_soon_threadsafe(_resolve, future)
+            if count is not None:
+                count -= 1
+
+    def release(self) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+            self._wake(1)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Blocks until the concurrency limit allows another request and holds the slot while it runs."""
+        with self._condition:
+            while self.limit is not None and self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record(self, status: Optional[int]) -> None:
+        """Feeds the outcome of a request into the adaptive limits."""
+        with self._condition:
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+            if not self.adaptive:
+                return
+            if status in THROTTLE_STATUSES:
+                if self.limit is None:
+                    self._ceiling = max(self.in_flight, 1)
+                    self.limit = self._ceiling
+                self.limit = max(1.0, self.limit / 2)
+                if self._bucket:
+                    self._bucket.rate = max(self.rate / 16, self._bucket.rate / 2)
+            elif status is not None and status < 400:
+                if self.limit is not None:
+                    self.limit += 1 / self.limit
+                    if self.max_concurrency is None and self.limit >= self._ceiling:
+                        self.limit = None
+                    elif self.max_concurrency is not None:
+                        self.limit = min(self.limit, self.max_concurrency)
+                    self._condition.notify_all()
+                    self._wake()
+                if self._bucket:
+                    self._bucket.rate = min(self.rate, self._bucket.rate + self.rate / 20)
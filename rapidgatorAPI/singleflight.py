@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .cache import DEFAULT_TTLS
+
+# asyncio takes longer to import than the whole client, it is only imported by AsyncSingleFlight
+if TYPE_CHECKING:
+    import asyncio
+
+# Read-only endpoints whose concurrent identical requests share one network call
+COALESCED_ENDPOINTS = frozenset(DEFAULT_TTLS) | {"trashcan/content", "file/upload_info", "remote/info"}
+
+def request_key(endpoint: str, params: dict) -> Hashable:
+    """Identifies a request by endpoint and parameters (without the token)."""
+    return endpoint, tuple(sorted((key, str(value)) for key, value in params.items() if value is not None))
+
+class _Flight():
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight():
+    """Lets concurrent threads that make the same call share one execution of it.
+
+    The first thread to ask for a key runs the call; threads asking for the same key while it
+    runs wait and receive its result or exception. Nothing is kept afterwards, so unlike a
+    cache this never returns a result that was complete before the caller asked.
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Runs call, or waits for the running call with the same key.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether it was shared from another thread's call
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+        try:
+            flight.result = call()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    def forget(self) -> None:
+        """Lets later callers start new calls instead of joining the running ones, e.g. after a mutation."""
+        with self._lock:
+            self._flights.clear()
+
+class AsyncSingleFlight():
+    """The asyncio counterpart of SingleFlight, for coroutines of one event loop.
+
+    If the coroutine running the call is cancelled, the waiting ones are cancelled too.
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Awaits call(), or the running call with the same key.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether it was shared from another coroutine's call
+        """
+        import asyncio
+        future = self._flights.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Cancelling one waiter must not cancel the call the others wait for
+            return await asyncio.shield(future), True
+        future = self._flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marks the exception as retrieved, there may be nobody waiting for it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+        return result, False
+
+    def forget(self) -> None:
+        """Lets later callers start new calls instead of joining the running ones, e.g. after a mutation."""
+        self._flights.clear()
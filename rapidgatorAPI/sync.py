@@ -0,0 +1,190 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from classes.File import File
+from classes.SyncReport import SyncReport
+
+from .hashing import HashCache, hash_files
+from .walk import walk
+
+def _join(parent: str, name: str) -> str:
+    return f"{parent}/{name}" if parent else name
+
+def _topmost(paths: Set[str]) -> Set[str]:
+    """Drops the paths that lie inside another path of the set."""
+    return {path for path in paths if not any(path.startswith(other + "/") for other in paths)}
+
+def _remote_tree(api, folder_id: Optional[str], workers: int) -> Tuple[Dict[str, str], Dict[str, File]]:
+    """Returns the folder ids and the files of a remote tree by relative path; '' is the top folder."""
+    folders, files, paths = {}, {}, {}
+    for folder, subfolders, folder_files in walk(api, folder_id, workers):
+        path = paths.pop(folder.folder_id, "")
+        folders[path] = folder.folder_id
+        for subfolder in subfolders:
+            paths[subfolder.folder_id] = _join(path, subfolder.name)
+        for file in folder_files:
+            files.setdefault(_join(path, file.name), file)
+    return folders, files
+
+def _local_tree(local_dir: str) -> Tuple[Set[str], Dict[str, str]]:
+    """Returns the directories and the files (with their absolute paths) of a local tree by relative path."""
+    dirs, files = {""}, {}
+    for root, subdirs, names in os.walk(local_dir):
+        path = os.path.relpath(root, local_dir).replace(os.sep, "/")
+        path = "" if path == "." else path
+        dirs.update(_join(path, subdir) for subdir in subdirs)
+        for name in names:
+            # Journals of interrupted downloads are not part of the tree
+            if not name.endswith(".rgdownload"):
+                files[_join(path, name)] = os.path.join(root, name)
+    return dirs, files
+
+def _run(tasks: Dict[str, Callable[[], Optional[int]]], workers: int, report: SyncReport) -> None:
+    """Runs the transfer of every path.
+
+    A task returns the number of bytes it sent or received, or None if the file was created on
+    the server without sending bytes.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {path: executor.submit(task) for path, task in tasks.items()}
+        for path, future in futures.items():
+            try:
+                nbytes = future.result()
+            except Exception as e:
+                report.failed[path] = str(e)
+                continue
+            if nbytes is None:
+                report.copied.append(path)
+            else:
+                report.transferred.append(path)
+                report.bytes_transferred += nbytes
+
+def sync_up(api, local_dir: str, folder_id: str = None, delete: bool = False, workers: int = 4, hash_cache: Optional[HashCache] = None, poll_interval: float = 1) -> SyncReport:
+    """Makes a remote folder tree match a local directory.
+
+    Files are compared by relative path, size and MD5 hash; local files are hashed in parallel
+    processes unless their hash is cached. A new or changed file is copied with
+    file_hashcopy if the remote tree already holds its content, otherwise it is uploaded, which
+    still sends no bytes if the server knows the content from anywhere (instant upload). The old
+    remote version of a changed file is deleted afterwards. Up to `workers` files are handled at
+    the same time.
+
+    Args:
+        api (RapidgatorAPI): The client.
+        local_dir (str): The local source directory.
+        folder_id (str): The key that identifies the remote target folder. If the folder_id is not passed, the root folder is used.
+        delete (bool): Delete remote files and folders that don't exist locally. Default is false.
+        workers (int): Maximum number of concurrent transfers and folder listings. Default is 4.
+        hash_cache (HashCache): Where local hashes are remembered between syncs. Default is a cache for this sync only.
+        poll_interval (float): Seconds between file_upload_info requests while an upload is processed. Default is 1.
+
+    Raises:
+        APIError: e.g. if the remote folder is not found
+
+    Returns:
+        SyncReport: What happened to every file
+    """
+    cache = hash_cache or HashCache()
+    folders, remote_files = _remote_tree(api, folder_id, workers)
+    local_dirs, local_files = _local_tree(local_dir)
+    report = SyncReport()
+    for path in sorted(local_dirs - folders.keys(), key=lambda path: path.count("/")):
+        parent, _, name = path.rpartition("/")
+        folders[path] = api.folder_create(name, folders[parent]).folder_id
+    by_file = hash_files(local_files.values(), cache=cache)
+    hashes = {path: by_file[file] for path, file in local_files.items()}
+    known = {file.hash: file for file in remote_files.values() if file.hash}
+
+    def transfer(path: str) -> Callable[[], Optional[int]]:
+        def run() -> Optional[int]:
+            parent, _, name = path.rpartition("/")
+            # Stays None for a hash copy or an instant upload
+            sent = None
+            if hashes[path] in known:
+                api.file_hashcopy(hashes[path], folders[parent], name)
+            else:
+                def progress(done: int, total: int) -> None:
+                    nonlocal sent
+                    sent = done
+                api.upload_file(local_files[path], folders[parent], name, hash=hashes[path], poll_interval=poll_interval, progress=progress)
+            if path in remote_files:
+                api.file_delete(remote_files[path].file_id)
+            return sent
+        return run
+
+    tasks = {}
+    for path in local_files:
+        remote = remote_files.get(path)
+        if remote is not None and remote.size == os.path.getsize(local_files[path]) and remote.hash == hashes[path]:
+            report.skipped.append(path)
+        else:
+            tasks[path] = transfer(path)
+    _run(tasks, workers, report)
+    if delete:
+        stale_folders = _topmost(set(folders) - local_dirs)
+        stale_files = [path for path in remote_files if path not in local_files and path.rpartition("/")[0] in local_dirs]
+        for paths, ids, remove in [(stale_files, [remote_files[path].file_id for path in stale_files], api.files_delete), (sorted(stale_folders), [folders[path] for path in sorted(stale_folders)], api.folders_delete)]:
+            if not ids:
+                continue
+            path_by_id = dict(zip(ids, paths))
+            result = remove(ids)
+            report.deleted.extend(path_by_id[item_id] for item_id in result.succeeded)
+            report.failed.update((path_by_id[item.item_id], item.error) for item in result.failed)
+    return report
+
+def sync_down(api, folder_id: str, local_dir: str, delete: bool = False, workers: int = 4, hash_cache: Optional[HashCache] = None) -> SyncReport:
+    """Makes a local directory match a remote folder tree.
+
+    Files are compared by relative path, size and MD5 hash; only new or changed files are
+    downloaded, up to `workers` at the same time, and checked against File.hash.
+
+    Args:
+        api (RapidgatorAPI): The client.
+        folder_id (str): The key that identifies the remote source folder. If the folder_id is not passed, the root folder is used.
+        local_dir (str): The local target directory. It is created if it doesn't exist.
+        delete (bool): Delete local files and directories that don't exist remotely. Default is false.
+        workers (int): Maximum number of concurrent downloads and folder listings. Default is 4.
+        hash_cache (HashCache): Where local hashes are remembered between syncs. Default is a cache for this sync only.
+
+    Raises:
+        APIError: e.g. if the remote folder is not found
+
+    Returns:
+        SyncReport: What happened to every file
+    """
+    cache = hash_cache or HashCache()
+    folders, remote_files = _remote_tree(api, folder_id, workers)
+    local_dirs, local_files = _local_tree(local_dir) if os.path.isdir(local_dir) else ({""}, {})
+    report = SyncReport()
+    for path in folders:
+        os.makedirs(os.path.join(local_dir, *path.split("/")), exist_ok=True)
+
+    def transfer(file: File, target: str) -> Callable[[], Optional[int]]:
+        def run() -> Optional[int]:
+            api.download_file(file.file_id, target, verify=False)
+            if file.hash and cache.md5(target) != file.hash:
+                raise IOError(f"{target} doesn't match the MD5 hash {file.hash} of file {file.file_id}")
+            return file.size
+        return run
+
+    tasks = {}
+    for path, file in remote_files.items():
+        target = os.path.join(local_dir, *path.split("/"))
+        # An interrupted download already has the full size, its journal says it isn't complete
+        if path in local_files and not os.path.exists(target + ".rgdownload") and os.path.getsize(target) == file.size and (not file.hash or cache.md5(target) == file.hash):
+            report.skipped.append(path)
+        else:
+            tasks[path] = transfer(file, target)
+    _run(tasks, workers, report)
+    if delete:
+        stale_dirs = _topmost(local_dirs - set(folders))
+        for path in sorted(stale_dirs):
+            shutil.rmtree(os.path.join(local_dir, *path.split("/")))
+            report.deleted.append(path)
+        for path in local_files:
+            if path not in remote_files and path.rpartition("/")[0] in folders:
+                os.remove(local_files[path])
+                report.deleted.append(path)
+    return report
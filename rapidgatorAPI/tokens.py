@@ -0,0 +1,116 @@
+import abc
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import ContextManager, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+class TokenStore(abc.ABC):
+    """Keeps login tokens by username so new clients can skip the login request.
+
+    `lock` guards a token refresh: the client that finds an expired token takes the lock, checks
+    whether somebody else already stored a new token and only logs in if not.
+    """
+
+    @abc.abstractmethod
+    def get(self, username: str) -> Optional[str]:
+        """Returns the stored token of username, or None."""
+
+    @abc.abstractmethod
+    def set(self, username: str, token: str) -> None:
+        """Stores the token of username."""
+
+    @abc.abstractmethod
+    def lock(self, username: str) -> ContextManager[None]:
+        """Returns a context manager that serializes the token refreshes of username."""
+
+class MemoryTokenStore(TokenStore):
+    """Shares tokens between clients of the same process."""
+
+    def __init__(self) -> None:
+        self._tokens: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def get(self, username: str) -> Optional[str]:
+        return self._tokens.get(username)
+
+    def set(self, username: str, token: str) -> None:
+        self._tokens[username] = token
+
+    @contextmanager
+    def lock(self, username: str) -> Iterator[None]:
+        with self._lock:
+            yield
+
+class FileTokenStore(TokenStore):
+    """Shares tokens between processes through a JSON file.
+
+    Refreshes are serialized with an exclusive lock on `<path>.lock` (flock on POSIX, msvcrt
+    locking on Windows). The file is replaced atomically, so readers never see a partial write.
+
+    Args:
+        path (str): The JSON file holding the tokens.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.expanduser(path)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def get(self, username: str) -> Optional[str]:
+        try:
+            with open(self.path) as f:
+                return json.load(f).get(username)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, username: str, token: str) -> None:
+        with self.lock(username):
+            try:
+                with open(self.path) as f:
+                    tokens = json.load(f)
+            except (OSError, ValueError):
+                tokens = {}
+            tokens[username] = token
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            # Only the owner may read the tokens
+            try:
+                with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                    json.dump(tokens, f)
+                os.replace(tmp, self.path)
+            except BaseException:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                raise
+
+    @contextmanager
+    def lock(self, username: str) -> Iterator[None]:
+        with self._lock:
+            if self._depth == 0:
+                self._file = open(self.path + ".lock", "a+")
+                if fcntl:
+                    fcntl.flock(self._file, fcntl.LOCK_EX)
+                else:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    if fcntl:
+                        fcntl.flock(self._file, fcntl.LOCK_UN)
+                    else:
+                        self._file.seek(0)
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+                    self._file.close()
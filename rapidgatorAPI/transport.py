@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+# requests is imported when the first request is sent
+if TYPE_CHECKING:
+    import requests
+
+Timeout = Union[None, float, Tuple[float, float]]
+
+@dataclasses.dataclass
+class Transport():
+    """Base class for the HTTP layer used by RapidgatorAPI.
+
+    A transport only has to know how to send a request and how to release its
+    resources. Subclass it to plug in a different HTTP stack.
+    """
+    timeout: Timeout = (10, 60)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends a request.
+
+        Args:
+            method (str): The HTTP method, e.g. 'GET' or 'POST'.
+            url (str): The absolute URL.
+            **kwargs: Passed on to requests (params, data, headers, stream, ...).
+
+        Returns:
+            requests.Response: The response
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Releases all connections held by the transport."""
+        pass
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+@dataclasses.dataclass
+class SimpleTransport(Transport):
+    """Opens a new connection for every request (the behaviour of plain `requests.get`/`requests.post`)."""
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        import requests
+        kwargs.setdefault("timeout", self.timeout)
+        return requests.request(method, url, **kwargs)
+
+@dataclasses.dataclass
+class PooledTransport(Transport):
+    """Keeps connections alive and reuses them across requests.
+
+    The transport can be shared between threads: every thread gets its own requests Session
+    (Sessions are not thread-safe), and all Sessions share one connection pool, so connections
+    opened by one thread are reused by the others.
+
+    Args:
+        timeout (float | Tuple[float, float]): Connect and read timeout in seconds. Default is (10, 60).
+        pool_connections (int): Number of hosts to keep a connection pool for. Default is 10.
+        pool_maxsize (int): Maximum number of connections kept per host. Default is 10.
+        pool_block (bool): If true, never open more than pool_maxsize connections to one host and wait for a free one instead. Default is false.
+    """
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+
+    def __post_init__(self) -> None:
+        self._adapter = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """The requests Session of the calling thread, created on first use."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            with self._lock:
+                if self._adapter is None:
+                    self._adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, pool_block=self.pool_block)
+                session = requests.Session()
+                session.mount("https://", self._adapter)
+                session.mount("http://", self._adapter)
+            self._local.session = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def close(self) -> None:
+        # Sessions only hold the shared adapter, so closing it closes every thread's connections
+        with self._lock:
+            if self._adapter is not None:
+                self._adapter.close()
+            self._adapter = None
+            self._local = threading.local()
@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+
+from .transport import Transport
+
+# FileUpload.state values
+UPLOAD_STATE_UPLOADING = 0
+UPLOAD_STATE_PROCESSING = 1
+UPLOAD_STATE_DONE = 2
+UPLOAD_STATE_FAIL = 3
+
+class UploadStream():
+    """A request body that streams a file from disk in fixed-size chunks.
+
+    The body has a known length, so it is sent with a Content-Length header instead of chunked
+    transfer encoding, and at most one chunk is held in memory at a time.
+
+    Args:
+        path (str): The file to send.
+        name (str): The file name announced in the multipart body.
+        chunk_size (int): Number of bytes read and sent per step.
+        multipart (bool): Wrap the file in a multipart/form-data body with the field 'file'. If false, the raw bytes are sent.
+        offset (int): First byte of the file to send. Default is 0.
+        length (int): Number of bytes to send. If not passed, everything from offset to the end of the file is sent.
+        on_chunk (Callable[[int], None]): Called with the number of file bytes after every chunk read for sending.
+    """
+
+    def __init__(self, path: str, name: str, chunk_size: int, multipart: bool = True, offset: int = 0, length: Optional[int] = None, on_chunk: Optional[Callable[[int], None]] = None) -> None:
+        self.path = path
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+        self.offset = offset
+        self.length = os.path.getsize(path) - offset if length is None else length
+        if multipart:
+            boundary = uuid.uuid4().hex
+            self.content_type = f"multipart/form-data; boundary={boundary}"
+            filename = name.replace('"', "%22")
+            self.preamble = f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\nContent-Type: application/octet-stream\r\n\r\n'.encode()
+            self.epilogue = f"\r\n--{boundary}--\r\n".encode()
+        else:
+            self.content_type = "application/octet-stream"
+            self.preamble = b""
+            self.epilogue = b""
+
+    def __len__(self) -> int:
+        return len(self.preamble) + self.length + len(self.epilogue)
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self.preamble:
+            yield self.preamble
+        remaining = self.length
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            while remaining > 0:
+                chunk = f.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    raise IOError(f"{self.path} is shorter than expected")
+                remaining -= len(chunk)
+                if self.on_chunk:
+                    self.on_chunk(len(chunk))
+                yield chunk
+        if self.epilogue:
+            yield self.epilogue
+
+    @property
+    def headers(self) -> dict:
+        return {"Content-Type": self.content_type, "Content-Length": str(len(self))}
+
+class UploadProgress():
+    """Adds up the bytes sent by several upload streams and reports the total.
+
+    Args:
+        total (int): The file size.
+        callback (Callable[[int, int], None]): Called with (bytes sent, total) after every chunk.
+    """
+
+    def __init__(self, total: int, callback: Optional[Callable[[int, int], None]] = None) -> None:
+        self.total = total
+        self.callback = callback
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def add(self, nbytes: int) -> None:
+        with self._lock:
+            self.sent += nbytes
+            sent = self.sent
+        if self.callback:
+            self.callback(sent, self.total)
+
+def upload_parts(transport: Transport, url: str, path: str, name: str, size: int, pipes: int, part_size: int, chunk_size: int, multipart: bool = True, progress: Optional[UploadProgress] = None, retries: int = 3) -> None:
+    """Uploads a file as byte ranges over several concurrent connections.
+
+    Every part is sent as its own request with a 'Content-Range: bytes start-end/size' header.
+    A failed part is sent again up to `retries` times with exponential backoff; the other parts
+    are not affected.
+
+    Args:
+        transport (Transport): The transport used for the part requests.
+        url (str): The upload URL of the session.
+        path (str): The local file path.
+        name (str): The remote file name.
+        size (int): The file size.
+        pipes (int): Maximum number of parts in flight at the same time.
+        part_size (int): Number of bytes per part.
+        chunk_size (int): Number of bytes read from disk and sent per step.
+        multipart (bool): Wrap every part in a multipart/form-data body. Default is true.
+        progress (UploadProgress): Receives the bytes sent.
+        retries (int): How often a failed part is sent again. Default is 3.
+
+    Raises:
+        requests.HTTPError: e.g. if a part still fails after all retries
+    """
+    def send_part(offset: int) -> None:
+        length = min(part_size, size - offset)
+        for attempt in range(retries + 1):
+            sent = 0
+            def on_chunk(nbytes: int) -> None:
+                nonlocal sent
+                sent += nbytes
+                if progress:
+                    progress.add(nbytes)
+            stream = UploadStream(path, name, chunk_size, multipart, offset, length, on_chunk)
+            headers = dict(stream.headers)
+            headers["Content-Range"] = f"bytes {offset}-{offset + length - 1}/{size}"
+            try:
+                r = transport.request("POST", url, data=stream, headers=headers)
+                r.raise_for_status()
+                return
+            except Exception:
+                if progress:
+                    progress.add(-sent)
+                if attempt == retries:
+                    raise
+                time.sleep(0.5 * 2 ** attempt)
+
+    with ThreadPoolExecutor(max_workers=pipes) as executor:
+        # list() re-raises the first part that failed for good
+        list(executor.map(send_part, range(0, size, part_size)))
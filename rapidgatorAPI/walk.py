@@ -0,0 +1,58 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, List, Tuple, Union
+
+from classes.File import File
+from classes.FileColumns import FileColumns
+from classes.Folder import Folder
+
+from .pagination import iter_pages
+
+def walk(api, folder_id: str = None, workers: int = 8, per_page: int = 500, columnar: bool = False) -> Iterator[Tuple[Folder, List[Folder], Union[List[File], FileColumns]]]:
+    """Walks a folder tree like os.walk, listing up to `workers` folders at the same time.
+
+    Every folder is listed with all pages of folder_content. A folder is yielded as soon as its
+    listing is complete, so the order is breadth-first but not deterministic. Like os.walk in
+    top-down mode, removing entries from the yielded sub folder list prunes them from the walk.
+
+    Args:
+        api (RapidgatorAPI): The client used for the folder_content requests.
+        folder_id (str): The key that identifies the top folder. If the folder_id is not passed, the root folder is walked.
+        workers (int): Maximum number of folder listings in flight. Default is 8.
+        per_page (int): Number of files per page. Default is 500.
+        columnar (bool): Collect the files of each folder in a FileColumns container instead of a list of File objects. Default is false.
+
+    Raises:
+        APIError: e.g. if a folder is not found
+
+    Returns:
+        Iterator[Tuple[Folder, List[Folder], Union[List[File], FileColumns]]]: (folder, sub folders, files) for every folder
+    """
+    def list_folder(folder_id: str) -> Tuple[Folder, List[Folder], Union[List[File], FileColumns]]:
+        if columnar:
+            folder, columns = None, FileColumns()
+            for page in iter_pages(lambda number: api.folder_content_columns(columns, folder_id, number, per_page), prefetch=False):
+                folder = folder or page
+            return folder, folder.folders or [], columns
+        folder, files = None, []
+        for page in iter_pages(lambda number: api.folder_content(folder_id, number, per_page), prefetch=False):
+            folder = folder or page
+            files.extend(page.files or [])
+        folder.files = files
+        return folder, folder.folders or [], files
+
+    pending = deque([folder_id])
+    running = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            while pending or running:
+                while pending and len(running) < workers:
+                    running.add(executor.submit(list_folder, pending.popleft()))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder, subfolders, files = future.result()
+                    yield folder, subfolders, files
+                    pending.extend(subfolder.folder_id for subfolder in subfolders)
+        finally:
+            for future in running:
+                future.cancel()
@@ -8,8 +8,13 @@ setup(
     author_email='henrydatei@web.de',
     url='https://github.com/henrydatei/rapidgatorAPI',
     packages=['rapidgatorAPI'],
+    python_requires='>=3.10',
     install_requires=[
         "requests",
-        "dacite"
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "fast": ["orjson"],
+        "otel": ["opentelemetry-api"],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.accounts import AccountPool
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+
+class TestAccountPool(unittest.TestCase):
+    def setUp(self):
+        # One fake server per account; files added in the same order get the same ids everywhere
+        self.servers = [FakeRapidgatorServer().start() for _ in range(3)]
+        for server, traffic in zip(self.servers, (3000, 10000, 5000)):
+            server.traffic_left = traffic
+            server.storage_left = 13000 - traffic
+            self.file_ids = [server.add_file(f"file{i}", bytes([i]) * 1000) for i in range(8)]
+        self.pool = AccountPool([RapidgatorAPI(f"user{i}", "password", base_url=server.base_url) for i, server in enumerate(self.servers)], refresh_interval=3600)
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.pool.close()
+        for server in self.servers:
+            server.stop()
+        self.tmp.cleanup()
+
+    def test_downloads_follow_traffic_headroom(self):
+        self.pool.download_files(self.file_ids, self.tmp.name, workers=1)
+        # Every download goes to the account with the most traffic left at that moment
+        self.assertEqual([server.bytes_served for server in self.servers], [0, 7000, 1000])
+        self.assertEqual([quota.traffic_left for quota in self.pool.quotas()], [3000, 3000, 4000])
+        # Between refreshes the quota is only read once per account
+        self.assertEqual([server.calls["user/info"] for server in self.servers], [1, 1, 1])
+
+    def test_uploads_follow_storage_headroom(self):
+        paths = []
+        for i in range(3):
+            paths.append(os.path.join(self.tmp.name, f"upload{i}.bin"))
+            with open(paths[-1], "wb") as f:
+                f.write(os.urandom(2000))
+        report = self.pool.upload_files(paths, workers=1, poll_interval=0.01)
+        self.assertEqual([api.username for api, _ in report.done.values()], ["user0", "user0", "user2"])
+        self.assertEqual(report.failed, {})
+        self.assertEqual([quota.storage_left for quota in self.pool.quotas()], [6000, 3000, 6000])
+
+    def test_concurrent_downloads_spread_over_accounts(self):
+        self.pool.download_files(self.file_ids, self.tmp.name, workers=4)
+        self.assertEqual(sum(server.bytes_served for server in self.servers), 8000)
+        self.assertEqual(self.servers[0].bytes_served, 0)
+        self.assertEqual([quota.traffic_reserved for quota in self.pool.quotas()], [0, 0, 0])
+
+    def test_accounts_with_their_own_ids(self):
+        # The same id names a different file on every account
+        file_ids = [server.add_file(f"own{i}", bytes([i]) * 500 * (i + 1)) for i, server in enumerate(self.servers)]
+        self.assertEqual(len(set(file_ids)), 1)
+        path = self.pool.download_file(file_ids[0], self.tmp.name, api=self.pool.accounts[0].api)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), bytes([0]) * 500)
+        self.assertEqual([server.bytes_served for server in self.servers], [500, 0, 0])
+        # Without an owner, the account with the most traffic looks the file up and downloads it
+        path = self.pool.download_file(file_ids[1], self.tmp.name)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), bytes([1]) * 1000)
+        self.assertEqual([server.bytes_served for server in self.servers], [500, 1000, 0])
+        self.assertEqual(self.servers[2].calls["file/info"], 0)
+        self.assertEqual([quota.traffic_left for quota in self.pool.quotas()], [2500, 9000, 5000])
+
+    def test_failed_downloads_keep_the_others(self):
+        report = self.pool.download_files(self.file_ids[:3] + ["missing"], self.tmp.name, workers=2)
+        self.assertEqual(sorted(report.done), sorted(self.file_ids[:3]))
+        self.assertTrue(all(os.path.exists(path) for path in report.done.values()))
+        self.assertEqual(list(report.failed), ["missing"])
+        self.assertEqual(sum(server.bytes_served for server in self.servers), 3000)
+
+    def test_unreachable_account_is_skipped(self):
+        self.servers[1].stop()
+        self.pool.download_file(self.file_ids[0], self.tmp.name)
+        # user1 has the most traffic, but its server is gone
+        self.assertEqual(self.pool.quotas()[1].traffic_left, 0)
+        self.assertEqual(self.servers[2].bytes_served, 1000)
+
+    def test_refresh_replaces_local_counts(self):
+        self.pool.refresh()
+        self.servers[0].traffic_left = 20000
+        self.pool.refresh(force=True)
+        self.assertEqual(self.pool.quotas()[0].traffic_left, 20000)
+
+    def test_no_account_with_enough_quota(self):
+        self.pool.reserve = 9500
+        with self.assertRaises(ValueError):
+            self.pool.download_file(self.file_ids[0], self.tmp.name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+import unittest
+from classes.APIError import APIError
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.async_rapidgator import AsyncRapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.tokens import MemoryTokenStore
+
+class TestAsyncRapidgatorAPI(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeRapidgatorServer().start()
+        cls.folder_id = cls.server.add_folder("async")
+        cls.file_ids = [cls.server.add_file(f"file{i}.bin", bytes(i), cls.folder_id) for i in range(50)]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_matches_sync_client(self):
+        async def run():
+            async with AsyncRapidgatorAPI("user", "password", base_url=self.server.base_url) as rg:
+                return await rg.info(), await rg.folder_content(self.folder_id, per_page=10)
+        user, (folder, pager) = asyncio.run(run())
+        with RapidgatorAPI("user", "password", base_url=self.server.base_url) as rg:
+            self.assertEqual(user, rg.info())
+            self.assertEqual((folder, pager), rg.folder_content(self.folder_id, per_page=10))
+
+    def test_concurrent_requests(self):
+        async def run():
+            async with AsyncRapidgatorAPI("user", "password", base_url=self.server.base_url, max_concurrency=8) as rg:
+                return await asyncio.gather(*(rg.file_info(file_id) for file_id in self.file_ids))
+        files = asyncio.run(run())
+        self.assertEqual([file.file_id for file in files], self.file_ids)
+
+    def test_token_store_lock_does_not_block_the_loop(self):
+        store, locked = MemoryTokenStore(), threading.Event()
+        def hold():
+            with store.lock("user"):
+                locked.set()
+                time.sleep(0.3)
+        threading.Thread(target=hold).start()
+        locked.wait()
+        async def run():
+            rg = AsyncRapidgatorAPI("user", "password", base_url=self.server.base_url, token_store=store)
+            login = asyncio.ensure_future(rg.login())
+            ticks = 0
+            while not login.done():
+                await asyncio.sleep(0.01)
+                ticks += 1
+            await login
+            await rg.close()
+            return ticks, rg.token
+        ticks, token = asyncio.run(run())
+        # Other coroutines kept running while the login waited for the store
+        self.assertGreater(ticks, 10)
+        self.assertEqual(store.get("user"), token)
+
+    def test_error_status_raises(self):
+        async def run():
+            async with AsyncRapidgatorAPI("user", "password", base_url=self.server.base_url) as rg:
+                await rg.file_info("missing")
+        with self.assertRaises(APIError) as context:
+            asyncio.run(run())
+        self.assertEqual(context.exception.status, 404)
+
+    def test_body_that_is_not_an_api_response(self):
+        async def run():
+            async with AsyncRapidgatorAPI("user", "password", base_url=self.server.base_url) as rg:
+                self.server.inject_raw("file/info", b'["not", "a", "response"]')
+                await rg.file_info(self.file_ids[0])
+        with self.assertRaises(APIError) as context:
+            asyncio.run(run())
+        self.assertEqual(context.exception.status, 200)
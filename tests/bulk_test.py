@@ -0,0 +1,81 @@
+import unittest
+import requests
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.bulk import bulk_apply
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRapidgatorServer().start()
+        self.rg = RapidgatorAPI("user", "password", base_url=self.server.base_url)
+        self.rg.login()
+        self.source = self.server.add_folder("source")
+        self.dest = self.server.add_folder("dest")
+        self.file_ids = [self.server.add_file(f"file{i}", bytes(i), self.source) for i in range(25)]
+
+    def tearDown(self):
+        self.rg.close()
+        self.server.stop()
+
+    def test_files_move(self):
+        requests = self.server.requests
+        report = self.rg.files_move(self.file_ids, self.dest, batch_size=10)
+        self.assertEqual(sorted(report.succeeded), sorted(self.file_ids))
+        self.assertEqual(self.server.requests - requests, 3)
+        self.assertTrue(all(self.server.files[file_id]["folder_id"] == self.dest for file_id in self.file_ids))
+
+    def test_failures_are_reported_per_item(self):
+        report = self.rg.files_delete(self.file_ids[:5] + ["missing1", "missing2"], batch_size=10)
+        self.assertEqual(sorted(report.succeeded), sorted(self.file_ids[:5]))
+        self.assertEqual(sorted(item.item_id for item in report.failed), ["missing1", "missing2"])
+        self.assertEqual(len(self.server.trash), 5)
+
+    def test_errors_name_whole_ids(self):
+        # The error for the missing id contains the existing id as a substring
+        report = self.rg.files_delete([self.file_ids[0], self.file_ids[0] + "0"])
+        self.assertEqual(report.succeeded, [self.file_ids[0]])
+        self.assertEqual([item.item_id for item in report.failed], [self.file_ids[0] + "0"])
+
+    def test_unexpected_exception_fails_the_batch(self):
+        batches = []
+        def operation(ids):
+            batches.append(ids)
+            raise ValueError("invalid response")
+        report = bulk_apply(operation, self.file_ids[:5], batch_size=10)
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(report.failed), 5)
+        self.assertTrue(all(item.error == "invalid response" for item in report.failed))
+
+    def test_connection_lost_after_sending(self):
+        self.server.drop_connection("file/copy")
+        report = self.rg.files_copy(self.file_ids[:5], self.dest, batch_size=10)
+        # The server copied the batch, so its ids are not sent again
+        self.assertEqual(len(report.failed), 5)
+        self.assertEqual(self.server.calls["file/copy"], 1)
+        self.assertEqual(sum(file["folder_id"] == self.dest for file in self.server.files.values()), 5)
+
+    def test_connection_refused_resends_ids(self):
+        batches = []
+        def operation(ids):
+            batches.append(ids)
+            if "," in ids:
+                # Nothing listens on port 1, so the batch never reaches a server
+                requests.post("http://127.0.0.1:1/")
+            return {"result": {"success": 1, "fail": 0, "errors": []}}
+        report = bulk_apply(operation, self.file_ids[:3], batch_size=10)
+        self.assertEqual(sorted(report.succeeded), sorted(self.file_ids[:3]))
+        self.assertEqual(len(batches), 4)
+
+    def test_files_rename(self):
+        report = self.rg.files_rename({self.file_ids[0]: "a", self.file_ids[1]: "b", "missing": "c"})
+        self.assertEqual(sorted(report.succeeded), sorted(self.file_ids[:2]))
+        self.assertEqual(self.server.files[self.file_ids[1]]["name"], "b")
+        self.assertEqual(len(report.failed), 1)
+
+    def test_folders(self):
+        report = self.rg.folders_copy([self.source], self.dest)
+        self.assertEqual(report.succeeded, [self.source])
+        self.assertEqual(len(self.server.files), 50)
+        report = self.rg.folders_delete([self.source, self.dest])
+        self.assertEqual(len(report.succeeded), 2)
+        self.assertEqual(len(self.server.files), 0)
@@ -0,0 +1,77 @@
+import time
+import unittest
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.cache import ResponseCache
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRapidgatorServer().start()
+        self.rg = RapidgatorAPI("user", "password", base_url=self.server.base_url, cache=ResponseCache())
+        self.rg.login()
+        self.source = self.server.add_folder("source")
+        self.dest = self.server.add_folder("dest")
+        self.file_id = self.server.add_file("file.bin", b"data", self.source)
+
+    def tearDown(self):
+        self.rg.close()
+        self.server.stop()
+
+    def test_reads_are_cached(self):
+        requests = self.server.requests
+        for _ in range(5):
+            self.assertEqual(self.rg.info().email, "user@example.com")
+            self.assertEqual(self.rg.file_info(self.file_id).name, "file.bin")
+        self.assertEqual(self.server.requests - requests, 2)
+        self.assertEqual(self.rg.cache.hits, 8)
+
+    def test_mutation_invalidates(self):
+        self.rg.file_info(self.file_id)
+        self.rg.folder_content(self.source)
+        self.rg.folder_content(self.dest)
+        self.rg.file_rename(self.file_id, "renamed.bin")
+        self.assertEqual(self.rg.file_info(self.file_id).name, "renamed.bin")
+        self.rg.file_move(self.file_id, self.dest)
+        self.assertEqual(self.rg.folder_content(self.source)[0].files, [])
+        self.assertEqual(len(self.rg.folder_content(self.dest)[0].files), 1)
+
+    def test_mutation_invalidates_link_checks(self):
+        url = self.server.files[self.file_id]["url"]
+        self.assertEqual(self.rg.file_check_link(url)[0].filename, "file.bin")
+        self.rg.file_rename(self.file_id, "renamed.bin")
+        self.assertEqual(self.rg.file_check_link(url)[0].filename, "renamed.bin")
+        self.rg.file_delete(self.file_id)
+        self.assertEqual(self.rg.file_check_link(url)[0].status, "NO_ACCESS")
+        self.assertEqual(self.server.calls["file/check_link"], 3)
+        self.rg.file_check_link(url)
+        self.rg.trashcan_empty()
+        self.rg.file_check_link(url)
+        self.assertEqual(self.server.calls["file/check_link"], 4)
+
+    def test_read_that_overlaps_a_mutation_is_not_stored(self):
+        cache = ResponseCache()
+        file = {"file": {"file_id": "f1", "name": "old.bin"}}
+        generation = cache.generation
+        # The rename is applied while the file_info request is on its way back
+        cache.update("file/rename", {"file_id": "f1", "name": "new.bin"}, {"file": {}})
+        cache.update("file/info", {"file_id": "f1"}, file, generation)
+        self.assertFalse(cache.get("file/info", {"file_id": "f1"})[0])
+        # Other ids and reads sent after the mutation are stored
+        cache.update("file/info", {"file_id": "f2"}, {"file": {"file_id": "f2"}}, generation)
+        cache.update("file/info", {"file_id": "f1"}, file, cache.generation)
+        self.assertTrue(cache.get("file/info", {"file_id": "f1"})[0])
+        self.assertTrue(cache.get("file/info", {"file_id": "f2"})[0])
+        generation = cache.generation
+        cache.clear()
+        cache.update("file/info", {"file_id": "f2"}, {"file": {"file_id": "f2"}}, generation)
+        self.assertEqual(len(cache), 0)
+
+    def test_ttl_and_lru(self):
+        cache = ResponseCache(ttls={"file/info": 0.05}, max_entries=2)
+        for i in range(3):
+            cache.update("file/info", {"file_id": str(i)}, {"file": {}})
+        self.assertEqual(len(cache), 2)
+        self.assertFalse(cache.get("file/info", {"file_id": "0"})[0])
+        self.assertTrue(cache.get("file/info", {"file_id": "2"})[0])
+        time.sleep(0.06)
+        self.assertFalse(cache.get("file/info", {"file_id": "2"})[0])
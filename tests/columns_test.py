@@ -0,0 +1,46 @@
+import unittest
+from classes.File import File
+from classes.FileColumns import FileColumns
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+
+class TestFileColumns(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeRapidgatorServer().start()
+        cls.rg = RapidgatorAPI("user", "password", base_url=cls.server.base_url)
+        cls.top = cls.server.add_folder("top")
+        for i in range(5):
+            cls.server.add_file(f"file{i}", bytes(i), cls.top)
+        for i in range(3):
+            child = cls.server.add_folder(f"child{i}", cls.top)
+            for j in range(4):
+                cls.server.add_file(f"file{j}", bytes(j), child)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rg.close()
+        cls.server.stop()
+
+    def test_round_trip(self):
+        columns = FileColumns()
+        files = [File("a.bin", 3, "0123456789abcdef0123456789abcdef", 1, "f1", 0, "Public", "d1", "https://rapidgator.net/file/f1", 1700000000), File(file_id="f2")]
+        for file in files:
+            columns.add(file)
+        self.assertEqual(list(columns), files)
+        self.assertEqual(columns[-1], files[1])
+        self.assertEqual(columns.total_size, 3)
+        self.assertFalse(hasattr(files[0], "__dict__"))
+
+    def test_malformed_hashes(self):
+        columns = FileColumns()
+        columns.extend([{"file_id": "f1", "hash": "abcd"}, {"file_id": "f2", "hash": "not a hash"}, {"file_id": "f3", "hash": "0123456789abcdef0123456789abcdef"}])
+        self.assertEqual(len(columns.hashes), 3 * 16)
+        self.assertEqual([file.hash for file in columns], [None, None, "0123456789abcdef0123456789abcdef"])
+
+    def test_listing(self):
+        columns = self.rg.file_columns(self.top, per_page=2)
+        self.assertEqual(list(columns), list(self.rg.iter_folder_files(self.top, per_page=2)))
+        everything = self.rg.file_columns(self.top, recursive=True, workers=2, per_page=3)
+        self.assertEqual(len(everything), 5 + 3 * 4)
+        self.assertEqual(everything.total_size, sum(range(5)) + 3 * sum(range(4)))
@@ -0,0 +1,25 @@
+import unittest
+from classes.File import File
+from classes.Folder import Folder
+from classes.User import User
+from rapidgatorAPI.decoding import decoder, loads, model
+
+FILE = {"file_id": "f1", "name": "a.bin", "size": 3, "hash": "abc", "url": "https://rapidgator.net/file/f1", "unknown": 1}
+
+class TestDecoding(unittest.TestCase):
+    def test_nested_and_recursive(self):
+        child = {"folder_id": "d2", "mode": 0, "mode_label": "Public", "parent_folder_id": "d1", "name": "child", "url": "", "nb_folders": 0, "nb_files": 0, "created": 0, "size_files": 0}
+        folder = decoder(Folder)(dict(child, folder_id="d1", parent_folder_id=None, folders=[child], files=[FILE]))
+        self.assertEqual(folder.folders[0], Folder(**child))
+        self.assertEqual(folder.files, [File(name="a.bin", size=3, hash="abc", file_id="f1", url="https://rapidgator.net/file/f1")])
+        self.assertIsNone(decoder(Folder)(child).files)
+
+    def test_user(self):
+        user = model("User")(loads(b'{"email": "a@b.c", "is_premium": true, "state": 1, "state_label": "Active", "traffic": {"total": "1", "left": 1}, "storage": {}, '
+                                   b'"upload": {"max_file_size": 5, "nb_pipes": 4}, "remote_upload": {"max_nb_jobs": 10, "refresh_time": 5}}'))
+        self.assertIsInstance(user, User)
+        self.assertEqual((user.traffic.left, user.storage.total, user.upload.nb_pipes), (1, None, 4))
+
+    def test_missing_field(self):
+        with self.assertRaises(ValueError):
+            model("Pager")({"current": 1})
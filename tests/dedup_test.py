@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import requests
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.dedup import upload_files
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+
+class TestDedup(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRapidgatorServer().start()
+        self.rg = RapidgatorAPI("user", "password", base_url=self.server.base_url)
+        self.directory = tempfile.TemporaryDirectory()
+        self.folder = self.server.add_folder("mirror")
+
+    def tearDown(self):
+        self.rg.close()
+        self.server.stop()
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_upload_files(self):
+        self.server.add_file("elsewhere.bin", b"k" * 500)
+        known = self.write("known.bin", b"k" * 500)
+        new = self.write("new.bin", b"n" * 300)
+        copy = self.write("copy.bin", b"n" * 300)
+        report = upload_files(self.rg, [known, new, copy], self.folder, poll_interval=0.01)
+        self.assertEqual(report.uploaded, [new])
+        self.assertEqual(sorted(report.copied), sorted([known, copy]))
+        self.assertEqual((report.bytes_uploaded, report.bytes_saved), (300, 800))
+        self.assertEqual(self.server.calls["file/upload"], 1)
+        self.assertEqual(sorted(file["name"] for file in self.server.files.values() if file["folder_id"] == self.folder), ["copy.bin", "known.bin", "new.bin"])
+
+    def test_empty_file_is_uploaded(self):
+        empty = self.write("empty.bin", b"")
+        report = upload_files(self.rg, [empty], self.folder, poll_interval=0.01)
+        self.assertEqual((report.uploaded, report.copied), ([empty], []))
+        self.assertEqual((report.bytes_uploaded, report.bytes_saved), (0, 0))
+
+    def test_hashcopy_files(self):
+        self.server.add_file("a.bin", b"aaaa")
+        report = self.rg.hashcopy_files({"a.bin": "74b87337454200d4d33f80c4663dc5e5", "b.bin": "0" * 32}, self.folder)
+        self.assertEqual((report.copied, report.missing, report.bytes_saved), (["a.bin"], ["b.bin"], 4))
+
+    def test_hashcopy_connection_error(self):
+        self.server.add_file("a.bin", b"aaaa")
+        hashcopy = self.rg.file_hashcopy
+        def flaky(hash, folder_id, name):
+            if name == "b.bin":
+                raise requests.ConnectionError("connection reset")
+            return hashcopy(hash, folder_id, name)
+        with mock.patch.object(self.rg, "file_hashcopy", side_effect=flaky):
+            report = self.rg.hashcopy_files({"a.bin": "74b87337454200d4d33f80c4663dc5e5", "b.bin": "74b87337454200d4d33f80c4663dc5e5"}, self.folder)
+        self.assertEqual(report.copied, ["a.bin"])
+        self.assertEqual(report.failed, {"b.bin": "connection reset"})
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+
+class Interrupted(Exception):
+    pass
+
+class TestDownload(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeRapidgatorServer().start()
+        cls.rg = RapidgatorAPI("user", "password", base_url=cls.server.base_url)
+        cls.content = os.urandom(1_000_000)
+        cls.file_id = cls.server.add_file("download.bin", cls.content)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rg.close()
+        cls.server.stop()
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.server.bytes_served = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_download_file(self):
+        path = self.rg.download_file(self.file_id, self.directory.name, segments=4, min_segment_size=100_000, chunk_size=8192)
+        self.assertEqual(os.path.basename(path), "download.bin")
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertFalse(os.path.exists(path + ".rgdownload"))
+
+    def test_download_file_resumes(self):
+        path = os.path.join(self.directory.name, "resumed.bin")
+        def interrupt(done, total):
+            if done >= total // 2:
+                raise Interrupted()
+        with self.assertRaises(Interrupted):
+            self.rg.download_file(self.file_id, path, segments=1, chunk_size=8192, progress=interrupt)
+        self.assertTrue(os.path.exists(path + ".rgdownload"))
+        first = self.server.bytes_served
+        self.rg.download_file(self.file_id, path, segments=1, chunk_size=8192)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.content)
+        self.assertLess(self.server.bytes_served - first, len(self.content) // 2 + 8192)
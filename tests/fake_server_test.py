@@ -0,0 +1,86 @@
+import os
+import tempfile
+import time
+import unittest
+from classes.APIError import APIError
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.scheduler import RequestScheduler
+
+class TestFakeServer(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRapidgatorServer().start()
+        self.rg = RapidgatorAPI("user", "password", base_url=self.server.base_url, scheduler=RequestScheduler(retries=0))
+        self.rg.login()
+
+    def tearDown(self):
+        self.rg.close()
+        self.server.stop()
+
+    def test_add_tree(self):
+        top = self.server.add_tree(depth=2, folders_per_folder=3, files_per_folder=4, file_size=10)
+        folders = list(self.rg.walk(top))
+        self.assertEqual(len(folders), 1 + 3 + 9)
+        files = [file for _, _, files in folders for file in files]
+        self.assertEqual(len(files), 13 * 4)
+        self.assertEqual({file.size for file in files}, {10})
+        self.assertEqual(len({file.hash for file in files}), len(files))
+
+    def test_indexes_follow_moves(self):
+        source, dest = self.server.add_folder("source"), self.server.add_folder("dest")
+        file_id = self.server.add_file("a", b"a", source)
+        self.assertEqual(self.rg.folder_info(source).nb_files, 1)
+        self.rg.file_move(file_id, dest)
+        self.assertEqual(self.rg.folder_info(source).nb_files, 0)
+        self.assertEqual(self.rg.folder_info(dest).nb_files, 1)
+
+    def test_inject_error(self):
+        self.server.inject_error("user/info", status=500, count=2)
+        for _ in range(2):
+            with self.assertRaises(APIError) as cm:
+                self.rg.info()
+            self.assertEqual(cm.exception.status, 500)
+        self.assertTrue(self.rg.info().is_premium)
+
+    def test_error_rate(self):
+        self.server.error_rate = 0.5
+        failures = 0
+        for _ in range(40):
+            try:
+                self.rg.info()
+            except APIError:
+                failures += 1
+        self.assertTrue(5 < failures < 35)
+
+    def test_latency(self):
+        self.server.latency = 0.05
+        start = time.monotonic()
+        self.rg.info()
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_bandwidth(self):
+        file_id = self.server.add_file("big.bin", bytes(256 << 10))
+        self.server.bandwidth = 1 << 20
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.monotonic()
+            self.rg.download_file(file_id, os.path.join(tmp, "big.bin"), segments=1)
+            self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_new_routes(self):
+        folder_id = self.server.add_folder("old")
+        file_id = self.server.add_file("a", b"a", folder_id)
+        self.assertEqual(self.rg.folder_rename(folder_id, "new").name, "new")
+        self.assertEqual(self.rg.file_change_mode(file_id, 2).mode_label, "Private")
+        copy = self.rg.file_xcopy(self.server.files[file_id]["url"], self.server.root_folder_id)
+        self.assertEqual(copy.hash, self.server.files[file_id]["hash"])
+        link = self.rg.file_onetimelink_create(file_id)
+        self.assertEqual([found.link_id for found in self.rg.file_onetimelink_info(link.link_id)], [link.link_id])
+        self.rg.file_delete(file_id)
+        self.rg.file_delete(copy.file_id)
+        self.rg.trashcan_restore(file_id)
+        self.assertIn(file_id, self.server.files)
+        self.rg.trashcan_empty()
+        self.assertEqual(self.server.trash, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest import mock
+from rapidgatorAPI import hashing
+from rapidgatorAPI.hashing import HashCache, file_md5, hash_files
+
+class TestHashing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.contents = {os.path.join(self.directory.name, f"file{i}"): os.urandom(i * 1000) for i in range(8)}
+        for path, content in self.contents.items():
+            with open(path, "wb") as f:
+                f.write(content)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_file_md5(self):
+        path = os.path.join(self.directory.name, "file7")
+        expected = hashlib.md5(self.contents[path]).hexdigest()
+        self.assertEqual(file_md5(path, buffer_size=1024), expected)
+        with mock.patch.object(hashing, "MMAP_THRESHOLD", 1):
+            self.assertEqual(file_md5(path, buffer_size=1024), expected)
+
+    def test_hash_files_in_processes_with_cache(self):
+        expected = {path: hashlib.md5(content).hexdigest() for path, content in self.contents.items()}
+        with HashCache(os.path.join(self.directory.name, "hashes.db")) as cache:
+            self.assertEqual(hash_files(self.contents, workers=2, cache=cache), expected)
+            self.assertEqual(cache.misses, 8)
+        renamed = os.path.join(self.directory.name, "renamed")
+        os.rename(os.path.join(self.directory.name, "file3"), renamed)
+        with HashCache(os.path.join(self.directory.name, "hashes.db")) as cache:
+            with mock.patch.object(hashing, "file_md5", side_effect=AssertionError("file read again")):
+                self.assertEqual(cache.md5(renamed), expected[os.path.join(self.directory.name, "file3")])
+            self.assertEqual(cache.hits, 1)
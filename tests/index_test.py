@@ -0,0 +1,60 @@
+import unittest
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.index import FolderIndex
+
+class TestFolderIndex(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRapidgatorServer().start()
+        self.rg = RapidgatorAPI("user", "password", base_url=self.server.base_url)
+        self.index = FolderIndex(":memory:", self.rg)
+        self.photos = self.server.add_folder("photos")
+        self.year = self.server.add_folder("2023", self.photos)
+        self.music = self.server.add_folder("music")
+        self.server.add_file("a.jpg", b"aaaa", self.year)
+        self.server.add_file("b.jpg", b"bb", self.year)
+        self.song = self.server.add_file("song.mp3", b"song", self.music)
+
+    def tearDown(self):
+        self.index.close()
+        self.rg.close()
+        self.server.stop()
+
+    def test_lookups(self):
+        self.assertEqual(self.index.sync(per_page=1), 4)
+        self.assertEqual(self.index.folder_by_path("/photos/2023").folder_id, self.year)
+        self.assertEqual(self.index.path(self.music), "/music")
+        self.assertEqual(self.index.file(self.song).name, "song.mp3")
+        self.assertEqual([file.file_id for file in self.index.files_by_hash(self.server.files[self.song]["hash"])], [self.song])
+        self.assertEqual(len(self.index.files_by_name("a.jpg")), 1)
+        self.assertEqual(self.index.folder_size(self.photos), 6)
+        self.assertEqual(self.index.folder_size(self.photos, recursive=False), 0)
+
+    def test_incremental_sync(self):
+        self.index.sync()
+        calls = self.server.calls["folder/info"]
+        self.assertEqual(self.index.sync(), 0)
+        # One folder_info per folder: root, photos, 2023 and music
+        self.assertEqual(self.server.calls["folder/info"] - calls, 4)
+        self.server.add_file("c.jpg", b"c", self.year)
+        self.assertEqual(self.index.sync(), 1)
+        self.assertEqual(len(self.index.files_in_folder(self.year)), 3)
+
+    def test_removed_folder(self):
+        self.index.sync()
+        del self.server.folders[self.music]
+        del self.server.files[self.song]
+        self.index.sync()
+        self.assertIsNone(self.index.folder(self.music))
+        self.assertIsNone(self.index.file(self.song))
+
+    def test_sync_nested_folder(self):
+        vacation = self.server.add_folder("vacation", self.year)
+        self.server.add_file("c.jpg", b"c", vacation)
+        self.assertEqual(self.index.sync(vacation), 1)
+        self.assertEqual(self.index.path(vacation), "/photos/2023/vacation")
+        self.assertEqual(self.index.folder_by_path("/photos/2023/vacation").folder_id, vacation)
+        # Once the parent is indexed, its path is used
+        self.index.sync(self.year)
+        self.assertEqual(self.index.path(self.year), "/photos/2023")
+        self.assertEqual(self.index.path(vacation), "/photos/2023/vacation")
@@ -0,0 +1,39 @@
+import unittest
+from classes.APIError import APIError
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+
+class TestCheckLinks(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeRapidgatorServer().start()
+        cls.rg = RapidgatorAPI("user", "password", base_url=cls.server.base_url)
+        cls.rg.login()
+        cls.urls = [cls.server.files[cls.server.add_file(f"file{i}", bytes(i))]["url"] for i in range(120)]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rg.close()
+        cls.server.stop()
+
+    def test_check_links(self):
+        dead = [f"https://rapidgator.net/file/dead{i}" for i in range(30)]
+        urls = self.urls + dead + self.urls[:10]
+        results = list(self.rg.check_links(urls, batch_size=100, workers=3))
+        self.assertEqual(sorted(result.url for result in results), sorted(self.urls + dead))
+        self.assertEqual(sum(result.status == "NO_ACCESS" for result in results), 30)
+
+    def test_batch_size_adapts(self):
+        requests = self.server.requests
+        results = list(self.rg.check_links(self.urls, batch_size=100, workers=1))
+        self.assertEqual(len(results), 120)
+        # 100 rejected, 2 x 50 rejected, 4 x 25, then the remaining 20 links in one batch of 25
+        self.assertEqual(self.server.requests - requests, 1 + 2 + 4 + 1)
+
+    def test_other_errors_do_not_split(self):
+        requests = self.server.requests
+        self.server.inject_error("file/check_link", 400, details="Error: Too many requests")
+        with self.assertRaises(APIError) as context:
+            list(self.rg.check_links(self.urls[:20], batch_size=20, workers=1))
+        self.assertEqual(context.exception.details, "Error: Too many requests")
+        self.assertEqual(self.server.requests - requests, 1)
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from classes.APIError import APIError
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.cache import ResponseCache
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.metrics import Histogram, Metrics, RequestHook
+from rapidgatorAPI.scheduler import RequestScheduler
+
+class Recorder(RequestHook):
+    def __init__(self):
+        self.before_calls, self.events = [], []
+
+    def before(self, method, endpoint, params):
+        self.before_calls.append((method, endpoint, params))
+
+    def after(self, event):
+        self.events.append(event)
+
+class Broken(RequestHook):
+    def after(self, event):
+        raise RuntimeError("broken hook")
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRapidgatorServer().start()
+        self.metrics, self.recorder = Metrics(), Recorder()
+        self.rg = RapidgatorAPI("user", "password", base_url=self.server.base_url, scheduler=RequestScheduler(retries=2, backoff=0.01), hooks=[self.metrics, self.recorder, Broken()])
+
+    def tearDown(self):
+        self.rg.close()
+        self.server.stop()
+
+    def test_requests_are_counted_per_endpoint(self):
+        file_id = self.server.add_file("a", b"abc")
+        for _ in range(3):
+            self.rg.file_info(file_id)
+        summary = self.metrics.summary()
+        self.assertEqual(summary["user/login"]["requests"], 1)
+        self.assertEqual(summary["file/info"]["requests"], 3)
+        self.assertEqual(summary["file/info"]["statuses"], {200: 3})
+        self.assertGreater(summary["file/info"]["bytes_received"], 0)
+        self.assertIsNotNone(summary["file/info"]["latency_p99"])
+
+    def test_hooks_never_see_secrets(self):
+        self.rg.info()
+        self.assertEqual([call[1] for call in self.recorder.before_calls], ["user/login", "user/info"])
+        self.assertTrue(all("token" not in params and "password" not in params for _, _, params in self.recorder.before_calls))
+
+    def test_retries_and_errors(self):
+        self.rg.login()
+        self.server.throttle_requests = 1
+        self.rg.info()
+        self.server.inject_error("user/info", status=404)
+        with self.assertRaises(APIError):
+            self.rg.info()
+        summary = self.metrics.summary()["user/info"]
+        self.assertEqual(summary["retries"], 1)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(summary["statuses"], {200: 1, 404: 1})
+        self.assertEqual(self.recorder.events[-1].error, "404: Error: Injected failure")
+
+    def test_cache_hits(self):
+        self.rg.cache = ResponseCache()
+        file_id = self.server.add_file("a", b"abc")
+        self.rg.file_info(file_id)
+        self.rg.file_info(file_id)
+        summary = self.metrics.summary()["file/info"]
+        self.assertEqual((summary["requests"], summary["cache_hits"]), (1, 1))
+
+    def test_transfers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.bin")
+            with open(path, "wb") as f:
+                f.write(os.urandom(1000))
+            file = self.rg.upload_file(path, poll_interval=0.01)
+            self.rg.download_file(file.file_id, os.path.join(tmp, "copy.bin"))
+        summary = self.metrics.summary()
+        self.assertEqual(summary["upload"]["bytes_sent"], 1000)
+        self.assertEqual(summary["download"]["bytes_received"], 1000)
+
+    def test_prometheus(self):
+        self.rg.info()
+        text = self.metrics.to_prometheus()
+        self.assertIn('rapidgator_requests_total{endpoint="user/info",status="200"} 1', text)
+        self.assertIn('rapidgator_request_duration_seconds_bucket{endpoint="user/info",le="+Inf"} 1', text)
+        self.assertIn("# TYPE rapidgator_request_duration_seconds histogram", text)
+
+class TestHistogram(unittest.TestCase):
+    def test_quantile(self):
+        histogram = Histogram([1, 2, 4])
+        for value in [0.5] * 50 + [3] * 49 + [10]:
+            histogram.observe(value)
+        self.assertEqual(histogram.quantile(0.5), 1)
+        self.assertAlmostEqual(histogram.quantile(0.9), 2 + 2 * 40 / 49)
+        self.assertEqual(histogram.quantile(1), 4)
+        self.assertEqual(histogram.cumulative()[-1], (float("inf"), 100))
+
+if __name__ == '__main__':
+    unittest.main()
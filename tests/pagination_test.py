@@ -0,0 +1,38 @@
+import unittest
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+
+class TestPagination(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeRapidgatorServer().start()
+        cls.rg = RapidgatorAPI("user", "password", base_url=cls.server.base_url)
+        cls.folder_id = cls.server.add_folder("paged")
+        cls.subfolder_ids = [cls.server.add_folder(f"sub{i}", cls.folder_id) for i in range(3)]
+        cls.file_ids = [cls.server.add_file(f"file{i:03}", folder_id=cls.folder_id) for i in range(95)]
+        for i in range(12):
+            file_id = cls.server.add_file(f"trash{i:02}")
+            cls.server.trash[file_id] = cls.server.files.pop(file_id)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rg.close()
+        cls.server.stop()
+
+    def test_iter_folder_files(self):
+        for prefetch in (True, False):
+            files = list(self.rg.iter_folder_files(self.folder_id, per_page=10, prefetch=prefetch))
+            self.assertEqual([file.file_id for file in files], self.file_ids)
+
+    def test_iter_folder_files_stops_early(self):
+        requests = self.server.requests
+        files = self.rg.iter_folder_files(self.folder_id, per_page=10, prefetch=False)
+        self.assertEqual([next(files) for _ in range(15)][-1].name, "file014")
+        files.close()
+        self.assertEqual(self.server.requests - requests, 2)
+
+    def test_iter_folder_subfolders(self):
+        self.assertEqual([folder.folder_id for folder in self.rg.iter_folder_subfolders(self.folder_id)], self.subfolder_ids)
+
+    def test_iter_trashcan(self):
+        self.assertEqual(len(list(self.rg.iter_trashcan(per_page=5))), 12)
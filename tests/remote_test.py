@@ -0,0 +1,70 @@
+import time
+import unittest
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.remote import REMOTE_STATE_DONE, REMOTE_STATE_FAILED, RemoteUploadManager
+
+class TestRemoteUploadManager(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRapidgatorServer().start()
+        self.server.max_remote_jobs = 4
+        self.rg = RapidgatorAPI("user", "password", base_url=self.server.base_url)
+
+    def tearDown(self):
+        self.rg.close()
+        self.server.stop()
+
+    def test_run(self):
+        urls = [f"https://example.com/file{i}.bin" for i in range(10)] + ["https://example.com/fail.bin"]
+        changes = []
+        manager = self.rg.remote_upload_urls(urls, refresh_time=0.01, on_change=lambda job, previous: changes.append((job.url, previous, job.state)))
+        self.assertEqual(sorted(job.url for job in manager.done), sorted(urls[:10]))
+        self.assertEqual([job.url for job in manager.failed], urls[10:])
+        self.assertEqual(manager.errors, {})
+        # Limit taken from the account, every job created once and deleted once, one info request per poll
+        self.assertEqual(self.server.calls["remote/create"], 11)
+        self.assertEqual(self.server.calls["remote/delete"], 11)
+        self.assertEqual(self.server.calls["remote/info"], manager.polls)
+        self.assertEqual(self.server.remote_jobs, {})
+        self.assertIn(("https://example.com/file0.bin", None, 0), changes)
+        self.assertIn(("https://example.com/fail.bin", 1, REMOTE_STATE_FAILED), changes)
+        self.assertEqual(sum(1 for _, _, state in changes if state == REMOTE_STATE_DONE), 10)
+
+    def test_respects_jobs_started_elsewhere(self):
+        for i in range(3):
+            self.rg.remote_upload_create(f"https://example.com/other{i}.bin")
+        manager = RemoteUploadManager(self.rg, refresh_time=0.01, delete_finished=False)
+        manager.add(f"https://example.com/file{i}.bin" for i in range(6))
+        manager.run()
+        self.assertEqual(len(manager.done), 6)
+        self.assertEqual(manager.errors, {})
+        # The first poll counts the three running jobs, so no create is turned down
+        self.assertEqual(self.server.calls["remote/create"], 9)
+
+    def test_timeout_shorter_than_refresh_time(self):
+        manager = RemoteUploadManager(self.rg, refresh_time=60, delete_finished=False)
+        manager.add(["https://example.com/file.bin"])
+        start = time.monotonic()
+        # A job needs two polls to finish, the first run only has time for one
+        with self.assertRaises(TimeoutError):
+            manager.run(timeout=0.2)
+        self.assertEqual(manager.polls, 2)
+        self.assertEqual([job.url for job in manager.run(timeout=0.2)], ["https://example.com/file.bin"])
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_urls_rejected_for_the_job_limit_are_retried(self):
+        manager = RemoteUploadManager(self.rg, refresh_time=0.01, delete_finished=False)
+        manager.add(f"https://example.com/file{i}.bin" for i in range(6))
+        manager._load_limits()
+        manager.poll()
+        # Jobs started by someone else between the poll and the submit
+        for i in range(3):
+            self.rg.remote_upload_create(f"https://example.com/other{i}.bin")
+        manager._submit()
+        self.assertEqual(manager.errors, {})
+        # One slot was left; the three rejected URLs go back in front of the ones not sent yet
+        self.assertEqual(len(manager.active), 1)
+        self.assertEqual(list(manager.pending)[3:], ["https://example.com/file4.bin", "https://example.com/file5.bin"])
+        manager.run()
+        self.assertEqual(len(manager.done), 6)
+        self.assertEqual(manager.errors, {})
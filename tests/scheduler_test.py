@@ -0,0 +1,104 @@
+import asyncio
+import pickle
+import threading
+import time
+import unittest
+from classes.APIError import APIError
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.scheduler import RequestScheduler, TokenBucket
+
+class TestRequestScheduler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeRapidgatorServer().start()
+        cls.file_id = cls.server.add_file("file.bin", b"data")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def client(self, **kwargs):
+        rg = RapidgatorAPI("user", "password", base_url=self.server.base_url, scheduler=RequestScheduler(backoff=0.01, **kwargs))
+        rg.login()
+        return rg
+
+    def test_retries_throttled_requests(self):
+        with self.client() as rg:
+            self.server.throttle_requests = 2
+            self.assertEqual(rg.file_info(self.file_id).name, "file.bin")
+            self.server.throttle_requests = 1
+            self.assertEqual(rg.file_rename(self.file_id, "file.bin").name, "file.bin")
+            self.assertEqual(rg.scheduler.throttled, 3)
+
+    def test_gives_up_after_retries(self):
+        with self.client(retries=1) as rg:
+            self.server.throttle_requests = 2
+            with self.assertRaises(APIError) as context:
+                rg.file_info(self.file_id)
+            self.assertEqual(context.exception.status, 429)
+
+    def test_errors_are_not_retried(self):
+        with self.client() as rg:
+            requests = self.server.requests
+            with self.assertRaises(APIError):
+                rg.file_info("missing")
+            self.assertEqual(self.server.requests - requests, 1)
+
+    def test_errors_can_be_pickled(self):
+        with self.client() as rg:
+            with self.assertRaises(APIError) as context:
+                rg.file_info("missing")
+        for original in (context.exception, APIError(status=500, details="Internal error")):
+            error = pickle.loads(pickle.dumps(original))
+            self.assertEqual((error.status, error.response, error.details), (original.status, original.response, original.details))
+            self.assertEqual(str(error), str(original))
+
+    def test_bodies_that_are_not_api_responses(self):
+        with self.client() as rg:
+            for status, body in ((200, b'["not", "a", "response"]'), (200, b'"Bad gateway"'), (403, b'{"error": "Forbidden"}')):
+                self.server.inject_raw("file/info", body, status)
+                with self.assertRaises(APIError) as context:
+                    rg.file_info(self.file_id)
+                self.assertEqual((context.exception.status, context.exception.details), (status, body.decode()))
+
+    def test_adaptive_concurrency(self):
+        scheduler = RequestScheduler()
+        scheduler.in_flight = 16
+        scheduler.record(429)
+        self.assertEqual(scheduler.limit, 8)
+        scheduler.record(429)
+        self.assertEqual(scheduler.limit, 4)
+        scheduler.in_flight = 4
+        self.assertFalse(scheduler.try_acquire())
+        for _ in range(200):
+            scheduler.record(200)
+        self.assertIsNone(scheduler.limit)
+
+    def test_async_waiters_sleep_until_release(self):
+        scheduler = RequestScheduler(max_concurrency=1)
+        async def run():
+            await scheduler.acquire_async()
+            first, second = asyncio.ensure_future(scheduler.acquire_async()), asyncio.ensure_future(scheduler.acquire_async())
+            await asyncio.sleep(0.05)
+            self.assertFalse(first.done() or second.done())
+            self.assertEqual(len(scheduler._waiters), 2)
+            # The first waiter is woken by a release from another thread but cancelled, so the slot passes on
+            threading.Thread(target=scheduler.release).start()
+            first.cancel()
+            await asyncio.wait_for(second, 1)
+            self.assertEqual((scheduler.in_flight, len(scheduler._waiters)), (1, 0))
+        asyncio.run(run())
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=100, burst=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.01, delta=0.005)
+
+    def test_rate_limit(self):
+        with self.client(rate=50, burst=1) as rg:
+            start = time.monotonic()
+            for _ in range(10):
+                rg.file_info(self.file_id)
+            self.assertGreaterEqual(time.monotonic() - start, 0.15)
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.async_rapidgator import AsyncRapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.singleflight import SingleFlight
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.flights = SingleFlight()
+        self.started, self.release = threading.Event(), threading.Event()
+
+    def slow(self, result):
+        def call():
+            self.started.set()
+            self.release.wait()
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return call
+
+    def test_followers_share_result_and_error(self):
+        for result in (42, ValueError("boom")):
+            self.started.clear()
+            self.release.clear()
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                leader = executor.submit(self.flights.do, "key", self.slow(result))
+                self.started.wait()
+                followers = [executor.submit(self.flights.do, "key", lambda: self.fail("second call")) for _ in range(3)]
+                while self.flights.coalesced < 3:
+                    time.sleep(0.001)
+                self.release.set()
+                for future in [leader] + followers:
+                    if isinstance(result, Exception):
+                        self.assertRaises(ValueError, future.result)
+                    else:
+                        self.assertEqual(future.result()[0], 42)
+            self.flights.coalesced = 0
+
+    def test_forget_starts_a_new_call(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            leader = executor.submit(self.flights.do, "key", self.slow("old"))
+            self.started.wait()
+            self.flights.forget()
+            self.assertEqual(self.flights.do("key", lambda: "new"), ("new", False))
+            self.release.set()
+            self.assertEqual(leader.result(), ("old", False))
+
+class TestCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRapidgatorServer().start()
+        self.file_id = self.server.add_file("a", b"abc")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def concurrent_file_info(self, coalesce):
+        with RapidgatorAPI("user", "password", base_url=self.server.base_url, coalesce=coalesce) as rg:
+            rg.login()
+            self.server.latency = 0.2
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                files = list(executor.map(lambda _: rg.file_info(self.file_id), range(10)))
+        self.assertTrue(all(file.file_id == self.file_id for file in files))
+        # Every caller gets its own object
+        self.assertEqual(len({id(file) for file in files}), 10)
+        return self.server.calls["file/info"]
+
+    def test_threads_share_identical_reads(self):
+        self.assertEqual(self.concurrent_file_info(coalesce=True), 1)
+
+    def test_coalescing_can_be_disabled(self):
+        self.assertEqual(self.concurrent_file_info(coalesce=False), 10)
+
+    def test_async_coroutines_share_identical_reads(self):
+        async def main():
+            async with AsyncRapidgatorAPI("user", "password", base_url=self.server.base_url) as rg:
+                self.server.latency = 0.2
+                return await asyncio.gather(*(rg.file_info(self.file_id) for _ in range(10)))
+        files = asyncio.run(main())
+        self.assertTrue(all(file.file_id == self.file_id for file in files))
+        self.assertEqual(self.server.calls["file/info"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+def measure(statement: str) -> dict:
+    """Runs statement in a fresh interpreter and returns the best time of three runs and the loaded modules."""
+    runs = []
+    for _ in range(3):
+        output = subprocess.run([sys.executable, "-c", STARTUP.format(statement=statement)], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output))
+    return {"elapsed": min(run["elapsed"] for run in runs), "modules": runs[0]["modules"]}
+
+class TestStartup(unittest.TestCase):
+    def test_construct_is_lazy(self):
+        server = FakeRapidgatorServer().start()
+        try:
+            client = measure(f"from rapidgatorAPI import RapidgatorAPI\nRapidgatorAPI('user', 'password', base_url={server.base_url!r})")
+            self.assertEqual(server.requests, 0)
+        finally:
+            server.stop()
+        loaded = [module for module in client["modules"] if module.split(".")[0] in ("requests", "urllib3", "dacite", "orjson")]
+        self.assertEqual(loaded, [])
+        self.assertEqual([module for module in client["modules"] if module.startswith("classes.")], ["classes.APIError"])
+        # Importing and creating a client must stay cheaper than importing requests alone
+        self.assertLess(client["elapsed"], measure("import requests")["elapsed"])
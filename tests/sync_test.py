@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.download import DownloadJournal
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.hashing import HashCache
+from rapidgatorAPI.sync import sync_down, sync_up
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+class TestSync(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRapidgatorServer().start()
+        self.rg = RapidgatorAPI("user", "password", base_url=self.server.base_url)
+        self.directory = tempfile.TemporaryDirectory()
+        self.local = os.path.join(self.directory.name, "local")
+        self.top = self.server.add_folder("top")
+        sub = self.server.add_folder("sub", self.top)
+        self.server.add_file("b.txt", b"bbb", sub)
+        self.server.add_file("old.txt", b"old", self.top)
+        self.server.add_file("known.txt", b"known", sub)
+        write(os.path.join(self.local, "a.txt"), b"a" * 1000)
+        write(os.path.join(self.local, "dup.txt"), b"known")
+        write(os.path.join(self.local, "sub", "b.txt"), b"bbb")
+        write(os.path.join(self.local, "sub", "deep", "c.txt"), b"c" * 2000)
+
+    def tearDown(self):
+        self.rg.close()
+        self.server.stop()
+        self.directory.cleanup()
+
+    def remote(self):
+        names = {folder_id: record["name"] for folder_id, record in self.server.folders.items()}
+        return sorted((names[file["folder_id"]], file["name"]) for file in self.server.files.values())
+
+    def test_sync_up(self):
+        with HashCache(os.path.join(self.directory.name, "hashes.db")) as cache:
+            report = sync_up(self.rg, self.local, self.top, delete=True, hash_cache=cache, poll_interval=0.01)
+            self.assertEqual(sorted(report.transferred), ["a.txt", "sub/deep/c.txt"])
+            self.assertEqual(report.copied, ["dup.txt"])
+            self.assertEqual(report.skipped, ["sub/b.txt"])
+            self.assertEqual(sorted(report.deleted), ["old.txt", "sub/known.txt"])
+            self.assertEqual(report.bytes_transferred, 3000)
+            self.assertEqual(self.remote(), [("deep", "c.txt"), ("sub", "b.txt"), ("top", "a.txt"), ("top", "dup.txt")])
+            report = sync_up(self.rg, self.local, self.top, hash_cache=cache, poll_interval=0.01)
+            self.assertEqual(len(report.skipped), 4)
+            self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+    def test_sync_down(self):
+        target = os.path.join(self.directory.name, "target")
+        report = sync_down(self.rg, self.top, target)
+        self.assertEqual(sorted(report.transferred), ["old.txt", "sub/b.txt", "sub/known.txt"])
+        with open(os.path.join(target, "sub", "known.txt"), "rb") as f:
+            self.assertEqual(f.read(), b"known")
+        write(os.path.join(target, "sub", "b.txt"), b"BBB")
+        write(os.path.join(target, "extra", "x.txt"), b"x")
+        report = sync_down(self.rg, self.top, target, delete=True)
+        self.assertEqual(report.transferred, ["sub/b.txt"])
+        self.assertEqual(sorted(report.skipped), ["old.txt", "sub/known.txt"])
+        self.assertEqual(report.deleted, ["extra"])
+        self.assertFalse(os.path.exists(os.path.join(target, "extra")))
+
+    def test_sync_down_resumes_interrupted_download(self):
+        file_id = self.server.add_file("nohash.bin", b"n" * 100, self.top)
+        self.server.files.update({file_id: dict(self.server.files[file_id], hash=None)})
+        target = os.path.join(self.directory.name, "target")
+        path = os.path.join(target, "nohash.bin")
+        # What download_file leaves behind when it is interrupted before the first byte
+        write(path, bytes(100))
+        DownloadJournal(path + ".rgdownload", file_id, 100, [[0, 100, 0]]).save()
+        report = sync_down(self.rg, self.top, target)
+        self.assertIn("nohash.bin", report.transferred)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"n" * 100)
+        self.assertFalse(os.path.exists(path + ".rgdownload"))
+
+    def test_sync_up_empty_file(self):
+        write(os.path.join(self.local, "empty.txt"), b"")
+        report = sync_up(self.rg, self.local, self.top, poll_interval=0.01)
+        self.assertIn("empty.txt", report.transferred)
+        self.assertNotIn("empty.txt", report.copied)
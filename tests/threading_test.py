@@ -0,0 +1,59 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.cache import ResponseCache
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.metrics import Metrics
+from rapidgatorAPI.transport import PooledTransport
+
+class TestSharedClient(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRapidgatorServer().start()
+        self.folder_id = self.server.add_folder("shared")
+        self.file_ids = [self.server.add_file(f"file{i}", bytes([i]), self.folder_id) for i in range(50)]
+        self.metrics = Metrics()
+        self.rg = RapidgatorAPI("user", "password", base_url=self.server.base_url, transport=PooledTransport(pool_maxsize=32), cache=ResponseCache(ttls={"folder/content": 60}), hooks=[self.metrics])
+
+    def tearDown(self):
+        self.rg.close()
+        self.server.stop()
+
+    def call(self, i):
+        if i % 3 == 0:
+            return self.rg.file_info(self.file_ids[i % 50]).file_id == self.file_ids[i % 50]
+        if i % 3 == 1:
+            return self.rg.folder_content(self.folder_id, per_page=10)[0].folder_id == self.folder_id
+        return self.rg.info().is_premium
+
+    def run_calls(self, calls):
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            return list(executor.map(self.call, range(calls)))
+
+    def test_thousands_of_concurrent_calls(self):
+        # The first requests race for the lazy login
+        self.assertTrue(all(self.run_calls(1500)))
+        self.assertEqual(self.server.logins, 1)
+        # Every thread gets a 401 for the old token, only one of them logs in again
+        self.server.expire_token()
+        self.assertTrue(all(self.run_calls(1500)))
+        self.assertEqual(self.server.logins, 2)
+        summary = self.metrics.summary()
+        # Each 401 is counted as a request of its own
+        for endpoint in ("folder/content", "file/info", "user/info"):
+            counts = summary[endpoint]
+            self.assertEqual(counts["requests"] + counts["cache_hits"] + counts["coalesced"] - counts["errors"], 1000)
+
+    def test_sessions_are_per_thread_and_share_the_pool(self):
+        transport, barrier = self.rg.transport, threading.Barrier(4)
+        def session(_):
+            # Keeps all four threads busy until each has its session
+            barrier.wait()
+            return transport.session
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            sessions = list(executor.map(session, range(4)))
+        self.assertEqual(len({id(session) for session in sessions}), 4)
+        self.assertEqual(len({id(session.get_adapter("http://")) for session in sessions}), 1)
+
+if __name__ == '__main__':
+    unittest.main()
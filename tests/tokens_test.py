@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.tokens import FileTokenStore, MemoryTokenStore, TokenStore
+
+class TestTokenStore(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRapidgatorServer().start()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.server.stop()
+        self.directory.cleanup()
+
+    def client(self, store):
+        return RapidgatorAPI("user", "password", base_url=self.server.base_url, token_store=store)
+
+    def test_reuses_stored_token(self):
+        store = FileTokenStore(os.path.join(self.directory.name, "tokens.json"))
+        self.client(store).login()
+        requests = self.server.requests
+        with self.client(FileTokenStore(store.path)) as rg:
+            self.assertEqual(self.server.requests, requests)
+            rg.info()
+        self.assertEqual(self.server.logins, 1)
+
+    @unittest.skipIf(os.name != "posix", "file modes are POSIX only")
+    def test_token_file_is_private(self):
+        store = FileTokenStore(os.path.join(self.directory.name, "tokens.json"))
+        store.set("user", "token")
+        self.assertEqual(os.stat(store.path).st_mode & 0o777, 0o600)
+
+    def test_failed_write_leaves_no_temp_file(self):
+        store = FileTokenStore(os.path.join(self.directory.name, "tokens.json"))
+        with self.assertRaises(TypeError):
+            store.set("user", object())
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["tokens.json.lock"])
+
+    def test_incomplete_store_fails_when_created(self):
+        class NoLock(TokenStore):
+            def get(self, username):
+                return None
+
+            def set(self, username, token):
+                pass
+        with self.assertRaises(TypeError):
+            NoLock()
+
+    def test_relogin_on_expired_token(self):
+        store = MemoryTokenStore()
+        first, second = self.client(store), self.client(store)
+        first.login()
+        second.login()
+        self.server.expire_token()
+        self.assertIsNotNone(first.info())
+        self.assertIsNotNone(second.info())
+        self.assertEqual(self.server.logins, 2)
+        self.assertEqual(second.token, self.server.token)
+
+    def test_relogin_without_store(self):
+        with RapidgatorAPI("user", "password", base_url=self.server.base_url) as rg:
+            rg.login()
+            self.server.expire_token()
+            # folder_delete doesn't check the status, but an expired token is still renewed
+            self.assertIsNotNone(rg.folder_delete(self.server.add_folder("tmp")))
+        self.assertEqual(self.server.logins, 2)
@@ -0,0 +1,28 @@
+import unittest
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+from rapidgatorAPI.transport import PooledTransport, SimpleTransport
+
+class TestTransport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeRapidgatorServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.connections.clear()
+
+    def test_pooled_transport_reuses_connection(self):
+        with RapidgatorAPI("user", "password", transport=PooledTransport(), base_url=self.server.base_url) as rg:
+            for _ in range(10):
+                self.assertIsNotNone(rg.info())
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_simple_transport_opens_connection_per_request(self):
+        with RapidgatorAPI("user", "password", transport=SimpleTransport(), base_url=self.server.base_url) as rg:
+            for _ in range(10):
+                rg.info()
+        self.assertEqual(len(self.server.connections), 11)
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from classes.UploadError import UploadError
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+
+class TestUpload(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeRapidgatorServer().start()
+        cls.rg = RapidgatorAPI("user", "password", base_url=cls.server.base_url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rg.close()
+        cls.server.stop()
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp()
+        with os.fdopen(fd, "wb") as f:
+            f.write(os.urandom(300_000))
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_upload_file(self):
+        file = self.rg.upload_file(self.path, name="upload.bin", chunk_size=4096, poll_interval=0)
+        with open(self.path, "rb") as f:
+            self.assertEqual(self.server.files[file.file_id]["content"], f.read())
+        self.assertEqual(file.name, "upload.bin")
+
+    def test_upload_file_instant(self):
+        self.rg.upload_file(self.path, poll_interval=0)
+        uploads = len(self.server.uploads)
+        requests = self.server.requests
+        file = self.rg.upload_file(self.path, name="copy.bin", poll_interval=0)
+        self.assertEqual(file.name, "copy.bin")
+        self.assertEqual(len(self.server.uploads), uploads + 1)
+        self.assertEqual(self.server.requests, requests + 1)
+
+    def test_upload_file_failed(self):
+        with self.assertRaises(UploadError) as cm:
+            self.rg.upload_file(self.path, poll_interval=0, hash="0" * 32)
+        self.assertEqual(cm.exception.upload.state, 3)
+        self.assertIn(cm.exception.upload.upload_id, cm.exception.details)
+
+    def test_upload_file_raw(self):
+        file = self.rg.upload_file(self.path, multipart=False, poll_interval=0)
+        self.assertEqual(file.size, os.path.getsize(self.path))
+
+    def test_upload_file_parallel(self):
+        reports = []
+        self.server.fail_upload_parts = 2
+        file = self.rg.upload_file(self.path, chunk_size=4096, poll_interval=0, pipes=None, part_size=64 * 1024, progress=lambda sent, total: reports.append(sent))
+        with open(self.path, "rb") as f:
+            self.assertEqual(self.server.files[file.file_id]["content"], f.read())
+        self.assertEqual(max(reports), os.path.getsize(self.path))
+        self.assertEqual(self.server.fail_upload_parts, 0)
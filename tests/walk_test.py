@@ -0,0 +1,41 @@
+import unittest
+from rapidgatorAPI import RapidgatorAPI
+from rapidgatorAPI.fake_server import FakeRapidgatorServer
+
+class TestWalk(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeRapidgatorServer().start()
+        cls.rg = RapidgatorAPI("user", "password", base_url=cls.server.base_url)
+        cls.top = cls.server.add_folder("top")
+        for i in range(4):
+            child = cls.server.add_folder(f"child{i}", cls.top)
+            for j in range(3):
+                grandchild = cls.server.add_folder(f"grandchild{j}", child)
+                for k in range(7):
+                    cls.server.add_file(f"file{k}", folder_id=grandchild)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.rg.close()
+        cls.server.stop()
+
+    def test_walk(self):
+        levels = list(self.rg.walk(self.top, workers=4, per_page=3))
+        self.assertEqual(len(levels), 1 + 4 + 12)
+        self.assertEqual(sum(len(files) for _, _, files in levels), 12 * 7)
+        for folder, subfolders, files in levels:
+            self.assertEqual(len(files), folder.nb_files)
+            self.assertEqual(len(subfolders), folder.nb_folders)
+
+    def test_walk_prune(self):
+        levels = []
+        for folder, subfolders, files in self.rg.walk(self.top):
+            levels.append(folder)
+            if folder.name.startswith("child"):
+                subfolders.clear()
+        self.assertEqual(len(levels), 1 + 4)
+
+    def test_walk_root(self):
+        folder, subfolders, files = next(self.rg.walk())
+        self.assertIsNone(folder.parent_folder_id)